@@ -0,0 +1,602 @@
+"""Shared catalog of agent definitions loaded from .claude/agents/.
+
+The learning engine, the agent selector and the guidelines validator all need
+the same facts about the available agents. Instead of each walking the agents
+directory and parsing every markdown file with its own extractors, they share
+one ``AgentCatalog`` per directory: files are read and parsed once, and the
+result is published as immutable profiles plus the indexes built from them
+(agent keywords, keyword and description-token postings, capability sets and
+a keyword automaton), so per-query matching only touches agents that share a
+token with the query. Consumers must treat everything the catalog returns as
+read-only; ``reload()`` swaps in a new snapshot atomically instead of mutating
+the current one.
+"""
+
+import os
+import re
+import time
+import logging
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Mapping, NamedTuple, Optional, Tuple
+
+try:
+    from .keyword_automaton import KeywordAutomaton
+except ImportError:
+    from keyword_automaton import KeywordAutomaton
+
+logger = logging.getLogger(__name__)
+
+AGENT_FILE_SUFFIX = ".md"
+
+# Domain vocabulary recognised in agent descriptions (learning view)
+DOMAIN_KEYWORDS = (
+    # Testing domain
+    "test",
+    "testing",
+    "pytest",
+    "mock",
+    "async",
+    "fixture",
+    "coverage",
+    "unittest",
+    "validation",
+    "assert",
+    "failure",
+    "failures",
+    # Infrastructure domain
+    "docker",
+    "container",
+    "infrastructure",
+    "deployment",
+    "kubernetes",
+    "orchestration",
+    "networking",
+    "scaling",
+    "service",
+    "helm",
+    # Security domain
+    "security",
+    "vulnerability",
+    "audit",
+    "compliance",
+    "scanning",
+    "authentication",
+    "authorization",
+    "encryption",
+    "hardening",
+    # Performance domain
+    "performance",
+    "optimization",
+    "profiling",
+    "monitoring",
+    "bottleneck",
+    "latency",
+    "throughput",
+    "resource",
+    # Quality domain
+    "quality",
+    "refactoring",
+    "analysis",
+    "architecture",
+    "pattern",
+    "design",
+    "lint",
+    # Documentation domain
+    "documentation",
+    "guide",
+    "readme",
+    "technical",
+    "writing",
+    "api",
+    "specification",
+    "manual",
+)
+
+# Keywords that mark an agent as highly specialised
+TECHNICAL_KEYWORDS = frozenset(
+    {
+        "pytest",
+        "asyncmock",
+        "kubernetes",
+        "docker",
+        "semgrep",
+        "oauth",
+        "encryption",
+        "vulnerability",
+        "orchestration",
+        "profiling",
+    }
+)
+
+# Keyword families added to an agent's selection keywords (selection view)
+SELECTION_KEYWORD_FAMILIES = {
+    "test": [
+        "test",
+        "testing",
+        "pytest",
+        "mock",
+        "fixture",
+        "coverage",
+        "unit",
+        "integration",
+    ],
+    "infrastructure": [
+        "docker",
+        "container",
+        "kubernetes",
+        "k8s",
+        "deployment",
+        "service",
+        "infrastructure",
+        "orchestration",
+    ],
+    "security": [
+        "security",
+        "vulnerability",
+        "authentication",
+        "authorization",
+        "compliance",
+        "audit",
+        "threat",
+    ],
+    "performance": [
+        "performance",
+        "optimization",
+        "latency",
+        "throughput",
+        "bottleneck",
+        "resource",
+        "memory",
+        "cpu",
+    ],
+    "documentation": [
+        "documentation",
+        "docs",
+        "readme",
+        "guide",
+        "manual",
+        "api",
+        "technical",
+        "writing",
+    ],
+    "quality": [
+        "quality",
+        "refactor",
+        "lint",
+        "format",
+        "clean",
+        "architecture",
+        "code",
+    ],
+}
+
+SPECIALIZATION_AREAS = {
+    "test": ["pytest", "async_testing", "mocking", "coverage_analysis"],
+    "infrastructure": [
+        "docker",
+        "kubernetes",
+        "container_orchestration",
+        "service_mesh",
+    ],
+    "security": [
+        "vulnerability_scanning",
+        "compliance",
+        "authentication",
+        "encryption",
+    ],
+    "documentation": [
+        "technical_writing",
+        "api_documentation",
+        "user_guides",
+        "markdown_formatting",
+    ],
+    "performance": [
+        "performance_analysis",
+        "resource_optimization",
+        "latency_reduction",
+    ],
+}
+
+_DESCRIPTION_RE = re.compile(r"description:\s*(.+)", re.IGNORECASE)
+_CORE_FOCUS_RE = re.compile(r"\*\*Core Focus\*\*:?\s*(.+)")
+_PURPOSE_RE = re.compile(r"\*\*Purpose\*\*:?\s*(.+)")
+_FRONTMATTER_RE = re.compile(r"^---\s*\n(.*?)\n---", re.MULTILINE | re.DOTALL)
+_FRONTMATTER_DESCRIPTION_RE = re.compile(r"description:\s*(.+)", re.MULTILINE)
+_QUOTED_RE = re.compile(r'"([^"]+)"')
+_CAPABILITY_RES = (
+    re.compile(r"\*\*(.+?)\*\*:"),  # Bold headers like **Core Focus**:
+    re.compile(r"## (.+)"),  # Section headers
+    re.compile(r"### (.+)"),  # Subsection headers
+    re.compile(r"- \*\*(.+?)\*\*:"),  # List items with bold
+)
+_TRIGGER_PATTERN_RES = (
+    re.compile(r"Perfect.*?for[^.]*\.", re.DOTALL | re.IGNORECASE),
+    re.compile(r"Use PROACTIVELY.*?\.", re.DOTALL | re.IGNORECASE),
+    re.compile(
+        r"Auto-Activate UltraThink when detecting:.*?(?=###|##|$)",
+        re.DOTALL | re.IGNORECASE,
+    ),
+)
+_WORD_RE = re.compile(r"\b[a-z]{3,15}\b")
+
+
+@dataclass(frozen=True)
+class AgentProfile:
+    """Immutable parsed view of one agent definition.
+
+    The first fields are the learning view (description keywords, capability
+    headings, trigger patterns, lower-cased description tokens); the
+    ``selection_*`` fields and the ones after them feed the selector's
+    ``AgentConfig``.
+    """
+
+    name: str
+    keywords: Tuple[str, ...]
+    capabilities: Tuple[str, ...]
+    description: str
+    trigger_patterns: Tuple[str, ...] = ()
+    specialization_score: float = 1.0
+    description_tokens: FrozenSet[str] = frozenset()
+    frontmatter_description: str = ""
+    selection_keywords: Tuple[str, ...] = ()
+    context_patterns: Tuple[str, ...] = ()
+    intent_indicators: Tuple[str, ...] = ()
+    specialization_areas: Tuple[str, ...] = ()
+
+
+class CatalogSnapshot(NamedTuple):
+    """One loaded version of a catalog; every mapping is read-only."""
+
+    profiles: Mapping[str, AgentProfile]
+    keyword_sets: Mapping[str, FrozenSet[str]]
+    keyword_index: Mapping[str, FrozenSet[str]]
+    capability_sets: Mapping[str, FrozenSet[str]]
+    description_index: Mapping[str, FrozenSet[str]]
+    keyword_automaton: KeywordAutomaton
+
+
+def default_agents_directory() -> str:
+    """Get the .claude/agents/ directory of the current working directory."""
+    return os.path.join(os.getcwd(), ".claude", "agents")
+
+
+def extract_description(content: str, agent_name: str) -> str:
+    """Extract the description from agent content."""
+    # Try to extract from YAML front matter first
+    match = (
+        _DESCRIPTION_RE.search(content)
+        or _CORE_FOCUS_RE.search(content)
+        or _PURPOSE_RE.search(content)
+    )
+    if match:
+        return match.group(1).strip()
+
+    # Fallback to agent name transformation
+    return agent_name.replace("-", " ").title()
+
+
+def extract_trigger_keywords(description: str, content: str = "") -> List[str]:
+    """Extract trigger keywords from agent description and content."""
+    keywords = set()
+
+    for text in (description, content):
+        if not text:
+            continue
+
+        # Quoted trigger phrases like "test failures" are high-value keywords
+        for pattern in _QUOTED_RE.findall(text):
+            words = pattern.lower().split()
+            keywords.update([w for w in words if len(w) > 3 and w.isalpha()])
+
+        text_lower = text.lower()
+        keywords.update(kw for kw in DOMAIN_KEYWORDS if kw in text_lower)
+
+    return list(keywords)
+
+
+def extract_capabilities(content: str) -> List[str]:
+    """Extract up to 10 capability headings from agent content."""
+    capabilities = {}
+    for pattern in _CAPABILITY_RES:
+        for match in pattern.findall(content):
+            cleaned = match.strip()
+            if 3 < len(cleaned) < 50:  # Reasonable capability length
+                capabilities[cleaned] = None
+    return list(capabilities)[:10]
+
+
+def extract_trigger_patterns(content: str) -> List[str]:
+    """Extract "Perfect for", "Use PROACTIVELY" and UltraThink trigger text."""
+    patterns = []
+    for pattern in _TRIGGER_PATTERN_RES:
+        match = pattern.search(content)
+        if match:
+            patterns.append(match.group(0))
+    return patterns
+
+
+def calculate_specialization_score(
+    keywords: List[str], capabilities: List[str]
+) -> float:
+    """Calculate specialization score based on keyword and capability specificity."""
+    if not keywords:
+        return 0.5  # Default score
+
+    # Higher score for more specific/technical keywords
+    technical_count = sum(1 for kw in keywords if kw in TECHNICAL_KEYWORDS)
+    specificity_bonus = technical_count / len(keywords)
+
+    # Base score from keyword count (more keywords = more specialized)
+    base_score = min(1.0, len(keywords) / 10)
+
+    # Capability bonus
+    capability_bonus = min(0.2, len(capabilities) / 50)
+
+    return min(1.0, base_score + specificity_bonus * 0.3 + capability_bonus)
+
+
+def extract_frontmatter_description(content: str) -> str:
+    """Get the ``description:`` field of the YAML front matter, if any."""
+    frontmatter_match = _FRONTMATTER_RE.search(content)
+    if frontmatter_match:
+        desc_match = _FRONTMATTER_DESCRIPTION_RE.search(frontmatter_match.group(1))
+        if desc_match:
+            return desc_match.group(1).strip()
+    return ""
+
+
+def extract_selection_keywords(content: str, agent_name: str) -> List[str]:
+    """Extract the selector's keywords from agent content."""
+    content_lower = content.lower()
+
+    # Add agent name variations
+    keywords = set(agent_name.replace("-", " ").split())
+
+    # Add keyword families matching the agent type
+    for category, category_keywords in SELECTION_KEYWORD_FAMILIES.items():
+        if category in agent_name or any(
+            kw in content_lower for kw in category_keywords[:3]
+        ):
+            keywords.update(category_keywords)
+
+    # Add frequently mentioned words
+    word_freq = {}
+    for word in _WORD_RE.findall(content_lower):
+        word_freq[word] = word_freq.get(word, 0) + 1
+    frequent_words = [
+        word for word, freq in word_freq.items() if freq >= 3 and len(word) >= 4
+    ]
+    keywords.update(frequent_words[:10])  # Top 10 frequent words
+
+    return list(keywords)
+
+
+def generate_context_patterns(content: str, agent_name: str) -> List[str]:
+    """Generate the selector's context patterns from agent content."""
+    patterns = []
+    content_lower = content.lower()
+
+    # Agent-specific pattern generation
+    if "test" in agent_name:
+        patterns.extend(
+            [
+                r"test.{0,20}(fail|error|break|issue)",
+                r"pytest.{0,15}(config|fixture|mark)",
+                r"mock.{0,15}(config|patch|assert)",
+                r"coverage.{0,15}(gap|report|analysis)",
+            ]
+        )
+    elif "infrastructure" in agent_name:
+        patterns.extend(
+            [
+                r"docker.{0,20}(orchestration|compose|network)",
+                r"container.{0,15}(scaling|network|resource)",
+                r"kubernetes.{0,15}(cluster|pod|service|deployment)",
+                r"service.{0,15}(mesh|discovery|communication)",
+            ]
+        )
+    elif "security" in agent_name:
+        patterns.extend(
+            [
+                r"security.{0,20}(scan|audit|assessment)",
+                r"vulnerability.{0,15}(assessment|scan|analysis)",
+                r"authentication.{0,15}(flow|token|oauth)",
+                r"compliance.{0,15}(validation|audit|standard)",
+            ]
+        )
+    elif "documentation" in agent_name:
+        patterns.extend(
+            [
+                r"documentation.{0,20}(creation|improvement|automation)",
+                r"api.{0,15}(documentation|reference|guide)",
+                r"readme.{0,15}(creation|update|generation)",
+                r"technical.{0,15}(writing|documentation|guide)",
+            ]
+        )
+
+    # Extract patterns from content descriptions
+    if "orchestration" in content_lower:
+        patterns.append(r"orchestrat\w*.{0,15}(container|service|cluster)")
+    if "optimization" in content_lower:
+        patterns.append(r"optim\w*.{0,15}(performance|resource|latency)")
+
+    return patterns
+
+
+def extract_intent_indicators(agent_name: str) -> List[str]:
+    """Get the selector's intent indicators for an agent."""
+    indicators = [
+        "need",
+        "fix",
+        "resolve",
+        "analyze",
+        "improve",
+        "create",
+        "implement",
+    ]
+
+    # Agent-specific indicators
+    if "test" in agent_name:
+        indicators.extend(["test", "validate", "verify", "debug"])
+    elif "infrastructure" in agent_name:
+        indicators.extend(["deploy", "scale", "orchestrate", "configure", "monitor"])
+    elif "security" in agent_name:
+        indicators.extend(["secure", "audit", "scan", "protect", "encrypt"])
+    elif "documentation" in agent_name:
+        indicators.extend(["document", "write", "generate", "explain", "guide"])
+
+    return indicators
+
+
+def extract_specialization_areas(agent_name: str, content: str) -> List[str]:
+    """Extract the selector's specialization areas from agent content."""
+    areas = []
+    content_lower = content.lower()
+    for category, spec_areas in SPECIALIZATION_AREAS.items():
+        if category in agent_name or category in content_lower:
+            areas.extend(spec_areas)
+    return areas
+
+
+def parse_agent_definition(agent_name: str, content: str) -> AgentProfile:
+    """Parse one agent markdown file into its profile."""
+    description = extract_description(content, agent_name)
+    keywords = extract_trigger_keywords(description, content)
+    capabilities = extract_capabilities(content)
+    frontmatter_description = extract_frontmatter_description(content)
+
+    return AgentProfile(
+        name=agent_name,
+        keywords=tuple(keywords),
+        capabilities=tuple(capabilities),
+        description=description,
+        trigger_patterns=tuple(extract_trigger_patterns(content)),
+        specialization_score=calculate_specialization_score(keywords, capabilities),
+        description_tokens=frozenset(description.lower().split()),
+        frontmatter_description=frontmatter_description,
+        selection_keywords=tuple(
+            extract_selection_keywords(
+                frontmatter_description + " " + content, agent_name
+            )
+        ),
+        context_patterns=tuple(generate_context_patterns(content, agent_name)),
+        intent_indicators=tuple(extract_intent_indicators(agent_name)),
+        specialization_areas=tuple(extract_specialization_areas(agent_name, content)),
+    )
+
+
+class AgentCatalog:
+    """Agent definitions of one directory, parsed once and shared read-only."""
+
+    def __init__(self, agents_dir: Optional[str] = None):
+        """Load and index the agent definitions in ``agents_dir``."""
+        self.agents_dir = os.path.abspath(agents_dir or default_agents_directory())
+        self._lock = threading.Lock()
+        self.stats = {"loads": 0, "files_parsed": 0, "load_time_ms": 0.0}
+        self._snapshot = self._load()
+
+    @property
+    def snapshot(self) -> CatalogSnapshot:
+        """The current version; holding it keeps a consistent view across reloads."""
+        return self._snapshot
+
+    @property
+    def profiles(self) -> Mapping[str, AgentProfile]:
+        """Agent name -> profile."""
+        return self._snapshot.profiles
+
+    @property
+    def keyword_sets(self) -> Mapping[str, FrozenSet[str]]:
+        """Agent name -> trigger keywords."""
+        return self._snapshot.keyword_sets
+
+    @property
+    def keyword_index(self) -> Mapping[str, FrozenSet[str]]:
+        """Trigger keyword -> names of the agents it triggers."""
+        return self._snapshot.keyword_index
+
+    @property
+    def description_index(self) -> Mapping[str, FrozenSet[str]]:
+        """Lower-cased description token -> names of the agents using it."""
+        return self._snapshot.description_index
+
+    @property
+    def capability_sets(self) -> Mapping[str, FrozenSet[str]]:
+        """Agent name -> capability headings."""
+        return self._snapshot.capability_sets
+
+    def get_profile(self, agent_name: str) -> Optional[AgentProfile]:
+        """Get an agent's profile by name."""
+        return self._snapshot.profiles.get(agent_name)
+
+    def reload(self) -> CatalogSnapshot:
+        """Re-read the directory and publish a new snapshot."""
+        self._snapshot = self._load()
+        return self._snapshot
+
+    def _load(self) -> CatalogSnapshot:
+        start_time = time.perf_counter()
+        profiles = {}
+
+        if not os.path.isdir(self.agents_dir):
+            logger.warning(f"Agents directory not found: {self.agents_dir}")
+        else:
+            for agent_file in sorted(os.listdir(self.agents_dir)):
+                if not agent_file.endswith(AGENT_FILE_SUFFIX):
+                    continue
+                agent_name = agent_file[: -len(AGENT_FILE_SUFFIX)]
+                agent_path = os.path.join(self.agents_dir, agent_file)
+                try:
+                    with open(agent_path, "r", encoding="utf-8") as f:
+                        content = f.read()
+                    profiles[agent_name] = parse_agent_definition(agent_name, content)
+                except Exception as e:
+                    logger.warning(f"Could not parse agent file {agent_path}: {e}")
+
+        keyword_sets = {}
+        capability_sets = {}
+        keyword_index = {}
+        description_index = {}
+        for name, profile in profiles.items():
+            keyword_sets[name] = frozenset(profile.keywords)
+            capability_sets[name] = frozenset(profile.capabilities)
+            for keyword in keyword_sets[name]:
+                keyword_index.setdefault(keyword, set()).add(name)
+            for token in profile.description_tokens:
+                description_index.setdefault(token, set()).add(name)
+
+        snapshot = CatalogSnapshot(
+            profiles=MappingProxyType(profiles),
+            keyword_sets=MappingProxyType(keyword_sets),
+            keyword_index=MappingProxyType(
+                {kw: frozenset(names) for kw, names in keyword_index.items()}
+            ),
+            capability_sets=MappingProxyType(capability_sets),
+            description_index=MappingProxyType(
+                {token: frozenset(names) for token, names in description_index.items()}
+            ),
+            keyword_automaton=KeywordAutomaton(keyword_index),
+        )
+
+        with self._lock:
+            self.stats["loads"] += 1
+            self.stats["files_parsed"] += len(profiles)
+            self.stats["load_time_ms"] += (time.perf_counter() - start_time) * 1000
+        logger.info(f"Loaded {len(profiles)} agent profiles from {self.agents_dir}")
+        return snapshot
+
+
+_catalogs: Dict[str, AgentCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_agent_catalog(agents_dir: Optional[str] = None) -> AgentCatalog:
+    """Get the process-wide catalog for ``agents_dir`` (default .claude/agents/)."""
+    path = os.path.abspath(agents_dir or default_agents_directory())
+    with _catalogs_lock:
+        catalog = _catalogs.get(path)
+        if catalog is None:
+            catalog = _catalogs[path] = AgentCatalog(path)
+        return catalog
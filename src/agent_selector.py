@@ -12,10 +12,12 @@ import re
 import time
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass, field
-from collections import defaultdict, Counter
+from collections import defaultdict, deque, Counter
 import logging
 import hashlib
+import random
 import statistics
+import zlib
 from typing import NamedTuple
 
 # Import enhanced cross-domain coordinator
@@ -28,8 +30,25 @@ try:
 except ImportError:
     CROSS_DOMAIN_AVAILABLE = False
 
+try:
+    from .metrics_registry import get_metrics_registry
+except ImportError:
+    from metrics_registry import get_metrics_registry
+
+try:
+    from .agent_catalog import AgentCatalog, get_agent_catalog
+except ImportError:
+    from agent_catalog import AgentCatalog, get_agent_catalog
+
 logger = logging.getLogger(__name__)
 
+SELECTIONS = get_metrics_registry().counter(
+    "agent_selections_total", "Agent selections by selection path", ("path",)
+)
+SELECTION_LATENCY_MS = get_metrics_registry().histogram(
+    "agent_selection_latency_ms", "Agent selection latency in milliseconds", ("path",)
+)
+
 
 class PatternSuccessMetrics(NamedTuple):
     """Metrics for tracking pattern success."""
@@ -42,6 +61,142 @@ class PatternSuccessMetrics(NamedTuple):
     timestamp: float
 
 
+class ContextSimilarityIndex:
+    """MinHash signatures of query token sets stored in LSH band buckets.
+
+    Each indexed query is reduced to a fixed-length MinHash signature which is
+    split into bands; queries sharing any band land in the same bucket.  A
+    lookup therefore only touches entries from the buckets of the probe query,
+    which keeps similar-context search sub-linear in the history size.
+
+    At most ``capacity`` entries are kept; the oldest is evicted first, along
+    with its bucket memberships.
+    """
+
+    _PRIME = (1 << 61) - 1
+    _MAX_HASH = (1 << 32) - 1
+    _STOP_WORDS = frozenset(
+        ["the", "and", "for", "with", "this", "that", "from", "into", "our", "are"]
+    )
+
+    def __init__(
+        self, num_perm: int = 32, bands: int = 16, seed: int = 1, capacity: int = 5000
+    ):
+        """Initialize the index with ``num_perm`` hash functions split into ``bands``."""
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.capacity = capacity
+        rng = random.Random(seed)
+        self._permutations = [
+            (rng.randint(1, self._PRIME - 1), rng.randint(0, self._PRIME - 1))
+            for _ in range(num_perm)
+        ]
+        self.buckets = {}  # (band, band_signature) -> deque of entry_ids, oldest first
+        self.entries = {}  # entry_id -> (signature, agent, pattern_key, success, ts)
+        self._next_id = 0
+
+    def tokenize(self, query: str) -> frozenset:
+        """Reduce a query to its set of significant lower-case tokens."""
+        return frozenset(
+            token
+            for token in re.findall(r"[a-z0-9]+", query.lower())
+            if len(token) > 2 and token not in self._STOP_WORDS
+        )
+
+    def signature(self, tokens: frozenset) -> Tuple[int, ...]:
+        """Compute the MinHash signature for a token set."""
+        if not tokens:
+            return ()
+        token_hashes = [zlib.crc32(token.encode()) for token in tokens]
+        prime, max_hash = self._PRIME, self._MAX_HASH
+        return tuple(
+            min(((a * h + b) % prime) & max_hash for h in token_hashes)
+            for a, b in self._permutations
+        )
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, tuple]]:
+        rows = self.rows
+        return [
+            (band, signature[band * rows : (band + 1) * rows])
+            for band in range(self.bands)
+        ]
+
+    def add(
+        self,
+        query: str,
+        agent: str,
+        pattern_key: str,
+        success_rate: float,
+        timestamp: float,
+    ) -> Tuple[int, ...]:
+        """Index a query outcome and return its signature."""
+        signature = self.signature(self.tokenize(query))
+        if not signature:
+            return signature
+
+        if len(self.entries) >= self.capacity:
+            self._evict_oldest()
+
+        entry_id = self._next_id
+        self._next_id += 1
+        self.entries[entry_id] = (
+            signature,
+            agent,
+            pattern_key,
+            success_rate,
+            timestamp,
+        )
+        for band_key in self._band_keys(signature):
+            bucket = self.buckets.get(band_key)
+            if bucket is None:
+                bucket = self.buckets[band_key] = deque()
+            bucket.append(entry_id)
+        return signature
+
+    def _evict_oldest(self):
+        """Drop the oldest entry; ids only grow, so it heads each of its buckets."""
+        entry_id = next(iter(self.entries))
+        signature = self.entries.pop(entry_id)[0]
+        for band_key in self._band_keys(signature):
+            bucket = self.buckets[band_key]
+            bucket.popleft()
+            if not bucket:
+                del self.buckets[band_key]
+
+    def query(
+        self, query: str, min_similarity: float = 0.3
+    ) -> List[Tuple[Tuple[int, ...], str, str, float, float, float]]:
+        """Return indexed entries similar to ``query`` with their estimated similarity."""
+        signature = self.signature(self.tokenize(query))
+        if not signature:
+            return []
+
+        candidate_ids = set()
+        for band_key in self._band_keys(signature):
+            candidate_ids.update(self.buckets.get(band_key, ()))
+
+        results = []
+        for entry_id in candidate_ids:
+            entry = self.entries[entry_id]
+            similarity = self.estimate_similarity(signature, entry[0])
+            if similarity >= min_similarity:
+                results.append((*entry, similarity))
+        return results
+
+    @staticmethod
+    def estimate_similarity(
+        signature_a: Tuple[int, ...], signature_b: Tuple[int, ...]
+    ) -> float:
+        """Estimate Jaccard similarity from two MinHash signatures."""
+        if not signature_a or len(signature_a) != len(signature_b):
+            return 0.0
+        matches = sum(1 for a, b in zip(signature_a, signature_b) if a == b)
+        return matches / len(signature_a)
+
+
 class PatternSuccessTracker:
     """Enhanced pattern success tracking with adaptive learning."""
 
@@ -57,14 +212,26 @@ class PatternSuccessTracker:
         )  # pattern -> [(timestamp, success_rate)]
         self.learning_rate = 0.1
 
+        # Locality-sensitive index of past query contexts
+        self.context_index = ContextSimilarityIndex()
+
     def track_success(
-        self, pattern_key: str, query: str, agent: str, metrics: PatternSuccessMetrics
+        self,
+        pattern_key: str,
+        query: str,
+        agent: str,
+        metrics: PatternSuccessMetrics,
+        update_weights: bool = True,
     ):
-        """Track success metrics for a pattern-agent combination."""
+        """Track success metrics for a pattern-agent combination.
+
+        Callers that adjust ``pattern_weights`` themselves pass
+        ``update_weights=False`` so a sample moves the weight only once.
+        """
         self.success_history[pattern_key].append(metrics)
 
         # Update pattern weights based on recent performance
-        if len(self.success_history[pattern_key]) >= 3:
+        if update_weights and len(self.success_history[pattern_key]) >= 3:
             recent_metrics = self.success_history[pattern_key][-5:]  # Last 5 uses
             avg_accuracy = statistics.mean(m.accuracy for m in recent_metrics)
 
@@ -87,6 +254,9 @@ class PatternSuccessTracker:
                 "timestamp": metrics.timestamp,
             }
         )
+        self.context_index.add(
+            query, agent, pattern_key, metrics.accuracy, metrics.timestamp
+        )
 
         # Update temporal trends
         pattern_successes = [
@@ -106,11 +276,37 @@ class PatternSuccessTracker:
     def get_contextual_recommendations(
         self, query: str
     ) -> List[Tuple[str, str, float]]:
-        """Get agent recommendations based on similar contexts."""
-        self._generate_context_hash(query)
-        recommendations = []
+        """Get agent recommendations based on similar contexts.
+
+        Returns ``(agent, pattern_key, score)`` tuples sorted by score, where
+        score is the best context similarity times the mean success rate of the
+        (agent, pattern) pair across similar past queries.
+        """
+        aggregated = {}  # (agent, pattern_key) -> [max_similarity, success_sum, count]
+        for entry in self.context_index.query(query):
+            _, agent, pattern_key, success_rate, _, similarity = entry
+            stats = aggregated.setdefault((agent, pattern_key), [0.0, 0.0, 0])
+            stats[0] = max(stats[0], similarity)
+            stats[1] += success_rate
+            stats[2] += 1
+
+        recommendations = [
+            (agent, pattern_key, max_similarity * (success_sum / count))
+            for (agent, pattern_key), (max_similarity, success_sum, count) in (
+                aggregated.items()
+            )
+        ]
+        recommendations.sort(key=lambda x: x[2], reverse=True)
         return recommendations
 
+    def get_contextual_agent_prior(self, query: str) -> Dict[str, float]:
+        """Collapse contextual recommendations into a per-agent prior in [0, 1]."""
+        prior = {}
+        for agent, _, score in self.get_contextual_recommendations(query):
+            if score > prior.get(agent, 0.0):
+                prior[agent] = score
+        return prior
+
     def get_pattern_based_matches(self, query: str) -> List[Tuple[str, float, str]]:
         """Get pattern-based agent matches for a query with enhanced Task tool recognition."""
         pattern_matches = []
@@ -414,12 +610,6 @@ class PatternSuccessTracker:
         context_signature = "_".join(sorted(set(key_terms)))
         return hashlib.md5(context_signature.encode()).hexdigest()[:8]
 
-    def _contexts_similar(self, query: str, context_hash: str) -> bool:
-        """Check if query context is similar to stored context."""
-        query_hash = self._generate_context_hash(query)
-        # Simple similarity check - same first 4 chars of hash
-        return query_hash[:4] == context_hash[:4]
-
 
 class ContextEnrichmentEngine:
     """Enhanced context enrichment for better agent selection with improved pattern recognition."""
@@ -987,9 +1177,12 @@ class AgentConfig:
 class EnhancedAgentSelector:
     """Enhanced agent selection with improved pattern matching algorithms."""
 
-    def __init__(self, agents_dir: Optional[str] = None):
+    def __init__(
+        self, agents_dir: Optional[str] = None, catalog: Optional[AgentCatalog] = None
+    ):
         """Initialize the enhanced agent selector with .claude/agents/ directory integration."""
-        self.agents_dir = agents_dir or self._get_agents_directory()
+        self.catalog = catalog or get_agent_catalog(agents_dir)
+        self.agents_dir = self.catalog.agents_dir
         self.agents = self._initialize_agents()
         self.agents.update(
             self._load_agents_from_directory()
@@ -1005,304 +1198,27 @@ class EnhancedAgentSelector:
         self.pattern_success_tracker = PatternSuccessTracker()
         self.context_enrichment_engine = ContextEnrichmentEngine()
         self.adaptive_learning_enabled = True
+        self.contextual_prior_weight = 0.5  # Score bonus for similar past successes
 
         # Improved pattern matching with fallback strategy
         self.fallback_threshold = 0.4  # Lower threshold before falling back to digdeep
         self.digdeep_threshold = 0.3  # Only use digdeep for truly ambiguous queries
 
-    def _get_agents_directory(self) -> str:
-        """Get the .claude/agents/ directory path."""
-        from pathlib import Path
-
-        current_dir = Path.cwd()
-        agents_dir = current_dir / ".claude" / "agents"
-        return str(agents_dir)
-
     def _load_agents_from_directory(self) -> Dict[str, AgentConfig]:
-        """Load agent configurations from .claude/agents/ directory."""
-        from pathlib import Path
-
-        agents = {}
-        agents_path = Path(self.agents_dir)
-
-        if not agents_path.exists():
-            logger.warning(f"Agents directory not found: {agents_path}")
-            return agents
-
-        for agent_file in agents_path.glob("*.md"):
-            try:
-                agent_name = agent_file.stem
-                with open(agent_file, "r", encoding="utf-8") as f:
-                    content = f.read()
-
-                # Extract agent configuration from frontmatter and content
-                agent_config = self._parse_agent_file(agent_name, content)
-                if agent_config:
-                    agents[agent_name] = agent_config
-                    logger.debug(f"Loaded agent: {agent_name}")
-            except Exception as e:
-                logger.warning(f"Failed to load agent from {agent_file}: {e}")
-
-        logger.info(f"Loaded {len(agents)} agents from {agents_path}")
-        return agents
-
-    def _parse_agent_file(self, agent_name: str, content: str) -> Optional[AgentConfig]:
-        """Parse agent configuration from markdown file."""
-        import re
-
-        # Extract frontmatter description
-        frontmatter_match = re.search(
-            r"^---\s*\n(.*?)\n---", content, re.MULTILINE | re.DOTALL
-        )
-        description = ""
-        if frontmatter_match:
-            frontmatter = frontmatter_match.group(1)
-            desc_match = re.search(r"description:\s*(.+)", frontmatter, re.MULTILINE)
-            if desc_match:
-                description = desc_match.group(1).strip()
-
-        # Extract keywords from description and content
-        keywords = self._extract_keywords_from_content(
-            description + " " + content, agent_name
-        )
-
-        # Generate context patterns
-        context_patterns = self._generate_context_patterns_from_content(
-            content, agent_name
-        )
-
-        # Extract intent indicators
-        intent_indicators = self._extract_intent_indicators(description, agent_name)
-
-        return AgentConfig(
-            name=agent_name,
-            primary_keywords=keywords,
-            context_patterns=context_patterns,
-            intent_indicators=intent_indicators,
-            weight_multiplier=1.0,  # Default weight
-            description=description,
-            specialization_areas=self._extract_specialization_areas(
-                agent_name, content
-            ),
-        )
-
-    def _extract_keywords_from_content(
-        self, content: str, agent_name: str
-    ) -> List[str]:
-        """Extract keywords from agent content."""
-        import re
-
-        content_lower = content.lower()
-        keywords = set()
-
-        # Add agent name variations
-        name_parts = agent_name.replace("-", " ").split()
-        keywords.update(name_parts)
-
-        # Common keyword patterns by agent type
-        keyword_patterns = {
-            "test": [
-                "test",
-                "testing",
-                "pytest",
-                "mock",
-                "fixture",
-                "coverage",
-                "unit",
-                "integration",
-            ],
-            "infrastructure": [
-                "docker",
-                "container",
-                "kubernetes",
-                "k8s",
-                "deployment",
-                "service",
-                "infrastructure",
-                "orchestration",
-            ],
-            "security": [
-                "security",
-                "vulnerability",
-                "authentication",
-                "authorization",
-                "compliance",
-                "audit",
-                "threat",
-            ],
-            "performance": [
-                "performance",
-                "optimization",
-                "latency",
-                "throughput",
-                "bottleneck",
-                "resource",
-                "memory",
-                "cpu",
-            ],
-            "documentation": [
-                "documentation",
-                "docs",
-                "readme",
-                "guide",
-                "manual",
-                "api",
-                "technical",
-                "writing",
-            ],
-            "quality": [
-                "quality",
-                "refactor",
-                "lint",
-                "format",
-                "clean",
-                "architecture",
-                "code",
-            ],
-        }
-
-        # Extract keywords based on agent type
-        for category, category_keywords in keyword_patterns.items():
-            if category in agent_name or any(
-                kw in content_lower for kw in category_keywords[:3]
-            ):
-                keywords.update(category_keywords)
-
-        # Extract keywords mentioned in content
-        word_pattern = re.compile(r"\b[a-z]{3,15}\b")
-        content_words = word_pattern.findall(content_lower)
-        word_freq = {}
-        for word in content_words:
-            word_freq[word] = word_freq.get(word, 0) + 1
-
-        # Add frequently mentioned words
-        frequent_words = [
-            word for word, freq in word_freq.items() if freq >= 3 and len(word) >= 4
-        ]
-        keywords.update(frequent_words[:10])  # Top 10 frequent words
-
-        return list(keywords)
-
-    def _generate_context_patterns_from_content(
-        self, content: str, agent_name: str
-    ) -> List[str]:
-        """Generate context patterns from agent content."""
-        patterns = []
-        content_lower = content.lower()
-
-        # Agent-specific pattern generation
-        if "test" in agent_name:
-            patterns.extend(
-                [
-                    r"test.{0,20}(fail|error|break|issue)",
-                    r"pytest.{0,15}(config|fixture|mark)",
-                    r"mock.{0,15}(config|patch|assert)",
-                    r"coverage.{0,15}(gap|report|analysis)",
-                ]
-            )
-        elif "infrastructure" in agent_name:
-            patterns.extend(
-                [
-                    r"docker.{0,20}(orchestration|compose|network)",
-                    r"container.{0,15}(scaling|network|resource)",
-                    r"kubernetes.{0,15}(cluster|pod|service|deployment)",
-                    r"service.{0,15}(mesh|discovery|communication)",
-                ]
-            )
-        elif "security" in agent_name:
-            patterns.extend(
-                [
-                    r"security.{0,20}(scan|audit|assessment)",
-                    r"vulnerability.{0,15}(assessment|scan|analysis)",
-                    r"authentication.{0,15}(flow|token|oauth)",
-                    r"compliance.{0,15}(validation|audit|standard)",
-                ]
-            )
-        elif "documentation" in agent_name:
-            patterns.extend(
-                [
-                    r"documentation.{0,20}(creation|improvement|automation)",
-                    r"api.{0,15}(documentation|reference|guide)",
-                    r"readme.{0,15}(creation|update|generation)",
-                    r"technical.{0,15}(writing|documentation|guide)",
-                ]
-            )
-
-        # Extract patterns from content descriptions
-        if "orchestration" in content_lower:
-            patterns.append(r"orchestrat\w*.{0,15}(container|service|cluster)")
-        if "optimization" in content_lower:
-            patterns.append(r"optim\w*.{0,15}(performance|resource|latency)")
-
-        return patterns
-
-    def _extract_intent_indicators(
-        self, description: str, agent_name: str
-    ) -> List[str]:
-        """Extract intent indicators from agent description."""
-        indicators = [
-            "need",
-            "fix",
-            "resolve",
-            "analyze",
-            "improve",
-            "create",
-            "implement",
-        ]
-
-        # Agent-specific indicators
-        if "test" in agent_name:
-            indicators.extend(["test", "validate", "verify", "debug"])
-        elif "infrastructure" in agent_name:
-            indicators.extend(
-                ["deploy", "scale", "orchestrate", "configure", "monitor"]
+        """Build agent configurations from the shared catalog of .claude/agents/."""
+        return {
+            name: AgentConfig(
+                name=name,
+                primary_keywords=list(profile.selection_keywords),
+                context_patterns=list(profile.context_patterns),
+                intent_indicators=list(profile.intent_indicators),
+                weight_multiplier=1.0,  # Default weight
+                description=profile.frontmatter_description,
+                specialization_areas=list(profile.specialization_areas),
             )
-        elif "security" in agent_name:
-            indicators.extend(["secure", "audit", "scan", "protect", "encrypt"])
-        elif "documentation" in agent_name:
-            indicators.extend(["document", "write", "generate", "explain", "guide"])
-
-        return indicators
-
-    def _extract_specialization_areas(self, agent_name: str, content: str) -> List[str]:
-        """Extract specialization areas from agent content."""
-        areas = []
-        content_lower = content.lower()
-
-        # Common specialization mappings
-        specializations = {
-            "test": ["pytest", "async_testing", "mocking", "coverage_analysis"],
-            "infrastructure": [
-                "docker",
-                "kubernetes",
-                "container_orchestration",
-                "service_mesh",
-            ],
-            "security": [
-                "vulnerability_scanning",
-                "compliance",
-                "authentication",
-                "encryption",
-            ],
-            "documentation": [
-                "technical_writing",
-                "api_documentation",
-                "user_guides",
-                "markdown_formatting",
-            ],
-            "performance": [
-                "performance_analysis",
-                "resource_optimization",
-                "latency_reduction",
-            ],
+            for name, profile in self.catalog.profiles.items()
         }
 
-        for category, spec_areas in specializations.items():
-            if category in agent_name or category in content_lower:
-                areas.extend(spec_areas)
-
-        return areas
-
     def _initialize_agents(self) -> Dict[str, AgentConfig]:
         """Initialize agent configurations with enhanced patterns."""
         return {
@@ -2225,7 +2141,7 @@ class EnhancedAgentSelector:
 
         if pattern_matches:
             match = pattern_matches[0]  # Take best match
-            return AgentMatchResult(
+            result = AgentMatchResult(
                 agent_name=match[0],
                 confidence_score=match[1],
                 matched_patterns=[match[2]],
@@ -2233,9 +2149,15 @@ class EnhancedAgentSelector:
                 reasoning=f"Pattern-based match: {match[2]}",
                 context_keywords=self._extract_context_keywords(query),
             )
+            path = "pattern"
+        else:
+            # Fall back to original algorithm if no pattern matches
+            result = self._select_agent_original(query, start_time)
+            path = "scored"
 
-        # Fall back to original algorithm if no pattern matches
-        return self._select_agent_original(query, start_time)
+        SELECTIONS.inc(path=path)
+        SELECTION_LATENCY_MS.observe(result.processing_time_ms, path=path)
+        return result
 
     def extract_keywords(self, query: str) -> List[str]:
         """Extract keywords from query for agent matching."""
@@ -2303,11 +2225,23 @@ class EnhancedAgentSelector:
         if not candidate_agents:
             candidate_agents = set(self.agents.keys())
 
+        # Agents that succeeded on similar past queries act as a selection prior
+        contextual_prior = self.pattern_success_tracker.get_contextual_agent_prior(
+            query
+        )
+        candidate_agents.update(
+            agent for agent in contextual_prior if agent in self.agents
+        )
+
         # Calculate scores for candidate agents
         agent_scores = []
         for agent_name in candidate_agents:
             agent_config = self.agents[agent_name]
             score, matched_patterns = self.calculate_context_score(query, agent_config)
+            prior = contextual_prior.get(agent_name, 0.0)
+            if prior > 0:
+                score += self.contextual_prior_weight * prior
+                matched_patterns = matched_patterns + ["contextual_prior"]
 
             agent_scores.append(
                 {
@@ -3069,6 +3003,29 @@ class EnhancedAgentSelector:
                     query, selected_agent, enriched_context
                 )
 
+                # Index the outcome so similar future queries inherit it as a prior
+                outcome = user_feedback if user_feedback is not None else task_success
+                if outcome is not None:
+                    metrics = performance_metrics or {}
+                    self.pattern_success_tracker.track_success(
+                        pattern_key,
+                        query,
+                        selected_agent,
+                        PatternSuccessMetrics(
+                            accuracy=1.0 if outcome else 0.0,
+                            response_time=metrics.get("response_time_ms", 0.0),
+                            context_preservation=metrics.get(
+                                "context_preservation", 1.0
+                            ),
+                            coordination_success=(
+                                1.0 if task_success is not False else 0.0
+                            ),
+                            confidence=confidence,
+                            timestamp=time.time(),
+                        ),
+                        update_weights=False,  # Weights are adjusted below
+                    )
+
                 # Enhanced pattern weight updates with performance consideration
                 if user_feedback is True or task_success is True:
                     # Boost pattern weight for positive feedback with performance bonus
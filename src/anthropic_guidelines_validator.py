@@ -5,11 +5,74 @@ compliance with recommended practices.
 """
 
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional
 from dataclasses import dataclass
 
+try:
+    from .agent_catalog import AgentCatalog, get_agent_catalog
+except ImportError:
+    from agent_catalog import AgentCatalog, get_agent_catalog
+
 logger = logging.getLogger(__name__)
 
+# Capability keywords of the standard agents, used when the catalog has no
+# definition for them
+DEFAULT_AGENT_CAPABILITIES = {
+    "test-specialist": [
+        "test",
+        "testing",
+        "pytest",
+        "mock",
+        "async",
+        "coverage",
+        "fixture",
+    ],
+    "infrastructure-engineer": [
+        "docker",
+        "kubernetes",
+        "deployment",
+        "infrastructure",
+        "container",
+        "orchestration",
+    ],
+    "security-enforcer": [
+        "security",
+        "vulnerability",
+        "compliance",
+        "audit",
+        "scanning",
+    ],
+    "performance-optimizer": [
+        "performance",
+        "optimization",
+        "profiling",
+        "bottleneck",
+        "latency",
+    ],
+    "documentation-enhancer": [
+        "documentation",
+        "readme",
+        "guide",
+        "technical",
+        "writing",
+        "api",
+    ],
+    "intelligent-enhancer": [
+        "refactoring",
+        "code",
+        "quality",
+        "improvement",
+        "analysis",
+    ],
+    "digdeep": ["analysis", "root", "cause", "systematic", "investigation"],
+    "meta-coordinator": [
+        "coordination",
+        "orchestration",
+        "multi-domain",
+        "complex",
+    ],
+}
+
 
 @dataclass
 class ValidationResult:
@@ -25,8 +88,10 @@ class ValidationResult:
 class AnthropicGuidelinesValidator:
     """Validate learning patterns against Anthropic sub-agent guidelines."""
 
-    def __init__(self):
-        """Initialize the guidelines validator."""
+    def __init__(
+        self, agents_dir: Optional[str] = None, catalog: Optional[AgentCatalog] = None
+    ):
+        """Initialize the guidelines validator on the shared agent catalog."""
         # Anthropic sub-agent guidelines compliance criteria
         self.guidelines_criteria = {
             "sub_agent_spawning": {
@@ -49,62 +114,15 @@ class AnthropicGuidelinesValidator:
             },
         }
 
-        # Known agent capabilities mapping
-        self.agent_capabilities = {
-            "test-specialist": [
-                "test",
-                "testing",
-                "pytest",
-                "mock",
-                "async",
-                "coverage",
-                "fixture",
-            ],
-            "infrastructure-engineer": [
-                "docker",
-                "kubernetes",
-                "deployment",
-                "infrastructure",
-                "container",
-                "orchestration",
-            ],
-            "security-enforcer": [
-                "security",
-                "vulnerability",
-                "compliance",
-                "audit",
-                "scanning",
-            ],
-            "performance-optimizer": [
-                "performance",
-                "optimization",
-                "profiling",
-                "bottleneck",
-                "latency",
-            ],
-            "documentation-enhancer": [
-                "documentation",
-                "readme",
-                "guide",
-                "technical",
-                "writing",
-                "api",
-            ],
-            "intelligent-enhancer": [
-                "refactoring",
-                "code",
-                "quality",
-                "improvement",
-                "analysis",
-            ],
-            "digdeep": ["analysis", "root", "cause", "systematic", "investigation"],
-            "meta-coordinator": [
-                "coordination",
-                "orchestration",
-                "multi-domain",
-                "complex",
-            ],
-        }
+        # Agents defined in the catalog are validated against their own
+        # keywords plus the curated built-in ones, which also cover agents
+        # without a definition
+        self.catalog = catalog or get_agent_catalog(agents_dir)
+        self.agent_capabilities = dict(DEFAULT_AGENT_CAPABILITIES)
+        for name, keywords in self.catalog.keyword_sets.items():
+            self.agent_capabilities[name] = keywords.union(
+                DEFAULT_AGENT_CAPABILITIES.get(name, ())
+            )
 
         # Compliance thresholds
         self.compliance_thresholds = {
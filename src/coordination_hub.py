@@ -0,0 +1,563 @@
+"""Shared I/O layer for the .claude/memory/coordination-hub.md file.
+
+The markdown hub is a human-readable view. Components that learn patterns
+append structured records to a per-section JSONL journal next to the hub, and
+the markdown section is re-rendered from those records by a compaction step
+that runs on a schedule or on demand. Appending a record costs O(1) regardless
+of hub size; only compaction touches the markdown.
+
+Hook processes and sub-agents share the hub, so every write goes through this
+module: journal appends and rotations are serialized with ``fcntl`` advisory
+locks, and the markdown is replaced atomically (temp file + ``os.replace``)
+after an optimistic check that nobody rewrote it since it was read.
+
+Readers that only need one section use ``HubSectionIndex``: a sidecar file
+with the byte offsets of every ``##``/``###`` section, keyed by the hub's
+stamp, lets them mmap the hub and decode just that section. In-process
+consumers go through the shared ``HubReader``, which caches each section's
+parsed representation per hub version, so a section is parsed once per change
+no matter how many components read it.
+"""
+
+import re
+import json
+import mmap
+import os
+import time
+import uuid
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+HubStamp = Optional[Tuple[int, int, int]]  # (st_ino, st_mtime_ns, st_size)
+
+_io_stats = {
+    "lock_acquisitions": 0,
+    "lock_wait_ms": 0.0,
+    "max_lock_wait_ms": 0.0,
+    "optimistic_conflicts": 0,
+    "pessimistic_fallbacks": 0,
+    "atomic_writes": 0,
+    "section_index_hits": 0,
+    "section_index_rebuilds": 0,
+    "hub_reader_hits": 0,
+    "hub_reader_parses": 0,
+}
+
+# A "## "/"### " heading, or a "- **" pattern line
+_SECTION_LINE_RE = re.compile(rb"^(#{2,3}) [^\n]*|^[ \t]*- \*\*", re.MULTILINE)
+
+
+@contextmanager
+def file_lock(path: str, shared: bool = False):
+    """Hold an advisory lock on ``path + '.lock'``.
+
+    The lock is exclusive unless ``shared`` is set. Shared locks are taken by
+    readers and expect the directory to exist already.
+    """
+    lock_path = f"{path}.lock"
+    if not shared:
+        os.makedirs(os.path.dirname(lock_path) or ".", exist_ok=True)
+    with open(lock_path, "a") as lock_file:
+        if fcntl is None:
+            yield
+            return
+
+        wait_start = time.perf_counter()
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        wait_ms = (time.perf_counter() - wait_start) * 1000
+        _io_stats["lock_acquisitions"] += 1
+        _io_stats["lock_wait_ms"] += wait_ms
+        _io_stats["max_lock_wait_ms"] = max(_io_stats["max_lock_wait_ms"], wait_ms)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def hub_stamp(path: str) -> HubStamp:
+    """Identify the current version of a file by inode, mtime and size."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def read_hub(path: str) -> Tuple[str, HubStamp]:
+    """Read hub content together with the stamp of the version that was read."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            stamp = os.fstat(f.fileno())
+            content = f.read()
+    except FileNotFoundError:
+        return "", None
+    return content, (stamp.st_ino, stamp.st_mtime_ns, stamp.st_size)
+
+
+def atomic_write(path: str, content: str) -> HubStamp:
+    """Replace ``path`` with ``content`` so readers never see a partial file.
+
+    Returns the stamp of the written version.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(
+        prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+            stat = os.fstat(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    _io_stats["atomic_writes"] += 1
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def update_hub(
+    path: str, transform: Callable[[str], str], max_attempts: int = 5
+) -> bool:
+    """Apply ``transform`` to the hub content without losing concurrent updates.
+
+    The transform runs outside the lock; the lock is only held to verify the
+    hub is still the version that was read and to swap in the new content.
+    After ``max_attempts`` conflicts the update runs entirely under the lock.
+    """
+    for _ in range(max_attempts):
+        content, stamp = read_hub(path)
+        updated_content = transform(content)
+        with file_lock(path):
+            if hub_stamp(path) == stamp:
+                new_stamp = atomic_write(path, updated_content)
+                break
+        _io_stats["optimistic_conflicts"] += 1
+    else:
+        _io_stats["pessimistic_fallbacks"] += 1
+        with file_lock(path):
+            content, _ = read_hub(path)
+            updated_content = transform(content)
+            new_stamp = atomic_write(path, updated_content)
+
+    # The new content is at hand, so refresh the section index for free
+    HubSectionIndex(path).store(updated_content.encode("utf-8"), new_stamp)
+    return True
+
+
+def build_section_index(data: bytes) -> List[Dict]:
+    """Locate every ``##``/``###`` section in hub bytes in a single pass.
+
+    Each section spans from its heading to the next heading of the same or a
+    higher level, so ``##`` sections include their ``###`` subsections.
+    ``pattern_count`` counts the ``- **`` lines directly under the heading.
+    """
+    sections: List[Dict] = []
+    open_sections: List[Dict] = []
+    for match in _SECTION_LINE_RE.finditer(data):
+        if match.group(1) is None:
+            if sections:
+                sections[-1]["pattern_count"] += 1
+            continue
+
+        level = len(match.group(1))
+        while open_sections and open_sections[-1]["level"] >= level:
+            open_sections.pop()["end"] = match.start()
+        section = {
+            "heading": match.group(0).decode("utf-8", "replace").rstrip("\r"),
+            "level": level,
+            "start": match.start(),
+            "end": len(data),
+            "pattern_count": 0,
+        }
+        sections.append(section)
+        open_sections.append(section)
+    return sections
+
+
+class HubSectionIndex:
+    """Byte offsets of the hub's sections, cached in a sidecar JSON file."""
+
+    def __init__(self, hub_path: str):
+        """Initialize the index for ``hub_path``."""
+        self.hub_path = str(hub_path)
+        base, _ = os.path.splitext(self.hub_path)
+        self.index_path = f"{base}.sections.json"
+        self._stamp: HubStamp = None
+        self._sections: List[Dict] = []
+
+    def sections(self) -> List[Dict]:
+        """Get the sections of the current hub version."""
+        try:
+            with open(self.hub_path, "rb") as f:
+                return self._load(f)
+        except FileNotFoundError:
+            return []
+
+    def find(self, heading: str, prefix: bool = False) -> Optional[Dict]:
+        """Find the first section whose heading is (or starts with) ``heading``."""
+        return self._find(self.sections(), heading, prefix)
+
+    def read_section(self, heading: str, prefix: bool = False) -> str:
+        """Read one section's text, or "" when the hub has no such section."""
+        try:
+            with open(self.hub_path, "rb") as f:
+                section = self._find(self._load(f), heading, prefix)
+                if section is None:
+                    return ""
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as hub_map:
+                    data = hub_map[section["start"] : section["end"]]
+        except FileNotFoundError:
+            return ""
+        return data.decode("utf-8")
+
+    def store(self, data, stamp: HubStamp):
+        """Index ``data``, the hub content of version ``stamp``."""
+        self._stamp, self._sections = stamp, build_section_index(data)
+        try:
+            atomic_write(
+                self.index_path,
+                json.dumps({"stamp": list(stamp), "sections": self._sections}),
+            )
+        except OSError as e:
+            logger.debug(f"Could not write hub section index {self.index_path}: {e}")
+
+    def _load(self, f) -> List[Dict]:
+        """Get sections for the open hub file, rebuilding a stale index."""
+        stat = os.fstat(f.fileno())
+        stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp:
+            _io_stats["section_index_hits"] += 1
+            return self._sections
+
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as index_file:
+                cached = json.load(index_file)
+            if tuple(cached["stamp"]) == stamp:
+                _io_stats["section_index_hits"] += 1
+                self._stamp, self._sections = stamp, cached["sections"]
+                return self._sections
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        _io_stats["section_index_rebuilds"] += 1
+        if stat.st_size == 0:
+            self.store(b"", stamp)
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as hub_map:
+                self.store(hub_map, stamp)
+        return self._sections
+
+    @staticmethod
+    def _find(sections: List[Dict], heading: str, prefix: bool) -> Optional[Dict]:
+        for section in sections:
+            if section["heading"] == heading or (
+                prefix and section["heading"].startswith(heading)
+            ):
+                return section
+        return None
+
+
+class HubReader:
+    """Process-wide cache of parsed hub sections, revalidated by one ``stat``.
+
+    Entries are kept per hub path together with the stamp of the version they
+    were read from. Every access stats the hub once; while the stamp is
+    unchanged, sections and parsed results are served from memory. Parsers
+    are cached by identity, so they must be module-level functions (not bound
+    methods) for different consumers to share one parse.
+    """
+
+    def __init__(self):
+        """Initialize an empty reader."""
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+
+    def _entry(self, path: str) -> Dict[str, Any]:
+        """Get the entry for ``path``, dropping it if the hub has changed.
+
+        The stamp is taken before anything is read, so a concurrent write can
+        at worst cache newer content under an older stamp, which the next
+        access discards.
+        """
+        path = os.path.abspath(path)
+        stamp = hub_stamp(path)
+        entry = self._entries.get(path)
+        if entry is None or entry["stamp"] != stamp:
+            index = entry["index"] if entry else HubSectionIndex(path)
+            entry = self._entries[path] = {
+                "stamp": stamp,
+                "index": index,
+                "sections": None,
+                "texts": {},
+                "parsed": {},
+            }
+        return entry
+
+    def sections(self, path: str) -> List[Dict]:
+        """Get the section index of the current hub version."""
+        with self._lock:
+            entry = self._entry(path)
+            if entry["sections"] is None:
+                entry["sections"] = entry["index"].sections()
+            return entry["sections"]
+
+    def read_section(self, path: str, heading: str, prefix: bool = False) -> str:
+        """Read one section's text, or "" when the hub has no such section."""
+        with self._lock:
+            return self._section_text(self._entry(path), heading, prefix)
+
+    def parse_section(
+        self,
+        path: str,
+        heading: str,
+        parser: Callable[[str], Any],
+        prefix: bool = False,
+    ) -> Any:
+        """Get ``parser(section text)``, parsed once per hub version.
+
+        Callers share the returned object and must not mutate it.
+        """
+        key = (heading, prefix, parser)
+        with self._lock:
+            entry = self._entry(path)
+            if key in entry["parsed"]:
+                _io_stats["hub_reader_hits"] += 1
+                return entry["parsed"][key]
+            _io_stats["hub_reader_parses"] += 1
+            parsed = parser(self._section_text(entry, heading, prefix))
+            entry["parsed"][key] = parsed
+            return parsed
+
+    def invalidate(self, path: Optional[str] = None):
+        """Forget cached content for ``path``, or for every hub."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(path), None)
+
+    @staticmethod
+    def _section_text(entry: Dict[str, Any], heading: str, prefix: bool) -> str:
+        key = (heading, prefix)
+        if key not in entry["texts"]:
+            entry["texts"][key] = entry["index"].read_section(heading, prefix)
+        return entry["texts"][key]
+
+
+_hub_reader: Optional[HubReader] = None
+_hub_reader_lock = threading.Lock()
+
+
+def get_hub_reader() -> HubReader:
+    """Get the process-wide hub reader."""
+    global _hub_reader
+    if _hub_reader is None:
+        with _hub_reader_lock:
+            if _hub_reader is None:
+                _hub_reader = HubReader()
+    return _hub_reader
+
+
+def get_hub_io_stats() -> Dict[str, float]:
+    """Get process-wide hub locking and write statistics."""
+    stats = dict(_io_stats)
+    stats["avg_lock_wait_ms"] = stats["lock_wait_ms"] / max(
+        stats["lock_acquisitions"], 1
+    )
+    return stats
+
+
+class CoordinationHubLog:
+    """Append-only JSONL journal for one coordination hub section."""
+
+    def __init__(
+        self,
+        hub_path: str,
+        channel: str,
+        compact_every: int = 50,
+        compact_interval_seconds: float = 300.0,
+    ):
+        """Initialize the journal for ``channel`` next to ``hub_path``."""
+        self.hub_path = str(hub_path)
+        self.channel = channel
+        base, _ = os.path.splitext(self.hub_path)
+        self.log_path = f"{base}.{channel}.jsonl"
+        self.compacting_path = f"{self.log_path}.compacting"
+        self.compact_every = compact_every
+        self.compact_interval_seconds = compact_interval_seconds
+        self.stale_compaction_seconds = 60.0  # Rotated logs older than this are orphans
+
+        self.pending_count = 0  # Records appended since the last compaction
+        self.last_compaction = time.time()
+        self._applied_ids = set()  # Record ids already reflected in caller state
+
+    def append(self, record: Dict) -> bool:
+        """Append one record to the journal."""
+        return self.append_many([record])
+
+    def append_many(self, records: List[Dict]) -> bool:
+        """Append several records to the journal with a single locked write."""
+        now = time.time()
+        entries = [{"rid": uuid.uuid4().hex, "ts": now, **record} for record in records]
+        if not entries:
+            return True
+        lines = "".join(
+            json.dumps(entry, separators=(",", ":"), default=str) + "\n"
+            for entry in entries
+        )
+        try:
+            with file_lock(self.log_path):
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(lines)
+        except OSError as e:
+            logger.error(f"Failed to append to hub log {self.log_path}: {e}")
+            return False
+
+        self._applied_ids.update(entry["rid"] for entry in entries)
+        self.pending_count += len(entries)
+        return True
+
+    def replay(self) -> List[Dict]:
+        """Return journal records not yet applied by this instance."""
+        return self._take_unapplied(self.pending_records())
+
+    def pending_records(self) -> List[Dict]:
+        """Return every record still waiting in the journal.
+
+        Reading never creates the memory directory or the lock file of a
+        journal that does not exist yet.
+        """
+        if not (os.path.exists(self.log_path) or os.path.exists(self.compacting_path)):
+            return []
+        try:
+            # Shared, so rotation by a compactor cannot hide records mid-read
+            with file_lock(self.log_path, shared=True):
+                records = self._read_records(self.compacting_path)
+                records.extend(self._read_records(self.log_path))
+        except FileNotFoundError:
+            # The memory directory was removed after the check
+            return []
+        return records
+
+    def should_compact(self) -> bool:
+        """Check whether the scheduled compaction is due."""
+        if self.pending_count == 0:
+            return False
+        return (
+            self.pending_count >= self.compact_every
+            or time.time() - self.last_compaction >= self.compact_interval_seconds
+        )
+
+    def compact(
+        self,
+        render: Callable[[str], str],
+        apply: Optional[Callable[[List[Dict]], None]] = None,
+        include_applied: bool = False,
+    ) -> bool:
+        """Fold the journal into the markdown hub.
+
+        ``apply`` runs once with the rotated journal records not yet applied by
+        this instance, or with all of them when ``include_applied`` is set
+        (for sections that append records rather than re-render from state).
+        ``render`` maps the current hub content to the updated content and may
+        run again if another process rewrote the hub concurrently, so it must
+        not have side effects.
+        """
+        with file_lock(self.log_path):
+            try:
+                # The compactor removes its rotated log without the lock
+                age = time.time() - os.path.getmtime(self.compacting_path)
+            except FileNotFoundError:
+                age = None
+            if age is not None:
+                if age < self.stale_compaction_seconds:
+                    logger.debug(
+                        f"Hub log compaction already in progress: {self.log_path}"
+                    )
+                    return False
+                # A compactor died mid-way; put its records back first
+                self._merge_rotated_locked()
+            try:
+                os.replace(self.log_path, self.compacting_path)
+                rotated = True
+            except FileNotFoundError:
+                rotated = False
+
+        try:
+            records = self._read_records(self.compacting_path) if rotated else []
+            unapplied = self._take_unapplied(records)
+            if apply is not None:
+                apply(records if include_applied else unapplied)
+            update_hub(self.hub_path, render)
+
+        except Exception as e:
+            logger.error(f"Failed to compact hub log {self.log_path}: {e}")
+            if rotated:
+                self._restore_rotated()
+            return False
+
+        if rotated:
+            os.remove(self.compacting_path)
+        self._applied_ids.clear()
+        self.pending_count = 0
+        self.last_compaction = time.time()
+        return True
+
+    def _take_unapplied(self, records: List[Dict]) -> List[Dict]:
+        unapplied = [r for r in records if r.get("rid") not in self._applied_ids]
+        self._applied_ids.update(r.get("rid") for r in unapplied)
+        return unapplied
+
+    def _restore_rotated(self):
+        """Put rotated records back in front of anything appended meanwhile."""
+        try:
+            with file_lock(self.log_path):
+                self._merge_rotated_locked()
+        except OSError as e:
+            logger.error(f"Failed to restore hub log {self.log_path}: {e}")
+
+    def _merge_rotated_locked(self):
+        """Merge the rotated log back into the journal; caller holds the lock."""
+        with open(self.compacting_path, "r", encoding="utf-8") as f:
+            rotated_content = f.read()
+        appended_content = ""
+        if os.path.exists(self.log_path):
+            with open(self.log_path, "r", encoding="utf-8") as f:
+                appended_content = f.read()
+        atomic_write(self.log_path, rotated_content + appended_content)
+        os.remove(self.compacting_path)
+
+    @staticmethod
+    def _read_records(path: str) -> List[Dict]:
+        records = []
+        try:
+            f = open(path, "r", encoding="utf-8")
+        except FileNotFoundError:
+            # Missing, or a rotated log its compactor has just removed
+            return records
+
+        with f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A torn trailing line from an interrupted writer
+                    logger.warning(f"Skipping malformed hub log line in {path}")
+        return records
@@ -14,12 +14,19 @@ Purpose: Advanced cross-domain integration with enhanced boundary detection and
 """
 
 import re
+import sys
 import time
+import heapq
 import os
-import uuid
 import random
-import gc
-from typing import Dict, List, Tuple, Optional, Set
+import atexit
+import pickle
+import threading
+import tracemalloc
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Iterable, List, Tuple, Optional, Set
 from dataclasses import dataclass
 from enum import Enum
 from collections import defaultdict, Counter, deque
@@ -27,6 +34,85 @@ from pathlib import Path
 from datetime import datetime, timedelta
 import logging
 
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+try:
+    from .coordination_hub import CoordinationHubLog, get_hub_reader, update_hub
+    from .sqlite_pattern_store import (
+        SQLitePatternBackend,
+        SQLitePatternMap,
+        default_db_path,
+    )
+except ImportError:
+    from coordination_hub import CoordinationHubLog, get_hub_reader, update_hub
+    from sqlite_pattern_store import (
+        SQLitePatternBackend,
+        SQLitePatternMap,
+        default_db_path,
+    )
+
+try:
+    from .metrics_registry import get_metrics_registry
+except ImportError:
+    from metrics_registry import get_metrics_registry
+
+_metrics = get_metrics_registry()
+PATTERN_STORE_OPERATION_MS = _metrics.histogram(
+    "pattern_store_operation_ms",
+    "Pattern store operation latency in milliseconds",
+    ("operation",),
+)
+PATTERN_STORE_DIRTY = _metrics.gauge(
+    "pattern_store_dirty_patterns", "Patterns buffered for the next flush"
+)
+ADMISSION_ADMITTED = _metrics.counter(
+    "admission_admitted_total", "Selections admitted by admission control"
+)
+ADMISSION_OVER_BUDGET = _metrics.counter(
+    "admission_over_budget_total",
+    "Selections admitted past the rate or concurrency budget",
+)
+ADMISSION_DEGRADED = _metrics.counter(
+    "admission_degraded_total", "Selections that shed at least one stage"
+)
+ADMISSION_SHED = _metrics.counter(
+    "admission_shed_total", "Skipped runs of optional stages", ("stage",)
+)
+ADMISSION_IN_FLIGHT = _metrics.gauge(
+    "admission_in_flight", "Selections currently admitted"
+)
+GUARD_VIOLATIONS = _metrics.counter(
+    "performance_guard_violations_total",
+    "Performance budget violations",
+    ("budget",),
+)
+COORDINATION_EXECUTIONS = _metrics.counter(
+    "coordination_executions_total", "Learning coordinator executions"
+)
+COORDINATION_ENHANCED = _metrics.counter(
+    "coordination_enhanced_total",
+    "Learning coordinator results improved by learned patterns",
+)
+SAFETY_EXECUTION_MS = _metrics.histogram(
+    "safety_execution_ms",
+    "Execution time recorded by the safety manager in milliseconds",
+    ("success",),
+)
+SAFETY_ERRORS = _metrics.counter(
+    "safety_errors_total", "Errors recorded by the safety manager", ("error_type",)
+)
+HEALTH_CHECKS = _metrics.counter(
+    "health_checks_total", "Completed system health checks", ("healthy",)
+)
+HEALTH_STATUS = _metrics.gauge(
+    "health_component_healthy",
+    "1 if the component passed the last health check, else 0",
+    ("component",),
+)
+
 
 @dataclass
 class CoordinationResult:
@@ -50,6 +136,116 @@ class CoordinationPattern:
     execution_time_ms: float
 
 
+def _pattern_to_record(pattern: CoordinationPattern) -> Dict[str, any]:
+    """Serialize a coordination pattern for the hub log."""
+    return {
+        "pattern_id": pattern.pattern_id,
+        "query_signature": pattern.query_signature,
+        "agent_sequence": list(pattern.agent_sequence),
+        "success_rate": pattern.success_rate,
+        "last_used": pattern.last_used.isoformat(),
+        "execution_time_ms": pattern.execution_time_ms,
+    }
+
+
+def _pattern_from_record(record: Dict[str, any]) -> CoordinationPattern:
+    """Rebuild a coordination pattern from a hub log record."""
+    return CoordinationPattern(
+        pattern_id=record["pattern_id"],
+        query_signature=record.get("query_signature", ""),
+        agent_sequence=list(record["agent_sequence"]),
+        success_rate=float(record["success_rate"]),
+        last_used=datetime.fromisoformat(record["last_used"]),
+        execution_time_ms=float(record["execution_time_ms"]),
+    )
+
+
+def _patterns_from_records(
+    records: List[Dict[str, any]],
+) -> Dict[str, CoordinationPattern]:
+    """Rebuild patterns from hub log records, later records winning."""
+    patterns = {}
+    for record in records:
+        try:
+            pattern = _pattern_from_record(record)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Skipping malformed pattern log record: {e}")
+            continue
+        patterns[pattern.pattern_id] = pattern
+    return patterns
+
+
+PATTERNS_SECTION_HEADING = "## Infrastructure Learning Patterns"
+
+
+def _parse_hub_patterns(content: str) -> Dict[str, CoordinationPattern]:
+    """Parse the coordination patterns section of the hub markdown."""
+    patterns = {}
+    for line in content.split("\n"):
+        if line.startswith("- **") and "**:" in line:
+            try:
+                pattern_id = line[4 : line.find("**:", 4)]
+
+                # Extract metrics
+                details = line[line.find("**:") + 3 :]
+                agents = details[: details.find("(")].strip().split(",")
+
+                confidence = float(
+                    re.search(r"confidence: ([0-9.]+)", details).group(1)
+                )
+                exec_time = float(
+                    re.search(r"execution_time: ([0-9.]+)", details).group(1)
+                )
+                days_ago = int(re.search(r"learned: ([0-9]+)", details).group(1))
+
+                patterns[pattern_id] = CoordinationPattern(
+                    pattern_id=pattern_id,
+                    query_signature="",  # Not stored in file
+                    agent_sequence=agents,
+                    success_rate=confidence,
+                    last_used=datetime.now() - timedelta(days=days_ago),
+                    execution_time_ms=exec_time,
+                )
+
+            except Exception as e:
+                logger.warning(f"Failed to parse pattern: {line}. Error: {e}")
+                continue
+
+    return patterns
+
+
+def _parse_learned_confidences(content: str) -> Dict[str, float]:
+    """Parse ``pattern_key -> confidence`` from the hub's learned patterns."""
+    confidences = {}
+    for line in content.split("\n"):
+        stripped_line = line.strip()
+        if not (stripped_line.startswith("- **") and "**:" in stripped_line):
+            continue
+        # Format: - **pattern_key**: agent_name (confidence: X.X, keywords: ..., learned: X days ago)
+        try:
+            start_idx = stripped_line.find("**") + 2
+            end_idx = stripped_line.find("**:", start_idx)
+            if end_idx <= start_idx or "confidence:" not in stripped_line:
+                continue
+            pattern_key = stripped_line[start_idx:end_idx]
+
+            conf_start = stripped_line.find("confidence: ") + len("confidence: ")
+            conf_end = stripped_line.find(",", conf_start)
+            if conf_end == -1:
+                conf_end = stripped_line.find(")", conf_start)
+            if conf_end <= conf_start:
+                continue
+
+            confidence_str = stripped_line[conf_start:conf_end].strip()
+            try:
+                confidences[pattern_key] = float(confidence_str)
+            except ValueError:
+                logger.warning(f"Could not parse confidence value: {confidence_str}")
+        except (IndexError, ValueError) as e:
+            logger.debug(f"Could not parse pattern line: {stripped_line}, error: {e}")
+    return confidences
+
+
 @dataclass
 class SafetyThresholds:
     """Performance and safety thresholds."""
@@ -58,58 +254,399 @@ class SafetyThresholds:
     max_selection_time_ms: float = 40.0
     min_confidence_score: float = 0.45
     max_memory_usage_mb: float = 512.0
+    max_selections_per_second: float = 1000.0
+    selection_burst: int = 1000
+    max_concurrent_selections: int = 64
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at ``rate`` per second."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take ``tokens`` if available, without waiting."""
+        with self._lock:
+            self._refill()
+            if self.tokens < tokens:
+                return False
+            self.tokens -= tokens
+            return True
 
+    def fill_ratio(self) -> float:
+        """Fraction of the bucket currently available."""
+        with self._lock:
+            self._refill()
+            return self.tokens / self.capacity if self.capacity else 0.0
+
+
+class Admission:
+    """One admitted selection and the optional stages it may run."""
+
+    def __init__(self, controller: "AdmissionController", load: float):
+        self.controller = controller
+        self.load = load
+        self.shed: List[str] = []
+        self._released = False
+
+    def allows(self, stage: str) -> bool:
+        """Whether ``stage`` runs at this admission's load; records sheds."""
+        shed_load = self.controller.stage_shed_load.get(stage)
+        if shed_load is None or self.load < shed_load:
+            return True
+        self.shed.append(stage)
+        self.controller.record_shed(stage)
+        return False
+
+    def release(self):
+        """Return the concurrency slot; safe to call more than once."""
+        if not self._released:
+            self._released = True
+            self.controller.release(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+        return False
+
+
+class AdmissionController:
+    """Per-process admission control for agent selection.
+
+    Every selection takes a token from a rate-limited bucket and a slot in
+    a concurrency limit, and its load is the larger of bucket depletion and
+    slot usage (1.0 once either budget is exhausted). Optional stages are
+    shed, most expensive first, as the load passes their thresholds; the
+    core selection is never refused.
+    """
+
+    # Optional stages in shedding order and the load at which each is shed
+    STAGE_SHED_LOAD = {
+        "cross_domain_analysis": 0.5,
+        "learning_enhancement": 0.75,
+        "reasoning": 0.9,
+    }
+
+    def __init__(self, thresholds: Optional[SafetyThresholds] = None):
+        thresholds = thresholds or SafetyThresholds()
+        self.bucket = TokenBucket(
+            thresholds.max_selections_per_second, thresholds.selection_burst
+        )
+        self.max_concurrent = thresholds.max_concurrent_selections
+        self.stage_shed_load = dict(self.STAGE_SHED_LOAD)
+        self.in_flight = 0
+        self.admitted = 0
+        self.over_budget = 0
+        self.degraded = 0
+        self.shed_counts: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def admit(self) -> Admission:
+        """Admit one selection; release it (or use it as a context manager)."""
+        has_token = self.bucket.try_acquire()
+        with self._lock:
+            self.admitted += 1
+            concurrency = self.in_flight / max(1, self.max_concurrent)
+            self.in_flight += 1
+            if not has_token or concurrency >= 1.0:
+                self.over_budget += 1
+                ADMISSION_OVER_BUDGET.inc()
+        ADMISSION_ADMITTED.inc()
+        ADMISSION_IN_FLIGHT.inc()
+        if not has_token:
+            load = 1.0
+        else:
+            load = min(1.0, max(1.0 - self.bucket.fill_ratio(), concurrency))
+        return Admission(self, load)
+
+    def current_load(self) -> float:
+        """Load right now, without admitting anything."""
+        with self._lock:
+            concurrency = self.in_flight / max(1, self.max_concurrent)
+        return min(1.0, max(1.0 - self.bucket.fill_ratio(), concurrency))
+
+    def record_shed(self, stage: str):
+        """Count one skipped run of an optional stage."""
+        with self._lock:
+            self.shed_counts[stage] += 1
+        ADMISSION_SHED.inc(stage=stage)
+
+    def release(self, admission: Admission):
+        """Finish an admission, counting it as degraded if it shed stages."""
+        with self._lock:
+            self.in_flight -= 1
+            if admission.shed:
+                self.degraded += 1
+        ADMISSION_IN_FLIGHT.dec()
+        if admission.shed:
+            ADMISSION_DEGRADED.inc()
+
+    def get_stats(self) -> Dict[str, any]:
+        """Admission, shed and degraded counters."""
+        load = self.current_load()
+        with self._lock:
+            return {
+                "admitted": self.admitted,
+                "over_budget": self.over_budget,
+                "degraded": self.degraded,
+                "shed": dict(self.shed_counts),
+                "in_flight": self.in_flight,
+                "load": load,
+            }
+
+
+_admission_controller: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """Get the process-wide admission controller."""
+    global _admission_controller
+    if _admission_controller is None:
+        _admission_controller = AdmissionController()
+    return _admission_controller
+
+
+class BudgetExceeded(Exception):
+    """Raised by ``PerformanceGuard.check()`` once a budget is spent."""
+
+    def __init__(self, budget: str, observed: float, limit: float):
+        super().__init__(f"{budget} budget exceeded: {observed:.2f} > {limit:.2f}")
+        self.budget = budget
+        self.observed = observed
+        self.limit = limit
+
+
+def _current_rss_mb() -> Optional[float]:
+    """Resident set size of this process in MB, if the platform exposes it."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    if resource is None:
+        return None
+    # Peak rather than current RSS; kilobytes on Linux, bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
 
-class PerformanceGuard:
-    """Ensures operations stay within safety thresholds."""
 
-    def __init__(self, thresholds: SafetyThresholds):
+class PerformanceGuard:
+    """Ensures operations stay within safety thresholds.
+
+    Time is measured with ``perf_counter_ns`` against ``budget_ms``, which
+    defaults to ``max_selection_time_ms``. With ``track_memory="tracemalloc"``
+    the peak of Python allocations made inside the block is measured; with
+    ``"rss"`` the resident set is sampled on every ``check()`` and on exit.
+    Either is compared to ``max_memory_usage_mb``. Violations are logged,
+    kept in ``violations`` and passed to ``metrics_sink`` as
+    ``(budget, observed, limit)``.
+
+    Guarded code can poll ``expired()`` or ``remaining_ms()``, or call
+    ``check()``, which raises ``BudgetExceeded`` so over-budget work stops
+    early instead of finishing late. Exceptions are never swallowed.
+    """
+
+    def __init__(
+        self,
+        thresholds: SafetyThresholds,
+        budget_ms: Optional[float] = None,
+        track_memory: Optional[str] = None,
+        metrics_sink: Optional[Callable[[str, float, float], None]] = None,
+    ):
+        if track_memory not in (None, "tracemalloc", "rss"):
+            raise ValueError(f"Unknown memory tracking mode: {track_memory}")
         self.thresholds = thresholds
-        self.start_time: float = 0
-        self.peak_memory: float = 0
+        self.budget_ms = (
+            budget_ms if budget_ms is not None else thresholds.max_selection_time_ms
+        )
+        self.track_memory = track_memory
+        self.metrics_sink = metrics_sink
+        self.start_ns = 0
+        self.deadline_ns = 0
+        self.duration_ms: float = 0
+        self.peak_memory: float = 0  # MB above the baseline at entry
+        self.aborted = False
+        self.violations: List[Tuple[str, float, float]] = []
         self.logger = logging.getLogger("performance_guard")
+        self._memory_baseline: float = 0
+        self._started_tracemalloc = False
 
     def __enter__(self):
-        self.start_time = time.time()
+        if self.track_memory == "tracemalloc":
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                self._started_tracemalloc = True
+            self._memory_baseline = tracemalloc.get_traced_memory()[0] / (1024 * 1024)
+        elif self.track_memory == "rss":
+            self._memory_baseline = _current_rss_mb() or 0.0
+        self.start_ns = time.perf_counter_ns()
+        self.deadline_ns = self.start_ns + int(self.budget_ms * 1_000_000)
         return self
 
+    def elapsed_ms(self) -> float:
+        """Milliseconds since the guard was entered."""
+        return (time.perf_counter_ns() - self.start_ns) / 1_000_000
+
+    def remaining_ms(self) -> float:
+        """Milliseconds left before the time budget is spent."""
+        return (self.deadline_ns - time.perf_counter_ns()) / 1_000_000
+
+    def expired(self) -> bool:
+        """Whether the time budget is spent."""
+        return time.perf_counter_ns() >= self.deadline_ns
+
+    def check(self):
+        """Raise ``BudgetExceeded`` if the time or memory budget is spent."""
+        if self.expired():
+            raise BudgetExceeded("time_ms", self.elapsed_ms(), self.budget_ms)
+        if self.track_memory:
+            self._sample_memory()
+            if self.peak_memory > self.thresholds.max_memory_usage_mb:
+                raise BudgetExceeded(
+                    "memory_mb", self.peak_memory, self.thresholds.max_memory_usage_mb
+                )
+
+    def _sample_memory(self):
+        if self.track_memory == "tracemalloc":
+            current = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        else:
+            current = _current_rss_mb() or 0.0
+        self.peak_memory = max(self.peak_memory, current - self._memory_baseline)
+
+    def _record_violation(self, budget: str, observed: float, limit: float):
+        self.violations.append((budget, observed, limit))
+        GUARD_VIOLATIONS.inc(budget=budget)
+        self.logger.warning(
+            f"Performance threshold exceeded: {budget} {observed:.2f} > {limit:.2f}"
+        )
+        if self.metrics_sink is not None:
+            self.metrics_sink(budget, observed, limit)
+
     def __exit__(self, exc_type, exc_val, exc_tb):
-        duration_ms = (time.time() - self.start_time) * 1000
-        if duration_ms > self.thresholds.max_selection_time_ms:
-            self.logger.warning(f"Performance threshold exceeded: {duration_ms:.2f}ms")
-            return False
-        return True
+        self.duration_ms = self.elapsed_ms()
+        self.aborted = exc_type is not None and issubclass(exc_type, BudgetExceeded)
+        if self.track_memory:
+            self._sample_memory()
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+
+        if self.duration_ms > self.budget_ms:
+            self._record_violation("time_ms", self.duration_ms, self.budget_ms)
+        if self.peak_memory > self.thresholds.max_memory_usage_mb:
+            self._record_violation(
+                "memory_mb", self.peak_memory, self.thresholds.max_memory_usage_mb
+            )
+        return False
 
 
 class PatternStore:
-    """Stores and manages coordination patterns."""
+    """Stores and manages coordination patterns.
 
-    def __init__(self, hub_path: Optional[str] = None):
+    With ``use_sqlite`` the patterns live in an indexed SQLite database and
+    ``patterns`` is a lazy mapping over it; the markdown section is exported
+    from the database instead of being the source of truth.
+
+    Stores are write-behind: ``store_pattern`` only updates memory and marks
+    the pattern dirty. Dirty patterns are written in one batch when
+    ``flush_batch_size`` accumulate, every ``flush_interval_seconds`` from a
+    background thread, on ``flush()`` and at interpreter exit.
+
+    ``version`` increases whenever the pattern table changes, so consumers
+    such as ``EvolutionEngine`` can skip work while nothing changed.
+    """
+
+    def __init__(
+        self,
+        hub_path: Optional[str] = None,
+        use_sqlite: bool = False,
+        db_path: Optional[str] = None,
+    ):
         self.hub_path = hub_path or str(
             Path.cwd() / ".claude" / "memory" / "coordination-hub.md"
         )
+        self.sqlite_backend: Optional[SQLitePatternBackend] = None
         self.patterns: Dict[str, CoordinationPattern] = {}
+        if use_sqlite or db_path:
+            self.sqlite_backend = SQLitePatternBackend(
+                db_path or default_db_path(self.hub_path)
+            )
+            self.patterns = SQLitePatternMap(
+                self.sqlite_backend, _pattern_to_record, _pattern_from_record
+            )
         self.performance_metrics: List[Dict[str, float]] = []
         self.last_operation_time = 0
+        self.last_flush_time = 0
         self.start_time = time.time()
+        self.hub_log = CoordinationHubLog(self.hub_path, "patterns")
+        self.hub_reader = get_hub_reader()
+        self._stores_since_export = 0
+
+        self.flush_batch_size = 32
+        self.flush_interval_seconds = 2.0
+        self._dirty: Dict[str, CoordinationPattern] = {}
+        self._buffer_lock = threading.RLock()
+        self._flusher: Optional[threading.Thread] = None
+        self._flusher_stop = threading.Event()
+        self.version = 0
         self.load_patterns()
 
     def load_patterns(self):
-        """Load patterns from coordination hub."""
+        """Load patterns from coordination hub and replay its pending log."""
         try:
             start_time = time.perf_counter()
 
-            if os.path.exists(self.hub_path):
-                with open(self.hub_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                    self._parse_patterns(content)
+            if self.sqlite_backend is not None:
+                self._import_hub_into_sqlite()
+            else:
+                self._parse_patterns(self._read_hub_patterns())
+
+            if self.sqlite_backend is None:
+                self._apply_log_records(self.hub_log.replay())
 
             operation_time = (time.perf_counter() - start_time) * 1000
             self._record_operation("load", operation_time)
 
         except Exception as e:
             logger.error(f"Failed to load patterns: {e}")
-            self.patterns = {}
+            if self.sqlite_backend is None:
+                self.patterns = {}
+
+    def _import_hub_into_sqlite(self):
+        """Seed an empty pattern database from the markdown hub and its log."""
+        if self.sqlite_backend.count_patterns():
+            return
+
+        self._parse_patterns(self._read_hub_patterns())
+        self._apply_log_records(self.hub_log.replay())
+        self.patterns.flush()
+
+    def _read_hub_patterns(self) -> Dict[str, CoordinationPattern]:
+        """Get the hub's patterns section, parsed once per hub version."""
+        return self.hub_reader.parse_section(
+            self.hub_path, PATTERNS_SECTION_HEADING, _parse_hub_patterns, prefix=True
+        )
+
+    def get_patterns_by_query_type(self, query_type: str) -> List[CoordinationPattern]:
+        """Get patterns whose query signature contains ``query_type``."""
+        if self.sqlite_backend is not None:
+            return self.patterns.find_by_query_type(query_type)
+        return [p for p in self.patterns.values() if query_type in p.query_signature]
 
     def store_pattern(self, pattern: CoordinationPattern) -> bool:
         """Store pattern if it meets quality threshold."""
@@ -119,85 +656,109 @@ class PatternStore:
             if pattern.success_rate < 0.45:
                 return False
 
-            self.patterns[pattern.pattern_id] = pattern
-            success = self._save_patterns()
+            with self._buffer_lock:
+                self.patterns[pattern.pattern_id] = pattern
+                self._dirty[pattern.pattern_id] = pattern
+                self.version += 1
+                flush_due = len(self._dirty) >= self.flush_batch_size
 
             operation_time = (time.perf_counter() - start_time) * 1000
             self._record_operation("store", operation_time)
 
-            return success
+            if flush_due:
+                return self.flush()
+            self._ensure_flusher()
+            return True
 
         except Exception as e:
             logger.error(f"Failed to store pattern: {e}")
             return False
 
-    def _parse_patterns(self, content: str):
-        """Parse patterns from coordination hub content."""
-        try:
-            pattern_section = content.split("## Infrastructure Learning Patterns")[1]
-            pattern_lines = pattern_section.split("\n")
+    def flush(self) -> bool:
+        """Write dirty patterns now, compacting the hub if that is due."""
+        success, export_due = self._flush_buffer()
+        if export_due:
+            self._save_patterns()
+        return success
 
-            for line in pattern_lines:
-                if line.startswith("- **") and "**:" in line:
-                    try:
-                        pattern_id = line[3 : line.find("**:", 3)]
+    def close(self):
+        """Stop the background flusher and write any dirty patterns."""
+        self._flusher_stop.set()
+        self.flush()
 
-                        # Extract metrics
-                        details = line[line.find("**:") + 3 :]
-                        agents = details[: details.find("(")].strip().split(",")
+    def _flush_buffer(self) -> Tuple[bool, bool]:
+        """Write dirty patterns in one batch; returns (success, export_due)."""
+        with self._buffer_lock:
+            if not self._dirty:
+                return True, False
 
-                        confidence = float(
-                            re.search(r"confidence: ([0-9.]+)", details).group(1)
-                        )
-                        exec_time = float(
-                            re.search(r"execution_time: ([0-9.]+)", details).group(1)
-                        )
-                        days_ago = int(
-                            re.search(r"learned: ([0-9]+)", details).group(1)
-                        )
+            start_time = time.perf_counter()
+            if self.sqlite_backend is not None:
+                self.patterns.flush()
+                self._stores_since_export += len(self._dirty)
+                success = True
+                export_due = self._stores_since_export >= self.hub_log.compact_every
+            else:
+                success = self.hub_log.append_many(
+                    [_pattern_to_record(p) for p in self._dirty.values()]
+                )
+                export_due = success and self.hub_log.should_compact()
+            if success:
+                self._dirty.clear()
 
-                        pattern = CoordinationPattern(
-                            pattern_id=pattern_id,
-                            query_signature="",  # Not stored in file
-                            agent_sequence=agents,
-                            success_rate=confidence,
-                            last_used=datetime.now() - timedelta(days=days_ago),
-                            execution_time_ms=exec_time,
-                        )
+            operation_time = (time.perf_counter() - start_time) * 1000
+            self._record_operation("flush", operation_time)
+            return success, export_due
+
+    def _ensure_flusher(self):
+        """Start the background flusher thread on first use."""
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+        self._flusher_stop.clear()
+        self._flusher = threading.Thread(
+            target=_run_pattern_flusher,
+            args=(weakref.ref(self), self._flusher_stop, self.flush_interval_seconds),
+            name="pattern-store-flusher",
+            daemon=True,
+        )
+        self._flusher.start()
+        _write_behind_stores.add(self)
 
-                        self.patterns[pattern_id] = pattern
+    def _parse_patterns(self, patterns: Dict[str, CoordinationPattern]):
+        """Add patterns parsed from the coordination hub."""
+        for pattern_id, pattern in patterns.items():
+            self.patterns[pattern_id] = pattern
 
-                    except Exception as e:
-                        logger.warning(f"Failed to parse pattern: {line}. Error: {e}")
-                        continue
+    def _apply_log_records(self, records: List[Dict[str, any]]):
+        """Apply hub log records to the in-memory pattern table."""
+        if records:
+            self.patterns.update(_patterns_from_records(records))
+            self.version += 1
 
-        except Exception as e:
-            logger.error(f"Failed to parse patterns section: {e}")
-            self.patterns = {}
+    def compact_hub(self) -> bool:
+        """Render the patterns section from the hub log on demand."""
+        success, _ = self._flush_buffer()
+        return self._save_patterns() and success
 
     def _save_patterns(self) -> bool:
-        """Save patterns to coordination hub."""
+        """Compact the pattern log into the coordination hub markdown."""
         try:
             start_time = time.perf_counter()
 
-            # Load existing content
-            content = ""
-            if os.path.exists(self.hub_path):
-                with open(self.hub_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-
-            # Update patterns section
-            updated_content = self._update_patterns_section(content)
-
-            # Write back to file
-            os.makedirs(os.path.dirname(self.hub_path), exist_ok=True)
-            with open(self.hub_path, "w", encoding="utf-8") as f:
-                f.write(updated_content)
+            if self.sqlite_backend is not None:
+                # The database is authoritative; markdown is only exported
+                self.patterns.flush()
+                success = update_hub(self.hub_path, self._update_patterns_section)
+                self._stores_since_export = 0
+            else:
+                success = self.hub_log.compact(
+                    self._update_patterns_section, apply=self._apply_log_records
+                )
 
             operation_time = (time.perf_counter() - start_time) * 1000
             self._record_operation("save", operation_time)
 
-            return True
+            return success
 
         except Exception as e:
             logger.error(f"Failed to save patterns: {e}")
@@ -298,7 +859,13 @@ class PatternStore:
             }
         )
 
-        self.last_operation_time = duration_ms
+        PATTERN_STORE_OPERATION_MS.observe(duration_ms, operation=operation)
+        PATTERN_STORE_DIRTY.set(len(self._dirty))
+
+        if operation == "flush":
+            self.last_flush_time = duration_ms
+        else:
+            self.last_operation_time = duration_ms
 
         # Keep last 1000 metrics
         if len(self.performance_metrics) > 1000:
@@ -311,19 +878,31 @@ class PatternStore:
         return sum(p.success_rate for p in self.patterns.values()) / len(self.patterns)
 
     def _get_avg_operation_time(self) -> float:
-        """Get average operation time."""
-        if not self.performance_metrics:
+        """Get average operation time, excluding background flushes."""
+        operation_times = [
+            m["duration_ms"]
+            for m in self.performance_metrics
+            if m["operation"] != "flush"
+        ]
+        if not operation_times:
             return 0.0
-        return sum(m["duration_ms"] for m in self.performance_metrics) / len(
-            self.performance_metrics
-        )
+        return sum(operation_times) / len(operation_times)
 
     def get_performance_stats(self) -> Dict[str, float]:
         """Get pattern store performance statistics."""
         if not self.performance_metrics:
             return {}
 
-        operation_times = [m["duration_ms"] for m in self.performance_metrics]
+        operation_times = [
+            m["duration_ms"]
+            for m in self.performance_metrics
+            if m["operation"] != "flush"
+        ] or [0.0]
+        flush_times = [
+            m["duration_ms"]
+            for m in self.performance_metrics
+            if m["operation"] == "flush"
+        ] or [0.0]
 
         return {
             "total_patterns": len(self.patterns),
@@ -331,10 +910,42 @@ class PatternStore:
             "avg_operation_time_ms": sum(operation_times) / len(operation_times),
             "max_operation_time_ms": max(operation_times),
             "last_operation_time_ms": self.last_operation_time,
+            "avg_flush_time_ms": sum(flush_times) / len(flush_times),
+            "max_flush_time_ms": max(flush_times),
+            "last_flush_time_ms": self.last_flush_time,
+            "dirty_patterns": len(self._dirty),
             "uptime_seconds": time.time() - self.start_time,
         }
 
 
+_write_behind_stores: "weakref.WeakSet[PatternStore]" = weakref.WeakSet()
+
+
+def _run_pattern_flusher(
+    store_ref: "weakref.ref[PatternStore]", stop: threading.Event, interval: float
+):
+    """Periodically flush a pattern store until it is closed or collected."""
+    while not stop.wait(interval):
+        store = store_ref()
+        if store is None:
+            return
+        try:
+            store.flush()
+        except Exception as e:
+            logger.error(f"Background pattern flush failed: {e}")
+        del store
+
+
+@atexit.register
+def _flush_write_behind_stores():
+    """Write dirty patterns of every live store before the interpreter exits."""
+    for store in list(_write_behind_stores):
+        try:
+            store.flush()
+        except Exception as e:
+            logger.error(f"Failed to flush pattern store at exit: {e}")
+
+
 logger = logging.getLogger(__name__)
 
 
@@ -353,6 +964,9 @@ class DomainType(Enum):
     MONITORING = "monitoring"
 
 
+_DOMAIN_BITS = {domain: 1 << index for index, domain in enumerate(DomainType)}
+
+
 class ConflictType(Enum):
     """Types of cross-domain conflicts."""
 
@@ -402,6 +1016,214 @@ class CrossDomainAnalysis:
     processing_time_ms: float
 
 
+class AnalysisHistory:
+    """Bounded history of analyses with running statistics over its window.
+
+    Entries live in a ``deque(maxlen=...)``; each append adds the new analysis
+    to the counters and subtracts the one it evicts, so statistics cost O(1)
+    and no bulk trimming happens on the request path.
+    """
+
+    def __init__(self, maxlen: int = 500):
+        """Initialize an empty history holding at most ``maxlen`` analyses."""
+        self.entries: deque = deque(maxlen=maxlen)
+        self.domain_frequency: Counter = Counter()
+        self.conflict_frequency: Counter = Counter()
+        self.total_complexity = 0.0
+        self.total_processing_time_ms = 0.0
+        self.analyses_with_conflicts = 0
+        self.analyses_with_infrastructure = 0
+
+    def append(self, analysis: CrossDomainAnalysis):
+        """Record an analysis, evicting the oldest one when full."""
+        if len(self.entries) == self.entries.maxlen:
+            self._account(self.entries[0], -1)
+        self.entries.append(analysis)
+        self._account(analysis, 1)
+
+    def _account(self, analysis: CrossDomainAnalysis, sign: int):
+        """Add (``sign=1``) or remove (``sign=-1``) an analysis from the counters."""
+        domains = Counter()
+        for boundary in analysis.detected_boundaries:
+            domains[boundary.primary_domain.value] += 1
+            for secondary in boundary.secondary_domains:
+                domains[secondary.value] += 1
+        conflicts = Counter(c.conflict_type.value for c in analysis.potential_conflicts)
+        if sign > 0:
+            self.domain_frequency.update(domains)
+            self.conflict_frequency.update(conflicts)
+        else:
+            # Counter subtraction drops keys whose count reaches zero
+            self.domain_frequency -= domains
+            self.conflict_frequency -= conflicts
+
+        self.total_complexity += sign * analysis.integration_complexity
+        self.total_processing_time_ms += sign * analysis.processing_time_ms
+        if analysis.potential_conflicts:
+            self.analyses_with_conflicts += sign
+        if any(
+            b.primary_domain == DomainType.INFRASTRUCTURE
+            for b in analysis.detected_boundaries
+        ):
+            self.analyses_with_infrastructure += sign
+
+    def get_stats(self) -> Dict[str, any]:
+        """Get statistics over the analyses currently in the window."""
+        total = len(self.entries)
+        if not total:
+            return {}
+
+        return {
+            "total_analyses": total,
+            "domain_frequency": dict(self.domain_frequency.most_common()),
+            "conflict_frequency": dict(self.conflict_frequency.most_common()),
+            "average_complexity": self.total_complexity / total,
+            "average_processing_time_ms": self.total_processing_time_ms / total,
+            "conflict_detection_rate": self.analyses_with_conflicts / total,
+        }
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+
+def _trie_regex(words) -> str:
+    """Build a regex matching the longest of ``words`` with shared prefixes factored."""
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [
+            re.escape(char) + build(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # Where a word ends, the longer continuations are optional (greedy)
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+def _compile_word_trigger(words) -> Tuple[re.Pattern, Dict[str, List[str]]]:
+    """Compile a lookahead scanner finding every position where a word starts.
+
+    The trie-shaped regex prefers the longest word, so each word also maps to
+    the shorter words that are its prefixes and therefore start at the same spot.
+    """
+    ordered = sorted(set(words), key=len, reverse=True)
+    trigger = re.compile(f"(?=({_trie_regex(ordered)}))")
+    prefixes = {
+        word: [word]
+        + [other for other in ordered if other != word and word.startswith(other)]
+        for word in ordered
+    }
+    return trigger, prefixes
+
+
+def _find_words(
+    trigger: re.Pattern, prefixes: Dict[str, List[str]], text: str
+) -> Set[str]:
+    """Get the words from a compiled word trigger that occur in ``text``."""
+    found: Set[str] = set()
+    for match in trigger.finditer(text):
+        found.update(prefixes[match.group(1)])
+    return found
+
+
+def _domain_mask(domains) -> int:
+    """Encode domains as a bitmask over ``DomainType`` declaration order."""
+    mask = 0
+    for domain in domains:
+        mask |= _DOMAIN_BITS[domain]
+    return mask
+
+
+def _literal_prefix(pattern: str) -> Optional[str]:
+    """Get the literal text every match of ``pattern`` must start with."""
+    depth = 0
+    for char in pattern:
+        depth += {"(": 1, ")": -1}.get(char, 0)
+        if char == "|" and depth == 0:
+            return None  # Top-level alternation has no common prefix
+
+    literal = re.match(r"[a-z0-9 /_-]*", pattern).group(0)
+    if pattern[len(literal) : len(literal) + 1] in ("?", "*", "{"):
+        literal = literal[:-1]  # The last character is optional
+    return literal or None
+
+
+class DomainPatternScanner:
+    """Match every domain pattern and keyword in one pass over a query.
+
+    Each pattern starts with a literal word, so one lookahead alternation over
+    those words finds every position where any pattern can match. Only the
+    patterns triggered there are tried, anchored at that position and skipping
+    positions inside their previous match, which reproduces ``re.finditer``
+    for each pattern. Keywords are located the same way and counted like
+    ``str.count``.
+    """
+
+    def __init__(
+        self,
+        domain_patterns: Dict["DomainType", Dict[str, List[str]]],
+        domain_keywords: Dict["DomainType", List[str]],
+    ):
+        """Compile the pattern tables tagged by (domain, category, index)."""
+        self._by_literal: Dict[str, List[Tuple]] = defaultdict(list)
+        self._untriggered: List[Tuple] = []
+        for domain, categories in domain_patterns.items():
+            for category, patterns in categories.items():
+                for index, pattern in enumerate(patterns):
+                    entry = ((domain, category, index), re.compile(pattern))
+                    literal = _literal_prefix(pattern)
+                    if literal is None:
+                        self._untriggered.append(entry)
+                    else:
+                        self._by_literal[literal].append(entry)
+        self._pattern_trigger, self._literal_prefixes = _compile_word_trigger(
+            self._by_literal
+        )
+
+        keywords = {kw for kws in domain_keywords.values() for kw in kws}
+        self._keyword_trigger, self._keyword_prefixes = _compile_word_trigger(keywords)
+
+    def scan(self, query: str) -> Tuple[Dict[Tuple, List[re.Match]], Dict[str, int]]:
+        """Find pattern matches keyed by (domain, category, index) and keyword counts."""
+        matches: Dict[Tuple, List[re.Match]] = defaultdict(list)
+        resume_at: Dict[Tuple, int] = {}
+        for trigger in self._pattern_trigger.finditer(query):
+            position = trigger.start()
+            for literal in self._literal_prefixes[trigger.group(1)]:
+                for tag, compiled in self._by_literal[literal]:
+                    if position < resume_at.get(tag, 0):
+                        continue
+                    match = compiled.match(query, position)
+                    if match:
+                        matches[tag].append(match)
+                        resume_at[tag] = max(match.end(), position + 1)
+        for tag, compiled in self._untriggered:
+            matches[tag].extend(compiled.finditer(query))
+
+        keyword_counts: Dict[str, int] = defaultdict(int)
+        keyword_resume_at: Dict[str, int] = {}
+        for trigger in self._keyword_trigger.finditer(query):
+            position = trigger.start()
+            for keyword in self._keyword_prefixes[trigger.group(1)]:
+                if position >= keyword_resume_at.get(keyword, 0):
+                    keyword_counts[keyword] += 1
+                    keyword_resume_at[keyword] = position + len(keyword)
+        return matches, keyword_counts
+
+
 class EnhancedBoundaryDetector:
     """Advanced boundary detection using pattern analysis and semantic understanding."""
 
@@ -413,6 +1235,13 @@ class EnhancedBoundaryDetector:
         self.context_analyzers = self._build_context_analyzers()
         self.multi_domain_triggers = self._build_multi_domain_triggers()
         self.confidence_calibration = self._build_confidence_calibration()
+        self.domain_scanner = DomainPatternScanner(
+            self.domain_patterns,
+            {
+                domain: self._get_domain_keywords(domain)
+                for domain in self.domain_patterns
+            },
+        )
 
     def _build_domain_patterns(self) -> Dict[DomainType, Dict[str, List[str]]]:
         """Build enhanced domain pattern recognition."""
@@ -800,14 +1629,15 @@ class EnhancedBoundaryDetector:
         coordination_strength = self._calculate_coordination_strength(query_lower)
 
         # Step 2: Primary domain detection with improved confidence scoring
+        pattern_matches, keyword_counts = self.domain_scanner.scan(query_lower)
         domain_scores = {}
         for domain_type, patterns in self.domain_patterns.items():
             score = 0.0
             matched_patterns = []
 
             # Enhanced core pattern matching with position weighting
-            for pattern in patterns["core_patterns"]:
-                matches = list(re.finditer(pattern, query_lower))
+            for index, pattern in enumerate(patterns["core_patterns"]):
+                matches = pattern_matches.get((domain_type, "core_patterns", index))
                 if matches:
                     # Weight patterns found earlier in query higher
                     pattern_score = 0
@@ -822,8 +1652,10 @@ class EnhancedBoundaryDetector:
             # Enhanced boundary indicator detection
             boundary_score = 0.0
             boundary_patterns = []
-            for pattern in patterns["boundary_indicators"]:
-                matches = re.findall(pattern, query_lower)
+            for index, pattern in enumerate(patterns["boundary_indicators"]):
+                matches = pattern_matches.get(
+                    (domain_type, "boundary_indicators", index)
+                )
                 if matches:
                     # Increase weight if we detected multi-domain signals
                     weight_multiplier = (
@@ -834,12 +1666,12 @@ class EnhancedBoundaryDetector:
 
             # Enhanced complexity assessment
             complexity_score = 0.0
-            for pattern in patterns["complexity_markers"]:
-                if re.search(pattern, query_lower):
+            for index in range(len(patterns["complexity_markers"])):
+                if pattern_matches.get((domain_type, "complexity_markers", index)):
                     complexity_score += 1.0
 
             # Add keyword-based scoring for better coverage
-            keyword_score = self._calculate_keyword_score(query_lower, domain_type)
+            keyword_score = self._calculate_keyword_score(keyword_counts, domain_type)
 
             domain_scores[domain_type] = {
                 "core_score": score,
@@ -968,15 +1800,17 @@ class EnhancedBoundaryDetector:
 
         return min(1.0, strength)
 
-    def _calculate_keyword_score(self, query: str, domain_type: DomainType) -> float:
-        """Calculate keyword-based score for domain detection."""
+    def _calculate_keyword_score(
+        self, keyword_counts: Dict[str, int], domain_type: DomainType
+    ) -> float:
+        """Calculate keyword-based score from scanned keyword counts."""
         keywords = self._get_domain_keywords(domain_type)
         score = 0.0
 
         for keyword in keywords:
-            if keyword in query:
+            frequency = keyword_counts.get(keyword, 0)
+            if frequency:
                 # Weight by keyword specificity and frequency
-                frequency = query.count(keyword)
                 keyword_weight = (
                     1.0 if len(keyword) > 5 else 0.7
                 )  # Longer keywords more specific
@@ -1301,6 +2135,55 @@ class ConflictDetectionEngine:
         """Initialize conflict detection with predefined conflict patterns."""
         self.conflict_patterns = self._build_conflict_patterns()
         self.resolution_strategies = self._build_resolution_strategies()
+        self.resource_indicators = self._build_resource_indicators()
+        self.timing_indicators = self._build_timing_indicators()
+        self.domain_agent_mapping = self._build_domain_agent_mapping()
+        self.urgency_terms = ["critical", "urgent", "immediate", "asap", "blocking"]
+        self.critical_pair_masks = {
+            _domain_mask(pair)
+            for pair in [
+                (DomainType.SECURITY, DomainType.PERFORMANCE),
+                (DomainType.SECURITY, DomainType.INFRASTRUCTURE),
+                (DomainType.TESTING, DomainType.DEPLOYMENT),
+            ]
+        }
+        self._compile_conflict_index()
+
+    def _compile_conflict_index(self):
+        """Precompute pair bitmasks, indicator alternations and vocabulary scans."""
+        # pair mask -> [(rule order, conflict type, domain pair)]
+        self.pair_conflicts: Dict[int, List[Tuple[int, ConflictType, Tuple]]] = (
+            defaultdict(list)
+        )
+        self.compiled_indicators: Dict[ConflictType, List[re.Pattern]] = {}
+        self.indicator_alternations: Dict[ConflictType, re.Pattern] = {}
+        self.implicit_patterns: Dict[ConflictType, List[str]] = {}
+        vocabulary = {"simple", "minor", "critical", "major", *self.urgency_terms}
+
+        order = 0
+        for conflict_type, pattern_config in self.conflict_patterns.items():
+            for domain_pair in pattern_config["domain_pairs"]:
+                self.pair_conflicts[_domain_mask(domain_pair)].append(
+                    (order, conflict_type, domain_pair)
+                )
+                order += 1
+
+            indicators = pattern_config["indicators"]
+            self.compiled_indicators[conflict_type] = [
+                re.compile(p) for p in indicators
+            ]
+            self.indicator_alternations[conflict_type] = re.compile(
+                "|".join(f"(?:{p})" for p in indicators)
+            )
+            self.implicit_patterns[conflict_type] = self._get_implicit_patterns(
+                conflict_type
+            )
+            vocabulary.update(pattern_config["severity_factors"])
+            vocabulary.update(self.implicit_patterns[conflict_type])
+
+        self._severity_trigger, self._severity_prefixes = _compile_word_trigger(
+            vocabulary
+        )
 
     def _build_conflict_patterns(self) -> Dict[ConflictType, Dict[str, any]]:
         """Build conflict detection patterns."""
@@ -1409,6 +2292,23 @@ class ConflictDetectionEngine:
             },
         }
 
+    def _build_resource_indicators(self) -> Dict[str, List[str]]:
+        """Build keywords indicating competition for each resource type."""
+        return {
+            "memory": ["memory", "ram", "heap", "buffer"],
+            "cpu": ["cpu", "processor", "compute", "processing"],
+            "storage": ["disk", "storage", "space", "filesystem"],
+            "network": ["network", "bandwidth", "throughput", "io"],
+        }
+
+    def _build_timing_indicators(self) -> Dict[str, List[str]]:
+        """Build keywords indicating each kind of timing relationship."""
+        return {
+            "sequential": ["before", "after", "then", "sequence", "order"],
+            "blocking": ["block", "wait", "hold", "delay", "pending"],
+            "concurrent": ["parallel", "concurrent", "simultaneous", "async"],
+        }
+
     def _build_resolution_strategies(self) -> Dict[ConflictType, List[str]]:
         """Build conflict resolution strategies."""
         return {
@@ -1470,70 +2370,80 @@ class ConflictDetectionEngine:
         secondary_domains = boundaries[0].secondary_domains
         all_domains = [primary_domain] + secondary_domains
 
+        # Every conflict involves at least two domains
+        if len(all_domains) < 2:
+            return conflicts
+
+        # Collect conflict rules whose domain pair is fully present
+        domain_bits = [_DOMAIN_BITS[domain] for domain in all_domains]
+        candidate_rules = []
+        for i, first_bit in enumerate(domain_bits):
+            for second_bit in domain_bits[i + 1 :]:
+                candidate_rules.extend(
+                    self.pair_conflicts.get(first_bit | second_bit, ())
+                )
+        candidate_rules.sort(key=lambda rule: rule[0])
+
+        # Match the severity vocabularies in a single pass when a rule applies
+        query_terms = (
+            _find_words(self._severity_trigger, self._severity_prefixes, query_lower)
+            if candidate_rules
+            else set()
+        )
+
         # Check for known conflict patterns
-        for conflict_type, pattern_config in self.conflict_patterns.items():
-            # Check if any domain pairs match this conflict type
-            for domain_pair in pattern_config["domain_pairs"]:
-                if (
-                    domain_pair[0] in all_domains and domain_pair[1] in all_domains
-                ) or (domain_pair[1] in all_domains and domain_pair[0] in all_domains):
-
-                    # Check for conflict indicators in query
-                    indicator_matches = 0
-                    for indicator_pattern in pattern_config["indicators"]:
-                        if re.search(indicator_pattern, query_lower):
-                            indicator_matches += 1
-
-                    # Check for implicit conflict patterns
-                    for pattern in self._get_implicit_patterns(conflict_type):
-                        if pattern in query_lower:
-                            indicator_matches += 0.5
-
-                    if indicator_matches > 0:
-                        # Calculate severity based on indicators and factors
-                        severity = pattern_config["base_severity"]
-
-                        # Adjust for simple/minor queries (reduce severity)
-                        if "simple" in query_lower or "minor" in query_lower:
-                            severity = max(0.3, severity - 0.2)
-                        elif "critical" in query_lower or "major" in query_lower:
-                            severity = min(1.0, severity + 0.2)
-
-                        factor_count = 0
-                        for factor in pattern_config["severity_factors"]:
-                            if factor in query_lower:
-                                factor_count += 1
-
-                        # Be more conservative with factor bonuses
-                        if factor_count > 0:
-                            severity = min(
-                                1.0, severity + min(0.15, factor_count * 0.05)
-                            )
-
-                        # Adjust severity based on number of indicator matches (more conservative)
-                        if indicator_matches > 1:
-                            severity = min(
-                                1.0, severity + (indicator_matches - 1) * 0.05
-                            )
-
-                        # Add domain-specific severity boost
-                        severity = self._apply_domain_severity_boost(
-                            severity, domain_pair, query_lower
-                        )
+        for _, conflict_type, domain_pair in candidate_rules:
+            pattern_config = self.conflict_patterns[conflict_type]
+
+            # Check for conflict indicators in query
+            indicator_matches = 0
+            if self.indicator_alternations[conflict_type].search(query_lower):
+                for indicator in self.compiled_indicators[conflict_type]:
+                    if indicator.search(query_lower):
+                        indicator_matches += 1
+
+            # Check for implicit conflict patterns
+            for pattern in self.implicit_patterns[conflict_type]:
+                if pattern in query_terms:
+                    indicator_matches += 0.5
+
+            if indicator_matches > 0:
+                # Calculate severity based on indicators and factors
+                severity = pattern_config["base_severity"]
+
+                # Adjust for simple/minor queries (reduce severity)
+                if "simple" in query_terms or "minor" in query_terms:
+                    severity = max(0.3, severity - 0.2)
+                elif "critical" in query_terms or "major" in query_terms:
+                    severity = min(1.0, severity + 0.2)
+
+                factor_count = 0
+                for factor in pattern_config["severity_factors"]:
+                    if factor in query_terms:
+                        factor_count += 1
+
+                # Be more conservative with factor bonuses
+                if factor_count > 0:
+                    severity = min(1.0, severity + min(0.15, factor_count * 0.05))
+
+                # Adjust severity based on number of indicator matches (more conservative)
+                if indicator_matches > 1:
+                    severity = min(1.0, severity + (indicator_matches - 1) * 0.05)
+
+                # Add domain-specific severity boost
+                severity = self._apply_domain_severity_boost(
+                    severity, domain_pair, query_terms
+                )
 
-                        conflict = ConflictDetection(
-                            conflict_type=conflict_type,
-                            involved_domains=list(domain_pair),
-                            severity=severity,
-                            description=f"Detected {conflict_type.value} between {domain_pair[0].value} and {domain_pair[1].value}",
-                            resolution_strategies=self.resolution_strategies[
-                                conflict_type
-                            ],
-                            affected_agents=self._get_affected_agents(
-                                list(domain_pair)
-                            ),
-                        )
-                        conflicts.append(conflict)
+                conflict = ConflictDetection(
+                    conflict_type=conflict_type,
+                    involved_domains=list(domain_pair),
+                    severity=severity,
+                    description=f"Detected {conflict_type.value} between {domain_pair[0].value} and {domain_pair[1].value}",
+                    resolution_strategies=self.resolution_strategies[conflict_type],
+                    affected_agents=self._get_affected_agents(list(domain_pair)),
+                )
+                conflicts.append(conflict)
 
         # Check for resource competition conflicts
         resource_conflict = self._detect_resource_conflicts(all_domains, query_lower)
@@ -1600,27 +2510,17 @@ class ConflictDetectionEngine:
         self,
         base_severity: float,
         domain_pair: Tuple[DomainType, DomainType],
-        query: str,
+        query_terms: Set[str],
     ) -> float:
         """Apply domain-specific severity boosts."""
         severity = base_severity
 
         # Critical domain combinations
-        critical_pairs = [
-            (DomainType.SECURITY, DomainType.PERFORMANCE),
-            (DomainType.SECURITY, DomainType.INFRASTRUCTURE),
-            (DomainType.TESTING, DomainType.DEPLOYMENT),
-        ]
-
-        if (
-            domain_pair in critical_pairs
-            or tuple(reversed(domain_pair)) in critical_pairs
-        ):
+        if _domain_mask(domain_pair) in self.critical_pair_masks:
             severity = min(1.0, severity + 0.2)
 
         # Check for urgency indicators
-        urgency_terms = ["critical", "urgent", "immediate", "asap", "blocking"]
-        if any(term in query for term in urgency_terms):
+        if any(term in query_terms for term in self.urgency_terms):
             severity = min(1.0, severity + 0.15)
 
         return severity
@@ -1629,16 +2529,9 @@ class ConflictDetectionEngine:
         self, domains: List[DomainType], query: str
     ) -> Optional[ConflictDetection]:
         """Detect resource competition conflicts."""
-        resource_indicators = {
-            "memory": ["memory", "ram", "heap", "buffer"],
-            "cpu": ["cpu", "processor", "compute", "processing"],
-            "storage": ["disk", "storage", "space", "filesystem"],
-            "network": ["network", "bandwidth", "throughput", "io"],
-        }
-
         # Count resource type mentions
         resource_matches = {}
-        for resource, keywords in resource_indicators.items():
+        for resource, keywords in self.resource_indicators.items():
             matches = sum(1 for kw in keywords if kw in query)
             if matches > 0:
                 resource_matches[resource] = matches
@@ -1663,14 +2556,8 @@ class ConflictDetectionEngine:
         self, domains: List[DomainType], query: str
     ) -> Optional[ConflictDetection]:
         """Detect timing-related conflicts."""
-        timing_indicators = {
-            "sequential": ["before", "after", "then", "sequence", "order"],
-            "blocking": ["block", "wait", "hold", "delay", "pending"],
-            "concurrent": ["parallel", "concurrent", "simultaneous", "async"],
-        }
-
         timing_matches = {}
-        for timing_type, keywords in timing_indicators.items():
+        for timing_type, keywords in self.timing_indicators.items():
             matches = sum(1 for kw in keywords if kw in query)
             if matches > 0:
                 timing_matches[timing_type] = matches
@@ -1696,9 +2583,9 @@ class ConflictDetectionEngine:
 
         return None
 
-    def _get_affected_agents(self, domains: List[DomainType]) -> List[str]:
-        """Get agents that would be affected by conflicts in these domains."""
-        domain_agent_mapping = {
+    def _build_domain_agent_mapping(self) -> Dict[DomainType, List[str]]:
+        """Build the agents responsible for each domain."""
+        return {
             DomainType.TESTING: [
                 "test-specialist",
                 "coverage-optimizer",
@@ -1734,9 +2621,11 @@ class ConflictDetectionEngine:
             DomainType.MONITORING: ["infrastructure-engineer", "performance-optimizer"],
         }
 
+    def _get_affected_agents(self, domains: List[DomainType]) -> List[str]:
+        """Get agents that would be affected by conflicts in these domains."""
         affected_agents = set()
         for domain in domains:
-            affected_agents.update(domain_agent_mapping.get(domain, []))
+            affected_agents.update(self.domain_agent_mapping.get(domain, []))
 
         return list(affected_agents)
 
@@ -1812,14 +2701,142 @@ class ConflictDetectionEngine:
         return list(seen_conflicts.values())
 
 
+class LearnedPatternIndex:
+    """Inverted keyword index over aggregated learned success patterns.
+
+    Successes are folded into one aggregate per (query type, agent, keyword
+    signature) holding the success count, an exponentially decayed
+    confidence sum and the last time it was seen. Each aggregate is posted
+    under its keywords, so scoring a query only walks the posting lists of
+    the query's keywords and memory grows with distinct patterns, not with
+    traffic.
+    """
+
+    DECAY_BUCKET_SECONDS = 24 * 3600
+    DECAY_WINDOW_BUCKETS = 30
+    CONFIDENCE_HALF_LIFE_SECONDS = 30 * 24 * 3600
+
+    def __init__(self):
+        # query_type -> (agent, keyword signature) -> aggregate
+        self.aggregates: Dict[str, Dict[Tuple[str, Tuple[str, ...]], Dict]] = (
+            defaultdict(dict)
+        )
+        self.postings: Dict[Tuple[str, str], List[Dict[str, any]]] = defaultdict(list)
+        self._next_order = 0
+        # Linear 30 day decay floored at 0.5, one factor per day bucket
+        self._decay_table = [
+            max(0.5, 1.0 - age / self.DECAY_WINDOW_BUCKETS)
+            for age in range(self.DECAY_WINDOW_BUCKETS + 1)
+        ]
+
+    def __len__(self) -> int:
+        return self._next_order
+
+    def add(
+        self,
+        query_type: str,
+        agent: str,
+        pattern_key: str,
+        keywords: List[str],
+        confidence: float,
+        timestamp: float,
+    ) -> Dict[str, any]:
+        """Fold one success into its aggregate, posting new aggregates."""
+        signature = tuple(sorted(set(keywords)))
+        aggregates = self.aggregates[query_type]
+        entry = aggregates.get((agent, signature))
+        if entry is None:
+            entry = {
+                "order": self._next_order,
+                "agent": agent,
+                "pattern": pattern_key,
+                "query_keywords": signature,
+                "count": 0,
+                "confidence_sum": 0.0,
+                "decayed_count": 0.0,
+                "confidence": confidence,
+                "last_seen": timestamp,
+            }
+            self._next_order += 1
+            aggregates[(agent, signature)] = entry
+            for keyword in signature:
+                self.postings[(query_type, keyword)].append(entry)
+
+        # Decay the running sums to the newer of the two timestamps
+        elapsed = timestamp - entry["last_seen"]
+        if elapsed >= 0:
+            decay = 0.5 ** (elapsed / self.CONFIDENCE_HALF_LIFE_SECONDS)
+            entry["confidence_sum"] = entry["confidence_sum"] * decay + confidence
+            entry["decayed_count"] = entry["decayed_count"] * decay + 1.0
+            entry["last_seen"] = timestamp
+        else:
+            decay = 0.5 ** (-elapsed / self.CONFIDENCE_HALF_LIFE_SECONDS)
+            entry["confidence_sum"] += confidence * decay
+            entry["decayed_count"] += decay
+        entry["count"] += 1
+        entry["confidence"] = entry["confidence_sum"] / entry["decayed_count"]
+        return entry
+
+    def decay_factor(self, timestamp: float, now_bucket: int) -> float:
+        """Time decay for a timestamp, looked up by its day bucket."""
+        age = now_bucket - int(timestamp // self.DECAY_BUCKET_SECONDS)
+        return self._decay_table[min(max(age, 0), self.DECAY_WINDOW_BUCKETS)]
+
+    def best_match(
+        self,
+        query_type: str,
+        query_keywords: Set[str],
+        pattern_weights: Dict[str, float],
+    ) -> Optional[Tuple[str, float]]:
+        """Highest scoring (agent, score) among entries sharing a keyword."""
+        overlaps: Dict[int, List] = {}
+        for keyword in query_keywords:
+            for entry in self.postings.get((query_type, keyword), ()):
+                hit = overlaps.get(entry["order"])
+                if hit is None:
+                    overlaps[entry["order"]] = [entry, 1]
+                else:
+                    hit[1] += 1
+
+        if not overlaps:
+            return None
+
+        now_bucket = int(time.time() // self.DECAY_BUCKET_SECONDS)
+        query_size = max(len(query_keywords), 1)
+        best = None
+        # Earliest learned entry wins ties, as with the linear history scan
+        for order in sorted(overlaps):
+            entry, keyword_overlap = overlaps[order]
+            base_score = entry["confidence"] * (keyword_overlap / query_size)
+            weight_boost = pattern_weights.get(entry["pattern"], 0.0)
+            final_score = base_score + weight_boost * self.decay_factor(
+                entry["last_seen"], now_bucket
+            )
+            if best is None or final_score > best[1]:
+                best = (entry["agent"], final_score)
+        return best
+
+
 class PatternLearningEngine:
     """Learning engine for infrastructure task patterns with persistent storage."""
 
-    def __init__(self, coordination_hub_path: Optional[str] = None):
-        """Initialize the pattern learning engine with coordination hub integration."""
-        self.successful_patterns = defaultdict(
-            list
-        )  # query_type -> [(pattern, success_rate)]
+    RECENT_SUCCESS_SAMPLE_SIZE = 100
+
+    def __init__(
+        self,
+        coordination_hub_path: Optional[str] = None,
+        use_sqlite: bool = False,
+        db_path: Optional[str] = None,
+    ):
+        """Initialize the pattern learning engine with coordination hub integration.
+
+        With ``use_sqlite`` success records are kept in an indexed SQLite
+        table and the hub markdown section is exported from them.
+        """
+        self.pattern_index = LearnedPatternIndex()
+        # query_type -> (agent, keyword signature) -> aggregated successes
+        self.successful_patterns = self.pattern_index.aggregates
+        self.recent_successes = deque(maxlen=self.RECENT_SUCCESS_SAMPLE_SIZE)
         self.failed_patterns = defaultdict(list)  # query_type -> [(pattern, reasons)]
         self.infrastructure_keywords = self._build_infrastructure_learning_keywords()
         self.learning_threshold = (
@@ -1829,6 +2846,16 @@ class PatternLearningEngine:
         self.coordination_hub_path = (
             coordination_hub_path or self._get_coordination_hub_path()
         )
+        self.hub_log = CoordinationHubLog(
+            self.coordination_hub_path, "learning-patterns"
+        )
+        self.hub_reader = get_hub_reader()
+        self.sqlite_backend: Optional[SQLitePatternBackend] = None
+        if use_sqlite or db_path:
+            self.sqlite_backend = SQLitePatternBackend(
+                db_path or default_db_path(self.coordination_hub_path)
+            )
+        self._records_since_export = 0
         self._load_existing_patterns()
 
     def _build_infrastructure_learning_keywords(self) -> Dict[str, List[str]]:
@@ -1900,31 +2927,47 @@ class PatternLearningEngine:
         if confidence >= self.learning_threshold:
             query_type = self._classify_infrastructure_query(query)
             if query_type:
-                pattern_key = f"{query_type}:{selected_agent}"
-                self.successful_patterns[query_type].append(
-                    {
-                        "pattern": pattern_key,
-                        "agent": selected_agent,
-                        "confidence": confidence,
-                        "query_keywords": self._extract_keywords(query),
-                        "timestamp": time.time(),
-                        "user_feedback": user_feedback,
-                    }
-                )
+                record = {
+                    "query_type": query_type,
+                    "pattern": f"{query_type}:{selected_agent}",
+                    "agent": selected_agent,
+                    "confidence": confidence,
+                    "query_keywords": self._extract_keywords(query),
+                    "timestamp": time.time(),
+                    "user_feedback": user_feedback,
+                }
+                self._apply_success_record(record)
+
+                if self.sqlite_backend is not None:
+                    self.sqlite_backend.insert_successes([record])
+                    self._records_since_export += 1
+                    if self._records_since_export >= self.hub_log.compact_every:
+                        self.store_successful_patterns_to_hub()
+                # Journal the success; the markdown is rendered by compaction
+                elif self.hub_log.append(record) and self.hub_log.should_compact():
+                    self.store_successful_patterns_to_hub()
 
-                # Update pattern weight
-                self.pattern_weights[pattern_key] += (
-                    0.1 if user_feedback is True else 0.05
-                )
+    def _apply_success_record(self, record: Dict[str, any]):
+        """Fold one success record into the in-memory learning state."""
+        pattern = {k: v for k, v in record.items() if k not in ("rid", "ts")}
+        query_type = pattern.pop("query_type", None)
+        if not query_type or "pattern" not in pattern:
+            logger.warning(f"Skipping malformed learning log record: {record}")
+            return
+        self.recent_successes.append(pattern)
+        self.pattern_index.add(
+            query_type,
+            pattern.get("agent", "unknown"),
+            pattern["pattern"],
+            pattern.get("query_keywords", []),
+            pattern.get("confidence", 0.0),
+            pattern.get("timestamp", 0),
+        )
 
-                # Store patterns to coordination hub periodically
-                total_patterns = sum(
-                    len(patterns) for patterns in self.successful_patterns.values()
-                )
-                if (
-                    total_patterns > 0 and total_patterns % 5 == 0
-                ):  # Store every 5 successful patterns
-                    self.store_successful_patterns_to_hub()
+        # Update pattern weight
+        self.pattern_weights[pattern["pattern"]] += (
+            0.1 if pattern.get("user_feedback") is True else 0.05
+        )
 
     def learn_from_failure(
         self, query: str, selected_agent: str, expected_agent: str, reasons: List[str]
@@ -1984,48 +3027,20 @@ class PatternLearningEngine:
     def get_learned_agent_suggestion(self, query: str) -> Optional[Tuple[str, float]]:
         """Get agent suggestion based on learned patterns."""
         query_type = self._classify_infrastructure_query(query)
-        if not query_type or query_type not in self.successful_patterns:
+        if not query_type:
             return None
 
-        successful_patterns = self.successful_patterns[query_type]
-        if not successful_patterns:
-            return None
-
-        # Score patterns based on keyword overlap and success rate
-        query_keywords = set(self._extract_keywords(query))
-        pattern_scores = []
-
-        for pattern in successful_patterns:
-            pattern_keywords = set(pattern["query_keywords"])
-            keyword_overlap = len(query_keywords.intersection(pattern_keywords))
-
-            if keyword_overlap > 0:
-                # Calculate score based on overlap, confidence, and learned weights
-                pattern_key = pattern["pattern"]
-                base_score = pattern["confidence"] * (
-                    keyword_overlap / max(len(query_keywords), 1)
-                )
-                weight_boost = self.pattern_weights.get(pattern_key, 0.0)
-
-                # Time decay factor (recent patterns matter more)
-                time_factor = max(
-                    0.5, 1.0 - (time.time() - pattern["timestamp"]) / (30 * 24 * 3600)
-                )  # 30 days decay
-
-                final_score = base_score + weight_boost * time_factor
-                pattern_scores.append((pattern["agent"], final_score))
-
-        if pattern_scores:
-            # Return highest scoring agent
-            pattern_scores.sort(key=lambda x: x[1], reverse=True)
-            return pattern_scores[0]
-
-        return None
+        # Score indexed patterns by keyword overlap, confidence and weights
+        return self.pattern_index.best_match(
+            query_type, set(self._extract_keywords(query)), self.pattern_weights
+        )
 
     def get_learning_stats(self) -> Dict[str, any]:
         """Get learning engine statistics."""
         total_successes = sum(
-            len(patterns) for patterns in self.successful_patterns.values()
+            pattern["count"]
+            for patterns in self.successful_patterns.values()
+            for pattern in patterns.values()
         )
         total_failures = sum(
             len(patterns) for patterns in self.failed_patterns.values()
@@ -2033,6 +3048,7 @@ class PatternLearningEngine:
 
         return {
             "total_successful_patterns": total_successes,
+            "distinct_successful_patterns": len(self.pattern_index),
             "total_failed_patterns": total_failures,
             "learning_rate": (
                 total_successes / (total_successes + total_failures)
@@ -2055,106 +3071,76 @@ class PatternLearningEngine:
     def _load_existing_patterns(self):
         """Load existing successful patterns from coordination-hub.md."""
         try:
-            if os.path.exists(self.coordination_hub_path):
-                with open(self.coordination_hub_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                    self._parse_existing_patterns(content)
+            self._parse_existing_patterns(
+                self.hub_reader.parse_section(
+                    self.coordination_hub_path,
+                    PATTERNS_SECTION_HEADING,
+                    _parse_learned_confidences,
+                    prefix=True,
+                )
+            )
+
+            if self.sqlite_backend is not None:
+                self._load_sqlite_successes()
+            else:
+                for record in self.hub_log.replay():
+                    self._apply_success_record(record)
         except Exception as e:
             logger.warning(
                 f"Could not load existing patterns from coordination hub: {e}"
             )
 
-    def _parse_existing_patterns(self, content: str):
-        """Parse existing patterns from coordination hub content."""
-        # Look for Infrastructure Learning Patterns section
-        pattern_section_start = content.find("## Infrastructure Learning Patterns")
-        if pattern_section_start > -1:
-            # Extract patterns between this section and next ## section (not ###)
-            next_section = content.find("\n## ", pattern_section_start + 1)
-            section_content = content[
-                pattern_section_start : (
-                    next_section if next_section > -1 else len(content)
-                )
-            ]
+    def _load_sqlite_successes(self):
+        """Load success records, seeding an empty database from the hub log."""
+        if not self.sqlite_backend.count_successes():
+            self.sqlite_backend.insert_successes(
+                {k: v for k, v in record.items() if k not in ("rid", "ts")}
+                for record in self.hub_log.pending_records()
+                if record.get("query_type") and "pattern" in record
+            )
 
-            # Parse pattern entries with improved format matching
-            for line in section_content.split("\n"):
-                stripped_line = line.strip()
-                if stripped_line.startswith("- **") and "**:" in stripped_line:
-                    # Format: - **pattern_key**: agent_name (confidence: X.X, keywords: ..., learned: X days ago)
-                    try:
-                        # Extract pattern key between first ** and **:
-                        start_idx = stripped_line.find("**") + 2
-                        end_idx = stripped_line.find("**:", start_idx)
-                        if end_idx > start_idx:
-                            pattern_key = stripped_line[start_idx:end_idx]
-
-                            # Extract confidence value
-                            if "confidence:" in stripped_line:
-                                conf_start = stripped_line.find("confidence: ") + len(
-                                    "confidence: "
-                                )
-                                conf_end = stripped_line.find(",", conf_start)
-                                if conf_end == -1:
-                                    conf_end = stripped_line.find(")", conf_start)
-
-                                if conf_end > conf_start:
-                                    confidence_str = stripped_line[
-                                        conf_start:conf_end
-                                    ].strip()
-                                    try:
-                                        confidence = float(confidence_str)
-                                        if (
-                                            confidence >= 0.6
-                                        ):  # Only load patterns with reasonable confidence
-                                            # Convert confidence to pattern weight with slight boost for persistence
-                                            self.pattern_weights[pattern_key] = (
-                                                confidence * 0.6
-                                            )
-                                            logger.debug(
-                                                f"Loaded pattern: {pattern_key} with weight {confidence * 0.6:.3f}"
-                                            )
-                                    except ValueError:
-                                        logger.warning(
-                                            f"Could not parse confidence value: {confidence_str}"
-                                        )
-                    except (IndexError, ValueError) as e:
-                        logger.debug(
-                            f"Could not parse pattern line: {line.strip()}, error: {e}"
-                        )
+        for record in self.sqlite_backend.iter_successes():
+            self._apply_success_record(record)
+
+    def _parse_existing_patterns(self, confidences: Dict[str, float]):
+        """Seed pattern weights from confidences parsed from the hub."""
+        for pattern_key, confidence in confidences.items():
+            if confidence >= 0.6:  # Only load patterns with reasonable confidence
+                # Convert confidence to pattern weight with slight boost for persistence
+                self.pattern_weights[pattern_key] = confidence * 0.6
+                logger.debug(
+                    f"Loaded pattern: {pattern_key} with weight {confidence * 0.6:.3f}"
+                )
 
     def store_successful_patterns_to_hub(self):
-        """Store successful patterns to coordination-hub.md."""
-        if not self.successful_patterns:
+        """Compact the learning log into coordination-hub.md."""
+        if not self.successful_patterns and not self.hub_log.pending_count:
             return
 
-        try:
-            # Read current content
-            content = ""
-            if os.path.exists(self.coordination_hub_path):
-                with open(self.coordination_hub_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-
-            # Generate infrastructure learning patterns section
-            patterns_section = self._generate_patterns_section()
-
-            # Update or append the patterns section
-            updated_content = self._update_patterns_in_content(
-                content, patterns_section
+        if self.sqlite_backend is not None:
+            update_hub(
+                self.coordination_hub_path,
+                lambda content: self._update_patterns_in_content(
+                    content, self._generate_patterns_section()
+                ),
             )
+            self._records_since_export = 0
+            return
 
-            # Write back to file
-            os.makedirs(os.path.dirname(self.coordination_hub_path), exist_ok=True)
-            with open(self.coordination_hub_path, "w", encoding="utf-8") as f:
-                f.write(updated_content)
+        def apply(records: List[Dict[str, any]]):
+            for record in records:
+                self._apply_success_record(record)
 
+        def render(content: str) -> str:
+            return self._update_patterns_in_content(
+                content, self._generate_patterns_section()
+            )
+
+        if self.hub_log.compact(render, apply=apply):
             logger.info(
                 f"Stored {len(self.successful_patterns)} successful pattern types to coordination hub"
             )
 
-        except Exception as e:
-            logger.error(f"Failed to store patterns to coordination hub: {e}")
-
     def _generate_patterns_section(self) -> str:
         """Generate the Infrastructure Learning Patterns section content."""
         section_lines = [
@@ -2173,18 +3159,16 @@ class PatternLearningEngine:
                 f"**{query_type.title().replace('_', ' ')} Patterns:**"
             )
 
-            # Sort patterns by success rate
-            sorted_patterns = sorted(
-                patterns, key=lambda x: x.get("confidence", 0), reverse=True
+            # Top 5 aggregated patterns per type by decayed confidence
+            top_patterns = heapq.nlargest(
+                5, patterns.values(), key=lambda x: x["confidence"]
             )
 
-            for pattern in sorted_patterns[:5]:  # Top 5 patterns per type
-                agent = pattern.get("agent", "unknown")
-                confidence = pattern.get("confidence", 0.0)
-                keywords = ", ".join(
-                    pattern.get("query_keywords", [])[:3]
-                )  # Top 3 keywords
-                timestamp = pattern.get("timestamp", 0)
+            for pattern in top_patterns:
+                agent = pattern["agent"]
+                confidence = pattern["confidence"]
+                keywords = ", ".join(pattern["query_keywords"][:3])  # Top 3 keywords
+                timestamp = pattern["last_seen"]
 
                 # Calculate days since pattern was learned
                 days_ago = max(1, int((time.time() - timestamp) / (24 * 3600)))
@@ -2244,11 +3228,23 @@ class EnhancedCrossDomainCoordinator:
         self.boundary_detector = EnhancedBoundaryDetector()
         self.conflict_engine = ConflictDetectionEngine()
         self.pattern_learning_engine = PatternLearningEngine()
-        self.analysis_history = []
-
-    def analyze_cross_domain_integration(self, query: str) -> CrossDomainAnalysis:
-        """Perform comprehensive cross-domain analysis with learning integration."""
+        self.analysis_history = AnalysisHistory(maxlen=500)
+        self.admission = get_admission_controller()
+
+    def analyze_cross_domain_integration(
+        self, query: str, admission: Optional[Admission] = None
+    ) -> CrossDomainAnalysis:
+        """Perform comprehensive cross-domain analysis with learning integration.
+
+        Under overload the admission controller sheds conflict analysis,
+        learned suggestions and the recommendation text, in that order;
+        boundary detection and agent suggestions always run. Callers that
+        already hold an ``admission`` pass it in; it is then theirs to release.
+        """
         start_time = time.perf_counter()
+        owns_admission = admission is None
+        if owns_admission:
+            admission = self.admission.admit()
 
         try:
             # Step 1: Check learned patterns first for infrastructure queries
@@ -2256,6 +3252,7 @@ class EnhancedCrossDomainCoordinator:
             if (
                 hasattr(self, "pattern_learning_engine")
                 and self.pattern_learning_engine
+                and admission.allows("learning_enhancement")
             ):
                 learned_suggestion = (
                     self.pattern_learning_engine.get_learned_agent_suggestion(query)
@@ -2265,12 +3262,18 @@ class EnhancedCrossDomainCoordinator:
             boundaries = self.boundary_detector.detect_domain_boundaries(query)
 
             # Step 3: Detect potential conflicts
-            conflicts = self.conflict_engine.detect_conflicts(boundaries, query)
+            conflicts = []
+            if admission.allows("cross_domain_analysis"):
+                conflicts = self.conflict_engine.detect_conflicts(boundaries, query)
 
             # Step 4: Generate coordination recommendations
-            coordination_recommendation = self._generate_coordination_recommendation(
-                boundaries, conflicts, query
-            )
+            coordination_recommendation = "Degraded under load - core selection only"
+            if admission.allows("reasoning"):
+                coordination_recommendation = (
+                    self._generate_coordination_recommendation(
+                        boundaries, conflicts, query
+                    )
+                )
 
             # Step 5: Generate agent suggestions with conflict awareness and learning integration
             agent_suggestions = self._generate_agent_suggestions_with_learning(
@@ -2294,16 +3297,7 @@ class EnhancedCrossDomainCoordinator:
                 processing_time_ms=processing_time,
             )
 
-            # Memory-efficient history management
-            if not hasattr(self, "analysis_history"):
-                self.analysis_history = []
-
-            # Circular buffer implementation for memory efficiency
-            if len(self.analysis_history) >= 500:
-                # Keep only every other item when buffer is full
-                self.analysis_history = self.analysis_history[::2]
-                gc.collect()  # Force garbage collection after reduction
-
+            # Bounded history; evicted analyses leave the running statistics
             self.analysis_history.append(analysis)
 
             return analysis
@@ -2323,6 +3317,35 @@ class EnhancedCrossDomainCoordinator:
                 integration_complexity=0.1,
                 processing_time_ms=(time.perf_counter() - start_time) * 1000,
             )
+        finally:
+            if owns_admission:
+                admission.release()
+
+    def coordinate_agents(
+        self,
+        query: str,
+        context: Optional[Dict] = None,
+        admission: Optional[Admission] = None,
+    ) -> CoordinationResult:
+        """Coordinate agents for ``query`` from its cross-domain analysis.
+
+        The query signature is the detected domains in order, the agent
+        sequence follows the ranked suggestions and the confidence is that of
+        the top suggestion. ``context`` is not used by the base analysis.
+        """
+        analysis = self.analyze_cross_domain_integration(query, admission)
+        domains = dict.fromkeys(
+            boundary.primary_domain.value for boundary in analysis.detected_boundaries
+        )
+        return CoordinationResult(
+            query_signature="+".join(domains) or "general",
+            agent_sequence=[agent for agent, _ in analysis.agent_suggestions],
+            confidence=max(
+                (confidence for _, confidence in analysis.agent_suggestions),
+                default=0.0,
+            ),
+            execution_time_ms=analysis.processing_time_ms,
+        )
 
     def record_selection_feedback(
         self,
@@ -2385,16 +3408,7 @@ class EnhancedCrossDomainCoordinator:
 
         # Add coordinator-specific insights
         coordinator_stats = {
-            "analyses_with_infrastructure": len(
-                [
-                    a
-                    for a in getattr(self, "analysis_history", [])
-                    if any(
-                        b.primary_domain == DomainType.INFRASTRUCTURE
-                        for b in a.detected_boundaries
-                    )
-                ]
-            ),
+            "analyses_with_infrastructure": self.analysis_history.analyses_with_infrastructure,
             "infrastructure_learning_rate": 0.0,
         }
 
@@ -2688,45 +3702,7 @@ class EnhancedCrossDomainCoordinator:
 
     def get_analysis_stats(self) -> Dict[str, any]:
         """Get statistics about cross-domain analysis patterns."""
-        if not self.analysis_history:
-            return {}
-
-        # Domain frequency analysis
-        domain_frequency = Counter()
-        conflict_frequency = Counter()
-        complexity_scores = []
-
-        for analysis in self.analysis_history:
-            for boundary in analysis.detected_boundaries:
-                domain_frequency[boundary.primary_domain.value] += 1
-                for secondary in boundary.secondary_domains:
-                    domain_frequency[secondary.value] += 1
-
-            for conflict in analysis.potential_conflicts:
-                conflict_frequency[conflict.conflict_type.value] += 1
-
-            complexity_scores.append(analysis.integration_complexity)
-
-        avg_complexity = (
-            sum(complexity_scores) / len(complexity_scores)
-            if complexity_scores
-            else 0.0
-        )
-        avg_processing_time = sum(
-            a.processing_time_ms for a in self.analysis_history
-        ) / len(self.analysis_history)
-
-        return {
-            "total_analyses": len(self.analysis_history),
-            "domain_frequency": dict(domain_frequency.most_common()),
-            "conflict_frequency": dict(conflict_frequency.most_common()),
-            "average_complexity": avg_complexity,
-            "average_processing_time_ms": avg_processing_time,
-            "conflict_detection_rate": len(
-                [a for a in self.analysis_history if a.potential_conflicts]
-            )
-            / len(self.analysis_history),
-        }
+        return self.analysis_history.get_stats()
 
 
 # Global instance for easy access
@@ -2744,6 +3720,9 @@ def get_cross_domain_coordinator() -> EnhancedCrossDomainCoordinator:
 class LearningCoordinator(EnhancedCrossDomainCoordinator):
     """Enhances coordination through pattern learning with EnhancedAgentSelector integration."""
 
+    # Executions before the enhancement success rate is enforced
+    SUCCESS_RATE_WARMUP = 10
+
     def __init__(self, pattern_store: PatternStore, thresholds: SafetyThresholds):
         super().__init__()
         self.pattern_store = pattern_store
@@ -2759,25 +3738,29 @@ class LearningCoordinator(EnhancedCrossDomainCoordinator):
         """Coordinate agents with pattern enhancement and performance protection."""
 
         self.total_executions += 1
-        start_time = time.perf_counter()
+        COORDINATION_EXECUTIONS.inc()
 
-        with PerformanceGuard(self.thresholds):
+        with PerformanceGuard(
+            self.thresholds
+        ) as guard, self.admission.admit() as admission:
             # Get base coordination with timing check
-            base_result = super().coordinate_agents(query, context)
+            base_result = super().coordinate_agents(query, context, admission)
 
-            # Performance validation
-            execution_time = (time.perf_counter() - start_time) * 1000
-            if execution_time > self.thresholds.max_selection_time_ms:
+            # Skip enhancement once the selection budget is spent
+            if guard.expired():
                 logger.warning(
-                    f"Performance threshold exceeded: {execution_time:.2f}ms"
+                    f"Performance threshold exceeded: {guard.elapsed_ms():.2f}ms"
                 )
                 return base_result
 
-            # Try pattern enhancement if safe
-            if self._can_enhance_safely(base_result):
+            # Try pattern enhancement if safe and not shed under load
+            if self._can_enhance_safely(base_result) and admission.allows(
+                "learning_enhancement"
+            ):
                 enhanced = self._enhance_with_patterns(base_result)
                 if enhanced.confidence > base_result.confidence:
                     self.successful_executions += 1
+                    COORDINATION_ENHANCED.inc()
                     return enhanced
 
             return base_result
@@ -2796,18 +3779,15 @@ class LearningCoordinator(EnhancedCrossDomainCoordinator):
         if not basic_safety:
             return False
 
-        # Calculate success rate
+        # Calculate success rate once there are enough executions to judge it
         success_rate = self.successful_executions / max(1, self.total_executions)
-        if success_rate < 0.45:  # Minimum 45% success rate required
+        if (
+            self.total_executions > self.SUCCESS_RATE_WARMUP
+            and success_rate < 0.45  # Minimum 45% success rate required
+        ):
             return False
 
-        # Check selection performance
-        runtime = time.time() - self.start_time
-        if runtime > 0:
-            selections_per_second = self.total_executions / runtime
-            if selections_per_second > 1000:  # Max 1000 selections/second
-                return False
-
+        # Selection rate and concurrency are enforced by admission control
         return True
 
     def _enhance_with_patterns(self, result: CoordinationResult) -> CoordinationResult:
@@ -2843,6 +3823,21 @@ class LearningCoordinator(EnhancedCrossDomainCoordinator):
             logger.error(f"Pattern enhancement failed: {e}")
             return result
 
+    def _get_pattern_id(self, result: CoordinationResult) -> str:
+        """Pattern id of a coordination; one pattern per query signature."""
+        return f"coordination:{result.query_signature}"
+
+    def _apply_pattern(
+        self, pattern: CoordinationPattern, result: CoordinationResult
+    ) -> CoordinationResult:
+        """Replace the agent sequence with a learned one at its success rate."""
+        return CoordinationResult(
+            query_signature=result.query_signature,
+            agent_sequence=list(pattern.agent_sequence),
+            confidence=pattern.success_rate,
+            execution_time_ms=result.execution_time_ms,
+        )
+
     def record_success(self, result: CoordinationResult):
         """Record successful coordination pattern with validation."""
         if not result or result.confidence < 0.45:
@@ -2877,128 +3872,188 @@ class LearningCoordinator(EnhancedCrossDomainCoordinator):
         }
 
 
-class EvolutionEngine:
-    """Manages pattern evolution and optimization."""
+def success_rate_fitness(pattern: CoordinationPattern) -> float:
+    """Default evolution fitness: the pattern's recorded success rate."""
+    return pattern.success_rate
+
+
+class CorpusReplayFitness:
+    """Fitness from replaying a recorded query corpus through a selector.
+
+    ``selector`` maps a query to the agent names it would pick (for example
+    ``lambda q: coordinator.coordinate_agents(q).agent_sequence``). Every
+    corpus query is replayed once, up front, so the fitness only carries
+    plain data and can be shipped to worker processes. A pattern scores the
+    mean Jaccard overlap between its agents and the agents selected for
+    corpus queries sharing a term with its signature; patterns no query
+    touches keep their success rate.
+    """
+
+    def __init__(self, corpus: Iterable[str], selector: Callable[[str], Iterable[str]]):
+        self.replayed: List[Tuple[Set[str], Set[str]]] = []
+        for query in corpus:
+            agents = set(selector(query) or [])
+            if agents:
+                self.replayed.append((set(query.lower().split()), agents))
+
+    def __call__(self, pattern: CoordinationPattern) -> float:
+        terms = set(re.split(r"[\s_+]+", pattern.query_signature.lower()))
+        agents = set(pattern.agent_sequence)
+        overlaps = [
+            len(agents & selected) / len(agents | selected)
+            for query_terms, selected in self.replayed
+            if query_terms & terms
+        ]
+        if not overlaps:
+            return pattern.success_rate
+        return sum(overlaps) / len(overlaps)
 
-    def __init__(self, coordinator: LearningCoordinator):
-        self.coordinator = coordinator
-        self.evolution_threshold = 0.45  # Minimum success rate for evolution
-        self.mutation_rate = 0.1  # Rate of pattern mutation
-        self.generation_size = 10  # Patterns per generation
-        self.max_generations = 5  # Maximum evolution iterations
-        self.elite_ratio = 0.2  # Top patterns to preserve
-        self.history: List[Dict[str, any]] = []
-        self.start_time = time.time()
 
-    def evolve_patterns(self, query_type: str) -> List[CoordinationPattern]:
-        """Evolve patterns for better performance."""
-        patterns = self.coordinator.pattern_store.patterns
-        if not patterns:
-            return []
+class FitnessCache:
+    """Memoized fitness keyed by canonical pattern content.
 
-        # Get patterns for this query type
-        type_patterns = [
-            p for p in patterns.values() if query_type in p.query_signature
-        ]
-        if not type_patterns:
-            return []
+    Keys are the agent sequence as a tuple, the query signature and the
+    success rate, which the default fitness reads. Entries computed since
+    the last ``drain()`` are tracked so worker processes can hand them back.
+    """
 
-        evolved_patterns = []
-        generation = 0
+    def __init__(
+        self,
+        fitness: Callable[[CoordinationPattern], float],
+        max_entries: int = 10000,
+    ):
+        self.fitness = fitness
+        self.max_entries = max_entries
+        self.values: Dict[Tuple, float] = {}
+        self.added: Dict[Tuple, float] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(pattern: CoordinationPattern) -> Tuple:
+        return (
+            tuple(pattern.agent_sequence),
+            pattern.query_signature,
+            pattern.success_rate,
+        )
 
-        while generation < self.max_generations:
-            # Select elite patterns
-            elite_count = max(1, int(len(type_patterns) * self.elite_ratio))
-            elite_patterns = sorted(
-                type_patterns, key=lambda p: p.success_rate, reverse=True
-            )[:elite_count]
+    def __call__(self, pattern: CoordinationPattern) -> float:
+        key = self.key(pattern)
+        value = self.values.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
 
-            # Create new generation
-            new_generation = elite_patterns.copy()  # Preserve elite patterns
+        self.misses += 1
+        value = self.fitness(pattern)
+        if len(self.values) >= self.max_entries:
+            self.values.clear()
+        self.values[key] = value
+        self.added[key] = value
+        return value
 
-            while len(new_generation) < self.generation_size:
-                # Select parent patterns
-                parent1 = self._select_parent(type_patterns)
-                parent2 = self._select_parent(type_patterns)
+    def drain(self) -> Dict[Tuple, float]:
+        """Return and forget the entries computed since the last drain."""
+        added, self.added = self.added, {}
+        return added
 
-                # Create new pattern through crossover
-                child = self._crossover_patterns(parent1, parent2)
+    def update(self, entries: Dict[Tuple, float]):
+        """Merge entries computed elsewhere, e.g. in a worker process."""
+        self.values.update(entries)
 
-                # Apply mutation
-                if random.random() < self.mutation_rate:
-                    child = self._mutate_pattern(child)
 
-                new_generation.append(child)
+@dataclass
+class PatternEvolver:
+    """Genetic operators for one island population.
 
-            # Evaluate new generation
-            generation_stats = self._evaluate_generation(new_generation)
-            self.history.append(generation_stats)
+    Holds only parameters and the fitness function so it can be pickled to
+    worker processes; all randomness comes from the ``rng`` passed in.
+    """
 
-            # Update patterns for next generation
-            type_patterns = new_generation
-            evolved_patterns = [
-                p for p in new_generation if p.success_rate >= self.evolution_threshold
+    fitness: Callable[[CoordinationPattern], float] = success_rate_fitness
+    mutation_rate: float = 0.1  # Rate of pattern mutation
+    generation_size: int = 10  # Patterns per generation
+    elite_ratio: float = 0.2  # Top patterns to preserve
+
+    def evolve(
+        self,
+        population: List[CoordinationPattern],
+        generations: int,
+        rng: random.Random,
+    ) -> Tuple[List[CoordinationPattern], List[Dict[str, float]]]:
+        """Run ``generations`` generations, returning the population and stats."""
+        generation_stats = []
+        for _ in range(generations):
+            # Select elite patterns
+            elite_count = max(1, int(len(population) * self.elite_ratio))
+            new_generation = sorted(population, key=self.fitness, reverse=True)[
+                :elite_count
             ]
 
-            generation += 1
+            while len(new_generation) < self.generation_size:
+                parent1 = self.select_parent(population, rng)
+                parent2 = self.select_parent(population, rng)
+                child = self.crossover(parent1, parent2, rng)
+                if rng.random() < self.mutation_rate:
+                    child = self.mutate(child, rng)
+                new_generation.append(child)
 
-        return evolved_patterns
+            generation_stats.append(self.generation_totals(new_generation))
+            population = new_generation
 
-    def _select_parent(
-        self, patterns: List[CoordinationPattern]
+        return population, generation_stats
+
+    def select_parent(
+        self, patterns: List[CoordinationPattern], rng: random.Random
     ) -> CoordinationPattern:
         """Select parent pattern using tournament selection."""
         tournament_size = min(3, len(patterns))
-        tournament = random.sample(patterns, tournament_size)
-        return max(tournament, key=lambda p: p.success_rate)
+        tournament = rng.sample(patterns, tournament_size)
+        return max(tournament, key=self.fitness)
 
-    def _crossover_patterns(
-        self, p1: CoordinationPattern, p2: CoordinationPattern
+    def crossover(
+        self, p1: CoordinationPattern, p2: CoordinationPattern, rng: random.Random
     ) -> CoordinationPattern:
         """Create new pattern by combining aspects of two parents."""
-        # Combine agent sequences
         sequence_length = min(len(p1.agent_sequence), len(p2.agent_sequence))
-        crossover_point = random.randint(1, sequence_length - 1)
-
-        new_sequence = (
-            p1.agent_sequence[:crossover_point] + p2.agent_sequence[crossover_point:]
-        )
-
-        # Average success rates and execution times
-        new_success_rate = (p1.success_rate + p2.success_rate) / 2
-        new_exec_time = (p1.execution_time_ms + p2.execution_time_ms) / 2
+        if sequence_length < 2:
+            # No interior cut point; inherit one parent's sequence whole
+            new_sequence = list(rng.choice((p1, p2)).agent_sequence)
+        else:
+            crossover_point = rng.randint(1, sequence_length - 1)
+            new_sequence = (
+                p1.agent_sequence[:crossover_point]
+                + p2.agent_sequence[crossover_point:]
+            )
 
         return CoordinationPattern(
-            pattern_id=f"evolved_{uuid.uuid4().hex[:8]}",
-            query_signature=self._combine_signatures(
-                p1.query_signature, p2.query_signature
+            pattern_id=f"evolved_{rng.getrandbits(32):08x}",
+            query_signature=self.combine_signatures(
+                p1.query_signature, p2.query_signature, rng
             ),
             agent_sequence=new_sequence,
-            success_rate=new_success_rate,
+            success_rate=(p1.success_rate + p2.success_rate) / 2,
             last_used=datetime.now(),
-            execution_time_ms=new_exec_time,
+            execution_time_ms=(p1.execution_time_ms + p2.execution_time_ms) / 2,
         )
 
-    def _mutate_pattern(self, pattern: CoordinationPattern) -> CoordinationPattern:
+    def mutate(
+        self, pattern: CoordinationPattern, rng: random.Random
+    ) -> CoordinationPattern:
         """Apply random mutation to pattern."""
         sequence = pattern.agent_sequence.copy()
 
-        mutation_type = random.choice(["add", "remove", "swap"])
+        mutation_type = rng.choice(["add", "remove", "swap"])
         if mutation_type == "add" and len(sequence) < 5:
-            # Add random agent
-            new_agent = random.choice(
-                ["test-specialist", "security-enforcer", "performance-optimizer"]
+            sequence.append(
+                rng.choice(
+                    ["test-specialist", "security-enforcer", "performance-optimizer"]
+                )
             )
-            sequence.append(new_agent)
-
         elif mutation_type == "remove" and len(sequence) > 2:
-            # Remove random agent
-            remove_idx = random.randint(0, len(sequence) - 1)
-            sequence.pop(remove_idx)
-
+            sequence.pop(rng.randint(0, len(sequence) - 1))
         elif mutation_type == "swap" and len(sequence) >= 2:
-            # Swap two agents
-            idx1, idx2 = random.sample(range(len(sequence)), 2)
+            idx1, idx2 = rng.sample(range(len(sequence)), 2)
             sequence[idx1], sequence[idx2] = sequence[idx2], sequence[idx1]
 
         return CoordinationPattern(
@@ -3010,40 +4065,358 @@ class EvolutionEngine:
             execution_time_ms=pattern.execution_time_ms,
         )
 
-    def _evaluate_generation(
-        self, patterns: List[CoordinationPattern]
-    ) -> Dict[str, any]:
-        """Evaluate pattern generation performance."""
-        success_rates = [p.success_rate for p in patterns]
-        exec_times = [p.execution_time_ms for p in patterns]
+    @staticmethod
+    def combine_signatures(sig1: str, sig2: str, rng: random.Random) -> str:
+        """Combine query signatures, keeping domain-specific terms."""
+        combined = set(sig1.lower().split()) | set(sig2.lower().split())
+        domain_terms = {"test", "security", "performance", "infrastructure"}
+        domain_specific = sorted(w for w in combined if w in domain_terms)
 
+        if domain_specific:
+            return f"evolved_{'+'.join(domain_specific)}"
+        return f"evolved_pattern_{rng.getrandbits(32):08x}"
+
+    def generation_totals(
+        self, patterns: List[CoordinationPattern]
+    ) -> Dict[str, float]:
+        """Summable statistics for one island generation, in a single pass."""
+        success_rate_sum = exec_time_sum = fitness_sum = 0.0
+        max_success_rate = max_fitness = float("-inf")
+        for pattern in patterns:
+            fitness = self.fitness(pattern)
+            success_rate_sum += pattern.success_rate
+            exec_time_sum += pattern.execution_time_ms
+            fitness_sum += fitness
+            if pattern.success_rate > max_success_rate:
+                max_success_rate = pattern.success_rate
+            if fitness > max_fitness:
+                max_fitness = fitness
         return {
-            "generation": len(self.history) + 1,
-            "avg_success_rate": sum(success_rates) / len(success_rates),
-            "max_success_rate": max(success_rates),
-            "avg_exec_time": sum(exec_times) / len(exec_times),
+            "success_rate_sum": success_rate_sum,
+            "max_success_rate": max_success_rate,
+            "fitness_sum": fitness_sum,
+            "max_fitness": max_fitness,
+            "exec_time_sum": exec_time_sum,
             "pattern_count": len(patterns),
-            "timestamp": time.time(),
         }
 
-    def _combine_signatures(self, sig1: str, sig2: str) -> str:
-        """Combine query signatures intelligently."""
-        # Extract keywords from signatures
-        words1 = set(sig1.lower().split())
-        words2 = set(sig2.lower().split())
 
-        # Combine unique keywords
-        combined = words1.union(words2)
+def _evolve_island(
+    evolver: PatternEvolver,
+    population: List[CoordinationPattern],
+    generations: int,
+    seed: str,
+) -> Tuple[List[CoordinationPattern], List[Dict[str, float]], Dict[Tuple, float]]:
+    """Evolve one island for an epoch; runs in a worker process.
 
-        # Keep domain-specific terms
-        domain_terms = {"test", "security", "performance", "infrastructure"}
-        domain_specific = [w for w in combined if w in domain_terms]
+    Also returns the fitness values computed on the way so the parent can
+    merge them into its cache.
+    """
+    population, stats = evolver.evolve(population, generations, random.Random(seed))
+    fitness = evolver.fitness
+    return (
+        population,
+        stats,
+        fitness.drain() if isinstance(fitness, FitnessCache) else {},
+    )
 
-        # Build new signature
-        if domain_specific:
-            return f"evolved_{'+'.join(domain_specific)}"
-        else:
-            return f"evolved_pattern_{uuid.uuid4().hex[:8]}"
+
+class EvolutionEngine:
+    """Manages pattern evolution and optimization.
+
+    Evolution uses an island model: each query type is evolved as several
+    populations that exchange their elites every ``migration_interval``
+    generations. Islands are evolved in process by default; with
+    ``workers`` above one they run in a process pool owned by the engine,
+    created on first use and shut down by ``close()``. With a ``seed`` the
+    result is deterministic and independent of the number of workers.
+
+    Evolution is change-driven: results are kept per query type together
+    with the pattern store ``version`` they were evolved from, and are
+    reused until the store changes. Fitness values are memoized across runs
+    and a query type stops early once a generation no longer improves.
+    """
+
+    def __init__(
+        self,
+        coordinator: LearningCoordinator,
+        fitness_function: Optional[Callable[[CoordinationPattern], float]] = None,
+        islands: int = 4,
+        workers: int = 1,
+        seed: Optional[int] = None,
+        history_size: int = 1000,
+    ):
+        self.coordinator = coordinator
+        self.fitness_function = fitness_function or success_rate_fitness
+        self.evolution_threshold = 0.45  # Minimum fitness for evolved patterns
+        self.mutation_rate = 0.1  # Rate of pattern mutation
+        self.generation_size = 10  # Patterns per generation
+        self.max_generations = 5  # Maximum evolution iterations
+        self.elite_ratio = 0.2  # Top patterns to preserve
+        self.islands = islands  # Populations per query type
+        self.migration_interval = 2  # Generations between migrations
+        self.migration_size = 1  # Elites sent to the next island
+        self.workers = workers  # Worker processes, 1 evaluates in process
+        self.seed = seed
+        self.convergence_tolerance = 1e-9  # Generation-to-generation change
+        self.fitness_cache = FitnessCache(self.fitness_function)
+        self.history: deque = deque(maxlen=history_size)
+        self.start_time = time.time()
+        self.skipped_evolutions = 0
+        self.converged_early = 0
+        # query_type -> (store version, evolved patterns or None)
+        self._evolved: Dict[str, Tuple[int, Optional[List[CoordinationPattern]]]] = {}
+        self._stored_query_types: Tuple[int, List[str]] = (-1, [])
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._history_totals = {
+            "generations": 0,
+            "initial_success_rate": 0.0,
+            "avg_success_rate_sum": 0.0,
+            "pattern_count_sum": 0,
+            "best_success_rate": float("-inf"),
+        }
+
+    def evolve_patterns(self, query_type: str) -> List[CoordinationPattern]:
+        """Evolve patterns for better performance."""
+        return self.evolve_all([query_type]).get(query_type, [])
+
+    def evolve_all(
+        self, query_types: Optional[Iterable[str]] = None
+    ) -> Dict[str, List[CoordinationPattern]]:
+        """Evolve several query types at once, sharing one worker pool.
+
+        Without ``query_types`` every distinct stored query signature is
+        evolved. Query types already evolved at the current store version
+        are answered from the previous run.
+        """
+        store = self.coordinator.pattern_store
+        if not store.patterns:
+            return {}
+        version = store.version
+        if query_types is None:
+            if self._stored_query_types[0] != version:
+                self._stored_query_types = (
+                    version,
+                    sorted({p.query_signature for p in store.patterns.values()}),
+                )
+            query_types = self._stored_query_types[1]
+
+        results: Dict[str, List[CoordinationPattern]] = {}
+        populations: Dict[str, List[List[CoordinationPattern]]] = {}
+        for query_type in query_types:
+            cached = self._evolved.get(query_type)
+            if cached is not None and cached[0] == version:
+                self.skipped_evolutions += 1
+                if cached[1] is not None:
+                    results[query_type] = cached[1]
+                continue
+            type_patterns = store.get_patterns_by_query_type(query_type)
+            if type_patterns:
+                populations[query_type] = [
+                    list(type_patterns) for _ in range(max(1, self.islands))
+                ]
+            else:
+                self._evolved[query_type] = (version, None)
+        if not populations:
+            return results
+
+        if self.fitness_cache.fitness is not self.fitness_function:
+            self.fitness_cache = FitnessCache(self.fitness_function)
+        evolver = PatternEvolver(
+            fitness=self.fitness_cache,
+            mutation_rate=self.mutation_rate,
+            generation_size=self.generation_size,
+            elite_ratio=self.elite_ratio,
+        )
+        base_seed = self.seed if self.seed is not None else random.getrandbits(64)
+        active = list(populations)
+        last_entries: Dict[str, Dict[str, any]] = {}
+
+        generation = 0
+        while active and generation < self.max_generations:
+            span = min(
+                max(1, self.migration_interval), self.max_generations - generation
+            )
+            tasks = [
+                (query_type, island)
+                for query_type in active
+                for island in range(len(populations[query_type]))
+            ]
+            seeds = [
+                f"{base_seed}:{query_type}:{island}:{generation}"
+                for query_type, island in tasks
+            ]
+            epoch_results = self._run_epoch(
+                self._executor(),
+                evolver,
+                [populations[qt][island] for qt, island in tasks],
+                span,
+                seeds,
+            )
+
+            epoch_stats: Dict[str, List[List[Dict[str, float]]]] = defaultdict(list)
+            for (query_type, island), (population, stats, fitness_values) in zip(
+                tasks, epoch_results
+            ):
+                populations[query_type][island] = population
+                epoch_stats[query_type].append(stats)
+                self.fitness_cache.update(fitness_values)
+
+            converged = set()
+            for query_type, island_stats in epoch_stats.items():
+                for offset in range(span):
+                    entry = self._record_generation(
+                        query_type,
+                        generation + offset,
+                        [stats[offset] for stats in island_stats],
+                    )
+                    if self._has_converged(entry, last_entries.get(query_type)):
+                        converged.add(query_type)
+                    last_entries[query_type] = entry
+
+            generation += span
+            if converged and generation < self.max_generations:
+                self.converged_early += len(converged)
+            active = [qt for qt in active if qt not in converged]
+            if active and generation < self.max_generations:
+                for query_type in active:
+                    self._migrate(populations[query_type])
+
+        for query_type, islands in populations.items():
+            evolved = self._collect_evolved(islands)
+            self._evolved[query_type] = (version, evolved)
+            results[query_type] = evolved
+        return results
+
+    def _executor(self) -> Optional[ProcessPoolExecutor]:
+        """The engine's process pool, or None to evolve islands in process."""
+        if self.workers <= 1:
+            return None
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def close(self):
+        """Shut down the worker pool, if one was started."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _run_epoch(
+        self,
+        executor: Optional[ProcessPoolExecutor],
+        evolver: PatternEvolver,
+        populations: List[List[CoordinationPattern]],
+        generations: int,
+        seeds: List[str],
+    ) -> List[
+        Tuple[List[CoordinationPattern], List[Dict[str, float]], Dict[Tuple, float]]
+    ]:
+        """Evolve every island for one epoch, in the pool when there is one."""
+        if executor is not None:
+            try:
+                return list(
+                    executor.map(
+                        _evolve_island,
+                        [evolver] * len(populations),
+                        populations,
+                        [generations] * len(populations),
+                        seeds,
+                    )
+                )
+            except (
+                pickle.PicklingError,
+                AttributeError,
+                TypeError,
+                BrokenProcessPool,
+            ) as error:
+                # Unpicklable fitness functions (lambdas, closures) run inline
+                if isinstance(error, BrokenProcessPool):
+                    self.close()
+                logger.warning(
+                    "Island evolution could not use worker processes, running inline"
+                )
+        return [
+            _evolve_island(evolver, population, generations, seed)
+            for population, seed in zip(populations, seeds)
+        ]
+
+    def _migrate(self, islands: List[List[CoordinationPattern]]):
+        """Ring migration: each island's elites replace the next island's worst."""
+        if len(islands) < 2 or self.migration_size <= 0:
+            return
+        ranked = [
+            sorted(population, key=self.fitness_cache, reverse=True)
+            for population in islands
+        ]
+        for index, population in enumerate(ranked):
+            emigrants = ranked[index - 1][: self.migration_size]
+            survivors = population[: max(0, len(population) - len(emigrants))]
+            islands[index] = survivors + list(emigrants)
+
+    def _record_generation(
+        self, query_type: str, generation: int, island_stats: List[Dict[str, float]]
+    ):
+        """Merge island statistics for one generation into the history."""
+        pattern_count = sum(stats["pattern_count"] for stats in island_stats)
+        entry = {
+            "generation": self._history_totals["generations"] + 1,
+            "query_type": query_type,
+            "query_type_generation": generation + 1,
+            "avg_success_rate": sum(s["success_rate_sum"] for s in island_stats)
+            / pattern_count,
+            "max_success_rate": max(s["max_success_rate"] for s in island_stats),
+            "avg_fitness": sum(s["fitness_sum"] for s in island_stats) / pattern_count,
+            "max_fitness": max(s["max_fitness"] for s in island_stats),
+            "avg_exec_time": sum(s["exec_time_sum"] for s in island_stats)
+            / pattern_count,
+            "pattern_count": pattern_count,
+            "islands": len(island_stats),
+            "timestamp": time.time(),
+        }
+        self.history.append(entry)
+
+        totals = self._history_totals
+        if not totals["generations"]:
+            totals["initial_success_rate"] = entry["avg_success_rate"]
+        totals["generations"] += 1
+        totals["avg_success_rate_sum"] += entry["avg_success_rate"]
+        totals["pattern_count_sum"] += pattern_count
+        totals["best_success_rate"] = max(
+            totals["best_success_rate"], entry["max_success_rate"]
+        )
+        return entry
+
+    def _has_converged(
+        self, entry: Dict[str, any], previous: Optional[Dict[str, any]]
+    ) -> bool:
+        """Whether a generation left best and mean fitness unchanged."""
+        if previous is None:
+            return False
+        return (
+            abs(entry["max_fitness"] - previous["max_fitness"])
+            <= self.convergence_tolerance
+            and abs(entry["avg_fitness"] - previous["avg_fitness"])
+            <= self.convergence_tolerance
+        )
+
+    def _collect_evolved(
+        self, islands: List[List[CoordinationPattern]]
+    ) -> List[CoordinationPattern]:
+        """Best-first, de-duplicated patterns meeting the evolution threshold."""
+        seen: Set[str] = set()
+        evolved = []
+        for pattern in sorted(
+            (p for population in islands for p in population),
+            key=self.fitness_cache,
+            reverse=True,
+        ):
+            if pattern.pattern_id in seen:
+                continue
+            seen.add(pattern.pattern_id)
+            if self.fitness_cache(pattern) >= self.evolution_threshold:
+                evolved.append(pattern)
+        return evolved
 
     def get_evolution_stats(self) -> Dict[str, any]:
         """Get pattern evolution statistics."""
@@ -3051,22 +4424,23 @@ class EvolutionEngine:
             return {}
 
         runtime = time.time() - self.start_time
-        generations = len(self.history)
-        success_rates = [gen["avg_success_rate"] for gen in self.history]
+        totals = self._history_totals
+        generations = totals["generations"]
 
         return {
             "total_generations": generations,
             "runtime_seconds": runtime,
-            "initial_success_rate": self.history[0]["avg_success_rate"],
+            "initial_success_rate": totals["initial_success_rate"],
             "final_success_rate": self.history[-1]["avg_success_rate"],
             "success_rate_improvement": self.history[-1]["avg_success_rate"]
-            - self.history[0]["avg_success_rate"],
-            "avg_generation_size": sum(gen["pattern_count"] for gen in self.history)
-            / generations,
-            "best_success_rate": max(gen["max_success_rate"] for gen in self.history),
-            "avg_success_rate": (
-                sum(success_rates) / len(success_rates) if success_rates else 0
-            ),
+            - totals["initial_success_rate"],
+            "avg_generation_size": totals["pattern_count_sum"] / generations,
+            "best_success_rate": totals["best_success_rate"],
+            "avg_success_rate": totals["avg_success_rate_sum"] / generations,
+            "skipped_evolutions": self.skipped_evolutions,
+            "converged_early": self.converged_early,
+            "fitness_cache_hits": self.fitness_cache.hits,
+            "fitness_cache_misses": self.fitness_cache.misses,
         }
 
 
@@ -3077,10 +4451,13 @@ class MemoryArchitecture:
         self.root_memory_path = Path(".claude/memory")
         self.coordination_hub_path = self.root_memory_path / "coordination-hub.md"
         self.domain_intelligence_path = self.root_memory_path / "domain-intelligence.md"
-        self.cache = {}
-        self.cache_ttl = 900  # 15 minutes
+        self.hub_reader = get_hub_reader()
         self.last_operation_time = 0
         self.operation_times: List[float] = []
+        self.hub_log = CoordinationHubLog(
+            str(self.coordination_hub_path), "memory-patterns"
+        )
+        self.pending_patterns: Dict[str, CoordinationPattern] = {}
 
     def validate_memory_structure(self) -> bool:
         """Validate 2-level memory hierarchy."""
@@ -3106,19 +4483,13 @@ class MemoryArchitecture:
             return False
 
     def store_pattern(self, pattern: CoordinationPattern) -> bool:
-        """Store pattern in coordination hub with performance checks."""
+        """Journal pattern for the coordination hub with performance checks."""
         try:
             start_time = time.perf_counter()
 
-            # Load existing content
-            if not self.coordination_hub_path.exists():
-                self.coordination_hub_path.parent.mkdir(parents=True, exist_ok=True)
-                self.coordination_hub_path.write_text("")
-
-            content = self.coordination_hub_path.read_text(encoding="utf-8")
-
-            # Update patterns section
-            new_content = self._update_patterns_section(content, pattern)
+            if not self.hub_log.append(_pattern_to_record(pattern)):
+                return False
+            self.pending_patterns[pattern.pattern_id] = pattern
 
             # Verify operation time
             operation_time = (time.perf_counter() - start_time) * 1000
@@ -3126,10 +4497,6 @@ class MemoryArchitecture:
                 logger.warning(
                     f"Pattern storage time exceeded limit: {operation_time:.2f}ms"
                 )
-                return False
-
-            # Write updated content
-            self.coordination_hub_path.write_text(new_content, encoding="utf-8")
 
             # Update metrics
             self.last_operation_time = operation_time
@@ -3137,50 +4504,71 @@ class MemoryArchitecture:
             if len(self.operation_times) > 1000:
                 self.operation_times = self.operation_times[-500:]
 
+            if self.hub_log.should_compact():
+                self.compact_hub()
+
             return True
 
         except Exception as e:
             logger.error(f"Failed to store pattern: {e}")
             return False
 
+    def compact_hub(self) -> bool:
+        """Append journaled patterns to the coordination hub markdown."""
+        journaled: Dict[str, CoordinationPattern] = {}
+
+        def apply(records: List[Dict[str, any]]):
+            journaled.update(_patterns_from_records(records))
+
+        def render(content: str) -> str:
+            if not journaled:
+                return content
+            return self._update_patterns_section(content, list(journaled.values()))
+
+        if not self.hub_log.compact(render, apply=apply, include_applied=True):
+            return False
+
+        # Everything pending is now either in this compaction or a concurrent one
+        self.pending_patterns.clear()
+        return True
+
+    def _apply_log_records(self, records: List[Dict[str, any]]):
+        """Track journaled patterns written by other hub writers."""
+        self.pending_patterns.update(_patterns_from_records(records))
+
     def load_patterns(
         self, max_age_seconds: Optional[int] = None
     ) -> Dict[str, CoordinationPattern]:
-        """Load patterns with caching and age validation."""
+        """Load patterns through the shared hub reader.
+
+        The reader revalidates the hub with one ``stat`` per call, and journal
+        records not yet seen by this instance are replayed on every call, so
+        patterns journaled by other writers are visible before compaction.
+        ``max_age_seconds`` is accepted for existing callers and ignored.
+        """
         try:
             start_time = time.perf_counter()
 
-            # Check cache first
-            cache_key = "patterns"
-            if cache_key in self.cache:
-                cache_entry = self.cache[cache_key]
-                cache_age = time.time() - cache_entry["timestamp"]
-
-                if max_age_seconds is None or cache_age < max_age_seconds:
-                    return cache_entry["data"]
-
-            # Load from file
-            if not self.coordination_hub_path.exists():
-                return {}
-
-            content = self.coordination_hub_path.read_text(encoding="utf-8")
-            patterns = self._parse_patterns_section(content)
+            patterns = self.hub_reader.parse_section(
+                str(self.coordination_hub_path),
+                PATTERNS_SECTION_HEADING,
+                _parse_hub_patterns,
+                prefix=True,
+            )
+            self._apply_log_records(self.hub_log.replay())
 
             # Verify load time
             load_time = (time.perf_counter() - start_time) * 1000
             if load_time > 150:  # 150ms limit
                 logger.warning(f"Pattern load time exceeded limit: {load_time:.2f}ms")
 
-            # Update cache
-            self.cache[cache_key] = {"data": patterns, "timestamp": time.time()}
-
             # Update metrics
             self.last_operation_time = load_time
             self.operation_times.append(load_time)
             if len(self.operation_times) > 1000:
                 self.operation_times = self.operation_times[-500:]
 
-            return patterns
+            return {**patterns, **self.pending_patterns}
 
         except Exception as e:
             logger.error(f"Failed to load patterns: {e}")
@@ -3199,6 +4587,94 @@ class MemoryArchitecture:
             "total_operations": len(self.operation_times),
         }
 
+    def _validate_coordination_hub_format(self) -> bool:
+        """Validate coordination hub markdown format."""
+        try:
+            content = self.coordination_hub_path.read_text(encoding="utf-8")
+
+            # Check required sections
+            required_sections = [
+                "## Infrastructure Learning Patterns",
+                "### Successful Infrastructure Coordination Patterns",
+                "### Learning Performance Metrics",
+            ]
+
+            for section in required_sections:
+                if section not in content:
+                    return False
+
+            # Validate pattern entries format
+            pattern_section = content.split("## Infrastructure Learning Patterns")[1]
+            pattern_lines = pattern_section.split("\n")
+
+            for line in pattern_lines:
+                if line.startswith("- **") and "**:" in line:
+                    # Validate pattern format
+                    if not all(
+                        x in line for x in ["confidence:", "keywords:", "learned:"]
+                    ):
+                        return False
+
+            return True
+
+        except Exception as e:
+            logger.error(f"Coordination hub validation failed: {e}")
+            return False
+
+    def _update_patterns_section(
+        self, content: str, new_patterns: List[CoordinationPattern]
+    ) -> str:
+        """Update patterns section while preserving format."""
+        # Find patterns section
+        section_start = content.find("## Infrastructure Learning Patterns")
+        if section_start == -1:
+            # Create new section if not found
+            return content + "\n\n" + self._create_patterns_section(new_patterns)
+
+        # Find next section
+        next_section = content.find("\n## ", section_start + 1)
+        section_content = (
+            content[section_start:next_section]
+            if next_section != -1
+            else content[section_start:]
+        )
+
+        # Add new pattern entries
+        pattern_entries = "\n".join(
+            self._format_pattern_entry(pattern) for pattern in new_patterns
+        )
+        updated_section = section_content + "\n" + pattern_entries
+
+        # Replace section in content
+        if next_section != -1:
+            return content[:section_start] + updated_section + content[next_section:]
+        else:
+            return content[:section_start] + updated_section
+
+    def _create_patterns_section(self, patterns: List[CoordinationPattern]) -> str:
+        """Create new patterns section."""
+        pattern_entries = "\n".join(
+            self._format_pattern_entry(pattern) for pattern in patterns
+        )
+        avg_success_rate = sum(p.success_rate for p in patterns) / max(len(patterns), 1)
+        return f"""## Infrastructure Learning Patterns
+
+### Successful Infrastructure Coordination Patterns
+**Performance Target: Improve current 38% accuracy through learned patterns**
+
+{pattern_entries}
+
+### Learning Performance Metrics
+- **Total Patterns**: {len(patterns)}
+- **Average Success Rate**: {avg_success_rate:.2f}
+- **Last Updated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+"""
+
+    def _format_pattern_entry(self, pattern: CoordinationPattern) -> str:
+        """Format pattern entry in standard format."""
+        days_old = (datetime.now() - pattern.last_used).days
+        return f"- **{pattern.pattern_id}**: {','.join(pattern.agent_sequence)} (confidence: {pattern.success_rate:.2f}, execution_time: {pattern.execution_time_ms:.1f}ms, learned: {days_old} days ago)"
+
 
 class EnhancedCrossDomainCoordinator:
     """Main coordinator for enhanced cross-domain integration with learning capabilities."""
@@ -3210,11 +4686,18 @@ class EnhancedCrossDomainCoordinator:
         self.cross_domain_optimizer = CrossDomainOptimizer()
         self.learning_coordinator = None  # Initialized on first use
         self.pattern_learning_engine = None  # Initialized on first use
-        self.analysis_history = []
+        self.analysis_history = AnalysisHistory(maxlen=500)
+        self.admission = get_admission_controller()
 
     def analyze_cross_domain_integration(self, query: str) -> CrossDomainAnalysis:
-        """Perform comprehensive cross-domain analysis with learning integration."""
+        """Perform comprehensive cross-domain analysis with learning integration.
+
+        Under overload the admission controller sheds conflict analysis,
+        learned suggestions and the recommendation text, in that order;
+        boundary detection and agent suggestions always run.
+        """
         start_time = time.perf_counter()
+        admission = self.admission.admit()
 
         try:
             # Step 1: Check learned patterns first for infrastructure queries
@@ -3222,6 +4705,7 @@ class EnhancedCrossDomainCoordinator:
             if (
                 hasattr(self, "pattern_learning_engine")
                 and self.pattern_learning_engine
+                and admission.allows("learning_enhancement")
             ):
                 learned_suggestion = (
                     self.pattern_learning_engine.get_learned_agent_suggestion(query)
@@ -3231,12 +4715,18 @@ class EnhancedCrossDomainCoordinator:
             boundaries = self.boundary_detector.detect_domain_boundaries(query)
 
             # Step 3: Detect potential conflicts
-            conflicts = self.conflict_engine.detect_conflicts(boundaries, query)
+            conflicts = []
+            if admission.allows("cross_domain_analysis"):
+                conflicts = self.conflict_engine.detect_conflicts(boundaries, query)
 
             # Step 4: Generate coordination recommendations
-            coordination_recommendation = self._generate_coordination_recommendation(
-                boundaries, conflicts, query
-            )
+            coordination_recommendation = "Degraded under load - core selection only"
+            if admission.allows("reasoning"):
+                coordination_recommendation = (
+                    self._generate_coordination_recommendation(
+                        boundaries, conflicts, query
+                    )
+                )
 
             # Step 5: Generate agent suggestions with conflict awareness and learning integration
             agent_suggestions = self._generate_agent_suggestions_with_learning(
@@ -3260,16 +4750,7 @@ class EnhancedCrossDomainCoordinator:
                 processing_time_ms=processing_time,
             )
 
-            # Memory-efficient history management
-            if not hasattr(self, "analysis_history"):
-                self.analysis_history = []
-
-            # Circular buffer implementation for memory efficiency
-            if len(self.analysis_history) >= 500:
-                # Keep only every other item when buffer is full
-                self.analysis_history = self.analysis_history[::2]
-                gc.collect()  # Force garbage collection after reduction
-
+            # Bounded history; evicted analyses leave the running statistics
             self.analysis_history.append(analysis)
 
             return analysis
@@ -3289,6 +4770,8 @@ class EnhancedCrossDomainCoordinator:
                 integration_complexity=0.1,
                 processing_time_ms=(time.perf_counter() - start_time) * 1000,
             )
+        finally:
+            admission.release()
 
     def _generate_agent_suggestions_with_learning(
         self,
@@ -3610,16 +5093,7 @@ class EnhancedCrossDomainCoordinator:
 
         # Add coordinator-specific insights
         coordinator_stats = {
-            "analyses_with_infrastructure": len(
-                [
-                    a
-                    for a in getattr(self, "analysis_history", [])
-                    if any(
-                        b.primary_domain == DomainType.INFRASTRUCTURE
-                        for b in a.detected_boundaries
-                    )
-                ]
-            ),
+            "analyses_with_infrastructure": self.analysis_history.analyses_with_infrastructure,
             "infrastructure_learning_rate": 0.0,
         }
 
@@ -3639,45 +5113,7 @@ class EnhancedCrossDomainCoordinator:
 
     def get_analysis_stats(self) -> Dict[str, any]:
         """Get statistics about cross-domain analysis patterns."""
-        if not hasattr(self, "analysis_history") or not self.analysis_history:
-            return {}
-
-        # Domain frequency analysis
-        domain_frequency = Counter()
-        conflict_frequency = Counter()
-        complexity_scores = []
-
-        for analysis in self.analysis_history:
-            for boundary in analysis.detected_boundaries:
-                domain_frequency[boundary.primary_domain.value] += 1
-                for secondary in boundary.secondary_domains:
-                    domain_frequency[secondary.value] += 1
-
-            for conflict in analysis.potential_conflicts:
-                conflict_frequency[conflict.conflict_type.value] += 1
-
-            complexity_scores.append(analysis.integration_complexity)
-
-        avg_complexity = (
-            sum(complexity_scores) / len(complexity_scores)
-            if complexity_scores
-            else 0.0
-        )
-        avg_processing_time = sum(
-            a.processing_time_ms for a in self.analysis_history
-        ) / len(self.analysis_history)
-
-        return {
-            "total_analyses": len(self.analysis_history),
-            "domain_frequency": dict(domain_frequency.most_common()),
-            "conflict_frequency": dict(conflict_frequency.most_common()),
-            "average_complexity": avg_complexity,
-            "average_processing_time_ms": avg_processing_time,
-            "conflict_detection_rate": len(
-                [a for a in self.analysis_history if a.potential_conflicts]
-            )
-            / len(self.analysis_history),
-        }
+        return self.analysis_history.get_stats()
 
     def _get_pattern_based_agents(self, query: str) -> List[Tuple[str, float]]:
         """Get agent suggestions based on pattern matching."""
@@ -3841,12 +5277,26 @@ class EnhancedCrossDomainCoordinator:
 
 
 class CrossDomainOptimizer:
-    """Optimizes multi-domain coordination with enhanced patterns."""
+    """Optimizes multi-domain coordination with enhanced patterns.
+
+    Optimization patterns are parsed into domain tuples once. The best
+    pattern for a (pattern key, primary domain, secondary domains) triple is
+    memoized and the memo for a pattern key is dropped whenever its domain
+    expertise changes. Metrics are kept as fixed-size running aggregates.
+    """
 
     def __init__(self):
         self.optimization_patterns = self._initialize_optimization_patterns()
+        self.parsed_patterns: Dict[str, List[Tuple[str, ...]]] = {
+            key: [tuple(pattern.split("->")) for pattern in patterns]
+            for key, patterns in self.optimization_patterns.items()
+        }
         self.domain_expertise = self._initialize_domain_expertise()
-        self.performance_metrics = defaultdict(list)
+        # pattern_key -> (primary, secondaries) -> best pattern or None
+        self._best_patterns: Dict[
+            str, Dict[Tuple[str, frozenset], Optional[Tuple[str, ...]]]
+        ] = defaultdict(dict)
+        self.performance_metrics: Dict[str, Dict[str, float]] = {}
         self.start_time = time.time()
         self.min_confidence = 0.45
 
@@ -3917,40 +5367,37 @@ class CrossDomainOptimizer:
                 return None
 
             # Get relevant optimization pattern
-            if pattern_key not in self.optimization_patterns:
+            if pattern_key not in self.parsed_patterns:
                 return None
 
-            patterns = self.optimization_patterns[pattern_key]
             expertise = self.domain_expertise[pattern_key]
 
             # Select best pattern based on domain boundaries
-            best_pattern = self._select_optimal_pattern(
-                patterns, boundaries[0], expertise
+            best_pattern = self._lookup_optimal_pattern(
+                pattern_key, boundaries[0], expertise
             )
             if not best_pattern:
                 return None
 
             # Apply pattern
-            agent_sequence = best_pattern.split("->")
+            agent_sequence = list(best_pattern)
             confidence = self._calculate_confidence(agent_sequence, expertise)
 
             # Update metrics
             execution_time = (time.perf_counter() - start_time) * 1000
             if execution_time <= 40:  # 40ms limit
-                expertise["current_accuracy"] = min(
+                accuracy = min(
                     expertise["target_accuracy"],
                     expertise["current_accuracy"] + expertise["improvement_rate"],
                 )
+                if accuracy != expertise["current_accuracy"]:
+                    expertise["current_accuracy"] = accuracy
+                    self.invalidate_pattern_table(pattern_key)
 
-                self.performance_metrics[pattern_key].append(
-                    {
-                        "timestamp": time.time(),
-                        "confidence": confidence,
-                        "execution_time_ms": execution_time,
-                    }
-                )
+                self._record_metrics(pattern_key, confidence, execution_time)
 
             return CoordinationResult(
+                query_signature=query,
                 confidence=confidence,
                 execution_time_ms=execution_time,
                 agent_sequence=agent_sequence,
@@ -3985,13 +5432,40 @@ class CrossDomainOptimizer:
 
         return None
 
-    def _select_optimal_pattern(
-        self, patterns: List[str], boundary: DomainBoundary, expertise: Dict[str, float]
-    ) -> Optional[str]:
-        """Select optimal pattern based on domain boundaries."""
+    def invalidate_pattern_table(self, pattern_key: Optional[str] = None):
+        """Drop memoized best patterns after ``domain_expertise`` changes."""
+        if pattern_key is None:
+            self._best_patterns.clear()
+        else:
+            self._best_patterns.pop(pattern_key, None)
+
+    def _lookup_optimal_pattern(
+        self, pattern_key: str, boundary: DomainBoundary, expertise: Dict[str, float]
+    ) -> Optional[Tuple[str, ...]]:
+        """Memoized ``_select_optimal_pattern`` for a pattern key."""
         primary_domain = boundary.primary_domain.value.lower()
-        secondary_domains = [d.value.lower() for d in boundary.secondary_domains]
+        secondary_domains = frozenset(
+            d.value.lower() for d in boundary.secondary_domains
+        )
+        table = self._best_patterns[pattern_key]
+        key = (primary_domain, secondary_domains)
+        if key not in table:
+            table[key] = self._select_optimal_pattern(
+                self.parsed_patterns[pattern_key],
+                primary_domain,
+                secondary_domains,
+                expertise,
+            )
+        return table[key]
 
+    def _select_optimal_pattern(
+        self,
+        patterns: List[Tuple[str, ...]],
+        primary_domain: str,
+        secondary_domains: frozenset,
+        expertise: Dict[str, float],
+    ) -> Optional[Tuple[str, ...]]:
+        """Select optimal pattern based on domain boundaries."""
         # Score each pattern
         pattern_scores = []
         for pattern in patterns:
@@ -4009,13 +5483,12 @@ class CrossDomainOptimizer:
 
     def _score_pattern(
         self,
-        pattern: str,
+        pattern_domains: Tuple[str, ...],
         primary_domain: str,
-        secondary_domains: List[str],
+        secondary_domains: frozenset,
         expertise: Dict[str, float],
     ) -> float:
         """Score pattern based on domain alignment and expertise."""
-        pattern_domains = pattern.split("->")
 
         # Base score from expertise
         base_score = expertise["current_accuracy"]
@@ -4057,22 +5530,36 @@ class CrossDomainOptimizer:
 
         return min(1.0, max(self.min_confidence, base_confidence))
 
+    def _record_metrics(
+        self, pattern_key: str, confidence: float, execution_time_ms: float
+    ):
+        """Fold one optimization into the pattern key's running aggregate."""
+        metrics = self.performance_metrics.get(pattern_key)
+        if metrics is None:
+            metrics = self.performance_metrics[pattern_key] = {
+                "count": 0,
+                "confidence_sum": 0.0,
+                "max_confidence": confidence,
+                "exec_time_sum": 0.0,
+                "last_timestamp": 0.0,
+            }
+        metrics["count"] += 1
+        metrics["confidence_sum"] += confidence
+        metrics["max_confidence"] = max(metrics["max_confidence"], confidence)
+        metrics["exec_time_sum"] += execution_time_ms
+        metrics["last_timestamp"] = time.time()
+
     def get_optimization_stats(self) -> Dict[str, any]:
         """Get optimization performance statistics."""
         stats = {}
 
         for pattern_key, metrics in self.performance_metrics.items():
-            if not metrics:
-                continue
-
-            confidences = [m["confidence"] for m in metrics]
-            exec_times = [m["execution_time_ms"] for m in metrics]
-
+            count = metrics["count"]
             stats[pattern_key] = {
-                "avg_confidence": sum(confidences) / len(confidences),
-                "max_confidence": max(confidences),
-                "avg_exec_time_ms": sum(exec_times) / len(exec_times),
-                "total_optimizations": len(metrics),
+                "avg_confidence": metrics["confidence_sum"] / count,
+                "max_confidence": metrics["max_confidence"],
+                "avg_exec_time_ms": metrics["exec_time_sum"] / count,
+                "total_optimizations": count,
                 "current_accuracy": self.domain_expertise[pattern_key][
                     "current_accuracy"
                 ],
@@ -4086,9 +5573,15 @@ class CrossDomainOptimizer:
 
 
 class SafetyManager:
-    """Manages production safety measures for the learning system."""
+    """Manages production safety measures for the learning system.
 
-    def __init__(self):
+    Selection load is judged by an ``AdmissionController`` (the process-wide
+    one by default) instead of a lifetime average rate, so bursts disable
+    learning while they last and shed stages are reported in the stats.
+    """
+
+    def __init__(self, admission: Optional[AdmissionController] = None):
+        self.admission = admission or get_admission_controller()
         self.performance_history = deque(maxlen=1000)
         self.error_counts = defaultdict(int)
         self.last_reset = time.time()
@@ -4127,9 +5620,14 @@ class SafetyManager:
                     )
                     return False
 
-                if metrics["avg_selections_per_second"] > 1000:
-                    logger.warning("Selection rate too high - safety check failed")
-                    return False
+            # Shed learning while selection load is high
+            if (
+                self.admission.current_load()
+                >= self.admission.stage_shed_load["learning_enhancement"]
+            ):
+                logger.warning("Selection load too high - learning shed")
+                self.admission.record_shed("learning_enhancement")
+                return False
 
             self.learning_enabled = True
             return True
@@ -4147,10 +5645,14 @@ class SafetyManager:
                 "success": success,
             }
         )
+        SAFETY_EXECUTION_MS.observe(
+            execution_time_ms, success="true" if success else "false"
+        )
 
     def record_error(self, error_type: str):
         """Record error occurrence for safety monitoring."""
         self.error_counts[error_type] += 1
+        SAFETY_ERRORS.inc(error_type=error_type)
 
     def _reset_error_counts_if_needed(self):
         """Reset error counts after interval."""
@@ -4176,6 +5678,7 @@ class SafetyManager:
             "max_execution_time_ms": max(exec_times),
             "recent_success_rate": success_rate,
             "total_operations": len(self.performance_history),
+            "admission": self.admission.get_stats(),
         }
 
 
@@ -4221,6 +5724,14 @@ class HealthMonitor:
                     "pattern_healthy": pattern_healthy,
                 }
             )
+            HEALTH_CHECKS.inc(healthy="true" if system_healthy else "false")
+            for component, healthy in (
+                ("system", system_healthy),
+                ("coordinator", coordinator_healthy),
+                ("memory", memory_healthy),
+                ("pattern", pattern_healthy),
+            ):
+                HEALTH_STATUS.set(1 if healthy else 0, component=component)
 
             if not system_healthy:
                 logger.warning(
@@ -4345,134 +5856,6 @@ class HealthMonitor:
             "uptime_seconds": time.time() - self.start_time,
         }
 
-    def _validate_coordination_hub_format(self) -> bool:
-        """Validate coordination hub markdown format."""
-        try:
-            content = self.coordination_hub_path.read_text(encoding="utf-8")
-
-            # Check required sections
-            required_sections = [
-                "## Infrastructure Learning Patterns",
-                "### Successful Infrastructure Coordination Patterns",
-                "### Learning Performance Metrics",
-            ]
-
-            for section in required_sections:
-                if section not in content:
-                    return False
-
-            # Validate pattern entries format
-            pattern_section = content.split("## Infrastructure Learning Patterns")[1]
-            pattern_lines = pattern_section.split("\n")
-
-            for line in pattern_lines:
-                if line.startswith("- **") and "**:" in line:
-                    # Validate pattern format
-                    if not all(
-                        x in line for x in ["confidence:", "keywords:", "learned:"]
-                    ):
-                        return False
-
-            return True
-
-        except Exception as e:
-            logger.error(f"Coordination hub validation failed: {e}")
-            return False
-
-    def _update_patterns_section(
-        self, content: str, new_pattern: CoordinationPattern
-    ) -> str:
-        """Update patterns section while preserving format."""
-        # Find patterns section
-        section_start = content.find("## Infrastructure Learning Patterns")
-        if section_start == -1:
-            # Create new section if not found
-            return content + "\n\n" + self._create_patterns_section(new_pattern)
-
-        # Find next section
-        next_section = content.find("\n## ", section_start + 1)
-        section_content = (
-            content[section_start:next_section]
-            if next_section != -1
-            else content[section_start:]
-        )
-
-        # Add new pattern entry
-        pattern_entry = self._format_pattern_entry(new_pattern)
-        updated_section = section_content + "\n" + pattern_entry
-
-        # Replace section in content
-        if next_section != -1:
-            return content[:section_start] + updated_section + content[next_section:]
-        else:
-            return content[:section_start] + updated_section
-
-    def _create_patterns_section(self, pattern: CoordinationPattern) -> str:
-        """Create new patterns section."""
-        return f"""## Infrastructure Learning Patterns
-
-### Successful Infrastructure Coordination Patterns
-**Performance Target: Improve current 38% accuracy through learned patterns**
-
-{self._format_pattern_entry(pattern)}
-
-### Learning Performance Metrics
-- **Total Patterns**: 1
-- **Average Success Rate**: {pattern.success_rate:.2f}
-- **Last Updated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-"""
-
-    def _format_pattern_entry(self, pattern: CoordinationPattern) -> str:
-        """Format pattern entry in standard format."""
-        days_old = (datetime.now() - pattern.last_used).days
-        return f"- **{pattern.pattern_id}**: {','.join(pattern.agent_sequence)} (confidence: {pattern.success_rate:.2f}, execution_time: {pattern.execution_time_ms:.1f}ms, learned: {days_old} days ago)"
-
-    def _parse_patterns_section(self, content: str) -> Dict[str, CoordinationPattern]:
-        """Parse patterns from coordination hub content."""
-        patterns = {}
-
-        # Find patterns section
-        section_start = content.find("## Infrastructure Learning Patterns")
-        if section_start == -1:
-            return patterns
-
-        section_content = content[section_start:].split("\n")
-
-        for line in section_content:
-            if line.startswith("- **") and "**:" in line:
-                try:
-                    # Extract pattern ID
-                    pattern_id = line[3 : line.find("**:", 3)]
-
-                    # Parse pattern details
-                    details = line[line.find("**:") + 3 :]
-                    agents = details[: details.find("(")].strip().split(",")
-
-                    # Extract metrics
-                    confidence = float(
-                        re.search(r"confidence: ([0-9.]+)", details).group(1)
-                    )
-                    exec_time = float(
-                        re.search(r"execution_time: ([0-9.]+)", details).group(1)
-                    )
-                    days_ago = int(re.search(r"learned: ([0-9]+)", details).group(1))
-
-                    # Create pattern object
-                    patterns[pattern_id] = CoordinationPattern(
-                        pattern_id=pattern_id,
-                        query_signature="",  # Not stored in file
-                        agent_sequence=agents,
-                        success_rate=confidence,
-                        last_used=datetime.now() - timedelta(days=days_ago),
-                        execution_time_ms=exec_time,
-                    )
-
-                except Exception as e:
-                    logger.warning(f"Failed to parse pattern entry: {line}. Error: {e}")
-                    continue
-
-        return patterns
-
 
 def analyze_cross_domain_query(query: str) -> CrossDomainAnalysis:
     """Convenience function to analyze cross-domain integration for a query."""
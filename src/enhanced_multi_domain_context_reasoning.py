@@ -15,13 +15,20 @@ Purpose: Advanced multi-domain context reasoning with enhanced pattern detection
 
 import re
 import time
+import heapq
+import math
 from typing import Dict, List, Tuple, Optional, Set, Any
 from dataclasses import dataclass, field
 from enum import Enum
-from collections import defaultdict, deque
+from collections import OrderedDict, defaultdict, deque
 from datetime import datetime
 import logging
 
+try:
+    from .keyword_automaton import KeywordAutomaton
+except ImportError:
+    from keyword_automaton import KeywordAutomaton
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -34,6 +41,9 @@ class ContextPreservationStrategy(Enum):
     SELECTIVE_TRANSFER = "selective_transfer"  # Domain-relevant context only
     HIERARCHICAL_TRANSFER = "hierarchical_transfer"  # Structured context layers
     ADAPTIVE_TRANSFER = "adaptive_transfer"  # Dynamic context selection
+    BUDGETED_TRANSFER = (
+        "budgeted_transfer"  # Most valuable context within a size budget
+    )
 
 
 class DomainRelationshipType(Enum):
@@ -108,15 +118,89 @@ class ContextPreservationMetrics:
     domain_coverage: float
     semantic_coherence: float
     transfer_latency_ms: float
+    bytes_transferred: int = 0
+    bytes_saved: int = 0  # Versus a full transfer
+
+
+# Regex escapes, character classes and groups, which carry no fixed literal
+_REGEX_NON_LITERAL_RE = re.compile(r"\\.|\[[^\]]*\]|\([^()]*\)")
+_REGEX_LITERAL_RUN_RE = re.compile(r"[a-z]+([?*{]?)")
+
+
+def required_literals(pattern: str) -> Tuple[str, ...]:
+    """Lower-case words that every match of a simple regex must contain.
+
+    Escapes, classes and (non-nested) groups are dropped; a letter under a
+    ``?``, ``*`` or ``{`` quantifier is dropped from its run. Patterns with
+    alternation at the top level have no required literal.
+    """
+    stripped = _REGEX_NON_LITERAL_RE.sub(" ", pattern)
+    if "|" in stripped or "(" in stripped:
+        return ()
+    literals = []
+    for match in _REGEX_LITERAL_RUN_RE.finditer(stripped):
+        word = match.group()
+        if match.group(1):
+            word = word[:-2]
+        if word:
+            literals.append(word)
+    return tuple(literals)
 
 
 class SemanticAnalyzer:
-    """Semantic analysis for context understanding."""
+    """Semantic analysis for context understanding.
+
+    The vocabulary tables are compiled once into a ``KeywordAutomaton``, so
+    a single scan of the query finds every domain keyword, domain name,
+    importance indicator and relationship trigger word. Relationship regexes
+    are precompiled and only run when the scan found the words they require.
+    Call ``compile_vocabulary`` after changing the tables.
+    """
 
     def __init__(self):
         self.domain_semantics = self._build_domain_semantics()
         self.relationship_patterns = self._build_relationship_patterns()
         self.context_indicators = self._build_context_indicators()
+        self.compile_vocabulary()
+
+    def compile_vocabulary(self):
+        """Compile the vocabulary tables into the automaton and regexes."""
+        vocabulary: Set[str] = set()
+
+        # keyword -> [(domain index, category index, position in category)]
+        self._keyword_slots: Dict[str, List[Tuple[int, int, int]]] = defaultdict(list)
+        self._domains = list(self.domain_semantics)
+        self._category_weights: List[List[float]] = []
+        for domain_index, (domain, patterns) in enumerate(
+            self.domain_semantics.items()
+        ):
+            weights = []
+            for category_index, (category, keywords) in enumerate(patterns.items()):
+                weights.append(self._get_category_weight(category))
+                for position, keyword in enumerate(keywords):
+                    self._keyword_slots[keyword].append(
+                        (domain_index, category_index, position)
+                    )
+            self._category_weights.append(weights)
+            vocabulary.add(domain)
+        vocabulary.update(self._keyword_slots)
+
+        self._indicator_levels: Dict[str, List[str]] = defaultdict(list)
+        for importance, indicators in self.context_indicators.items():
+            for indicator in indicators:
+                self._indicator_levels[indicator].append(importance)
+        vocabulary.update(self._indicator_levels)
+
+        self._relationship_regexes: List[Tuple[str, re.Pattern, Tuple[str, ...]]] = []
+        for rel_type, patterns in self.relationship_patterns.items():
+            for pattern in patterns:
+                literals = required_literals(pattern)
+                vocabulary.update(literals)
+                self._relationship_regexes.append(
+                    (rel_type, re.compile(pattern), literals)
+                )
+
+        self._automaton = KeywordAutomaton(vocabulary)
 
     def _build_domain_semantics(self) -> Dict[str, Dict[str, List[str]]]:
         """Build semantic patterns for each domain."""
@@ -303,21 +387,31 @@ class SemanticAnalyzer:
             "semantic_complexity": 0.0,
         }
 
-        # Calculate domain scores based on semantic patterns
-        for domain, patterns in self.domain_semantics.items():
+        found = self._automaton.find(text_lower)
+
+        # Calculate domain scores based on semantic patterns; slots sort into
+        # table order, so matches list categories and keywords as defined
+        domain_matches: Dict[int, List[Tuple[int, int, str]]] = defaultdict(list)
+        for keyword in found:
+            for domain_index, category_index, position in self._keyword_slots.get(
+                keyword, ()
+            ):
+                domain_matches[domain_index].append((category_index, position, keyword))
+        for domain in found.intersection(self._domains):
+            domain_matches.setdefault(self._domains.index(domain), [])
+
+        for domain_index in sorted(domain_matches):
+            domain = self._domains[domain_index]
+            weights = self._category_weights[domain_index]
             score = 0.0
             matches = []
 
-            for category, keywords in patterns.items():
-                category_matches = sum(
-                    1 for keyword in keywords if keyword in text_lower
-                )
-                score += category_matches * self._get_category_weight(category)
-                if category_matches > 0:
-                    matches.extend([kw for kw in keywords if kw in text_lower])
+            for category_index, _, keyword in sorted(domain_matches[domain_index]):
+                score += weights[category_index]
+                matches.append(keyword)
 
             # Also check for domain name in text
-            if domain in text_lower:
+            if domain in found:
                 score += 2.0
                 matches.append(domain)
 
@@ -331,23 +425,28 @@ class SemanticAnalyzer:
                 }
 
         # Detect relationship indicators
-        for rel_type, patterns in self.relationship_patterns.items():
-            for pattern in patterns:
-                matches = re.finditer(pattern, text_lower)
-                for match in matches:
-                    results["relationship_indicators"].append(
-                        {
-                            "type": rel_type,
-                            "match": match.group(),
-                            "position": match.span(),
-                        }
-                    )
+        for rel_type, regex, literals in self._relationship_regexes:
+            if not found.issuperset(literals):
+                continue
+            for match in regex.finditer(text_lower):
+                results["relationship_indicators"].append(
+                    {
+                        "type": rel_type,
+                        "match": match.group(),
+                        "position": match.span(),
+                    }
+                )
 
         # Calculate context importance
-        for importance, indicators in self.context_indicators.items():
-            count = sum(1 for indicator in indicators if indicator in text_lower)
-            if count > 0:
-                results["context_importance"][importance] = count
+        importance_counts: Dict[str, int] = defaultdict(int)
+        for indicator in found:
+            for importance in self._indicator_levels.get(indicator, ()):
+                importance_counts[importance] += 1
+        for importance in self.context_indicators:
+            if importance_counts.get(importance):
+                results["context_importance"][importance] = importance_counts[
+                    importance
+                ]
 
         # Calculate semantic complexity
         domain_count = len(results["domain_scores"])
@@ -370,21 +469,35 @@ class SemanticAnalyzer:
 
 
 class CrossDomainRelationshipMapper:
-    """Maps relationships between domains based on patterns and history."""
+    """Maps relationships between domains based on patterns and history.
+
+    ``register_relationship`` maintains an adjacency index next to the
+    registry. Path queries are answered from all-pairs tables computed on
+    first use: fewest-hop paths (BFS from every domain, rebuilt only when an
+    edge is added) and strongest paths (Dijkstra on ``-log(strength)``,
+    rebuilt only when a strength changes). Strengths must be changed through
+    ``register_relationship`` or ``update_relationship_strength`` so the
+    tables stay current.
+    """
 
     def __init__(self):
         self.relationship_registry: Dict[Tuple[str, str], DomainRelationship] = {}
         self.pattern_history: List[MultiDomainPattern] = []
         self.success_metrics: Dict[str, float] = defaultdict(float)
+        # source -> target -> relationship, in registration order
+        self.adjacency: Dict[str, Dict[str, DomainRelationship]] = defaultdict(dict)
+        self._hop_paths: Optional[Dict[Tuple[str, str], List[str]]] = None
+        self._strongest_paths: Optional[
+            Dict[Tuple[str, str], Tuple[List[str], float]]
+        ] = None
+        self._related: Dict[str, List[Tuple[str, float]]] = {}
 
     def register_relationship(self, relationship: DomainRelationship):
         """Register a domain relationship."""
-        key = (relationship.from_domain, relationship.to_domain)
-        self.relationship_registry[key] = relationship
+        self._index_relationship(relationship)
 
         # If bidirectional, register reverse relationship
         if relationship.bidirectional:
-            reverse_key = (relationship.to_domain, relationship.from_domain)
             reverse_rel = DomainRelationship(
                 from_domain=relationship.to_domain,
                 to_domain=relationship.from_domain,
@@ -393,7 +506,20 @@ class CrossDomainRelationshipMapper:
                 bidirectional=False,
                 context_transfer_rules=relationship.context_transfer_rules,
             )
-            self.relationship_registry[reverse_key] = reverse_rel
+            self._index_relationship(reverse_rel)
+
+    def _index_relationship(self, relationship: DomainRelationship):
+        """Store one directed relationship and invalidate affected tables."""
+        key = (relationship.from_domain, relationship.to_domain)
+        if key not in self.relationship_registry:
+            self._hop_paths = None
+        self.relationship_registry[key] = relationship
+        self.adjacency[relationship.from_domain][relationship.to_domain] = relationship
+        self._invalidate_strengths()
+
+    def _invalidate_strengths(self):
+        self._strongest_paths = None
+        self._related.clear()
 
     def get_relationship_strength(self, from_domain: str, to_domain: str) -> float:
         """Get relationship strength between domains."""
@@ -405,40 +531,49 @@ class CrossDomainRelationshipMapper:
     def find_domain_path(
         self, from_domain: str, to_domain: str, max_hops: int = 3
     ) -> List[str]:
-        """Find path between domains using relationship graph."""
+        """Find the fewest-hop path between domains using relationship graph."""
         if from_domain == to_domain:
             return [from_domain]
 
-        visited = set()
-        queue = deque([(from_domain, [from_domain])])
-
-        while queue and len(queue[0][1]) <= max_hops:
-            current_domain, path = queue.popleft()
-
-            if current_domain in visited:
-                continue
-            visited.add(current_domain)
-
-            # Check direct connections
-            for (source, target), relationship in self.relationship_registry.items():
-                if source == current_domain and target not in visited:
-                    new_path = path + [target]
-                    if target == to_domain:
-                        return new_path
-                    queue.append((target, new_path))
+        if self._hop_paths is None:
+            self._hop_paths = self._build_hop_paths()
+        path = self._hop_paths.get((from_domain, to_domain))
+        if path is None or len(path) - 1 > max_hops:
+            return []  # No path found
+        return list(path)
+
+    def find_strongest_path(
+        self, from_domain: str, to_domain: str
+    ) -> Tuple[List[str], float]:
+        """Find the path maximizing the product of relationship strengths."""
+        if from_domain == to_domain:
+            return [from_domain], 1.0
 
-        return []  # No path found
+        if self._strongest_paths is None:
+            self._strongest_paths = self._build_strongest_paths()
+        path, strength = self._strongest_paths.get((from_domain, to_domain), ([], 0.0))
+        return list(path), strength
 
     def get_related_domains(
         self, domain: str, min_strength: float = 0.3
     ) -> List[Tuple[str, float]]:
         """Get domains related to given domain above minimum strength."""
-        related = []
-        for (source, target), relationship in self.relationship_registry.items():
-            if source == domain and relationship.strength >= min_strength:
-                related.append((target, relationship.strength))
+        related = self._related.get(domain)
+        if related is None:
+            related = self._related[domain] = sorted(
+                (
+                    (target, relationship.strength)
+                    for target, relationship in self.adjacency.get(domain, {}).items()
+                ),
+                key=lambda x: x[1],
+                reverse=True,
+            )
 
-        return sorted(related, key=lambda x: x[1], reverse=True)
+        # Sorted strongest first, so the matches are a prefix
+        count = 0
+        while count < len(related) and related[count][1] >= min_strength:
+            count += 1
+        return related[:count]
 
     def update_relationship_strength(
         self,
@@ -456,17 +591,223 @@ class CrossDomainRelationshipMapper:
             else:
                 new_strength = max(0.0, current_strength - learning_rate * 0.5)
 
-            self.relationship_registry[key].strength = new_strength
+            if new_strength != current_strength:
+                self.relationship_registry[key].strength = new_strength
+                self._invalidate_strengths()
+
+    def _build_hop_paths(self) -> Dict[Tuple[str, str], List[str]]:
+        """BFS from every domain, expanding neighbors in registration order."""
+        paths = {}
+        for source in list(self.adjacency):
+            parents = {source: None}
+            queue = deque([source])
+            while queue:
+                current = queue.popleft()
+                for target in self.adjacency.get(current, ()):
+                    if target not in parents:
+                        parents[target] = current
+                        queue.append(target)
+
+            for target in parents:
+                if target == source:
+                    continue
+                path = [target]
+                while parents[path[-1]] is not None:
+                    path.append(parents[path[-1]])
+                paths[(source, target)] = path[::-1]
+        return paths
+
+    def _build_strongest_paths(
+        self,
+    ) -> Dict[Tuple[str, str], Tuple[List[str], float]]:
+        """Dijkstra on ``-log(strength)`` from every domain."""
+        paths = {}
+        for source in list(self.adjacency):
+            costs = {source: 0.0}
+            parents = {source: None}
+            heap = [(0.0, 0, source)]
+            pushed = 1
+            done = set()
+            while heap:
+                cost, _, current = heapq.heappop(heap)
+                if current in done:
+                    continue
+                done.add(current)
+                for target, relationship in self.adjacency.get(current, {}).items():
+                    if relationship.strength <= 0.0 or target in done:
+                        continue
+                    new_cost = cost - math.log(min(1.0, relationship.strength))
+                    if new_cost < costs.get(target, math.inf):
+                        costs[target] = new_cost
+                        parents[target] = current
+                        heapq.heappush(heap, (new_cost, pushed, target))
+                        pushed += 1
+
+            for target in done:
+                if target == source:
+                    continue
+                path = [target]
+                while parents[path[-1]] is not None:
+                    path.append(parents[path[-1]])
+                paths[(source, target)] = (path[::-1], math.exp(-costs[target]))
+        return paths
+
+
+# Rough per-element cost of the object, its fields and container slots
+CONTEXT_ELEMENT_OVERHEAD_BYTES = 200
+
+
+# Rough average for English text and code, used to convert token budgets
+BYTES_PER_TOKEN = 4
+
+
+def element_transfer_bytes(element: ContextElement) -> int:
+    """Bytes of an element's content as handed to the next agent."""
+    return len(element.content.encode("utf-8"))
+
+
+def estimate_element_bytes(element: ContextElement) -> int:
+    """Estimate the bytes an element's identifying fields occupy."""
+    return (
+        CONTEXT_ELEMENT_OVERHEAD_BYTES
+        + len(element.content.encode("utf-8"))
+        + len(element.element_id)
+        + len(element.domain)
+        + sum(len(dependency) for dependency in element.dependencies)
+    )
+
+
+class ContextPreservationCache:
+    """LRU cache of preservation results under a byte budget.
+
+    Keys are built from the content of the transferred elements, so the same
+    context handed between the same domains hits regardless of when it is
+    sent. Values are the indices of the preserved elements, which are mapped
+    back onto the caller's elements on a hit. An entry's size is estimated
+    once, at insert time, from the elements its key retains.
+    """
+
+    def __init__(self, max_bytes: int = 4 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[Tuple, Tuple[Tuple[int, ...], int]]" = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(
+        context_elements: List[ContextElement],
+        from_domain: str,
+        to_domain: str,
+        strategy: str,
+        relationship_strength: float,
+        budget_bytes: int,
+    ) -> Tuple:
+        return (
+            from_domain,
+            to_domain,
+            strategy,
+            relationship_strength,
+            budget_bytes,
+            tuple(
+                (
+                    e.element_id,
+                    e.content,
+                    e.domain,
+                    e.importance,
+                    frozenset(e.dependencies),
+                )
+                for e in context_elements
+            ),
+        )
+
+    def get(self, key: Tuple) -> Optional[Tuple[int, ...]]:
+        """Get cached preserved indices, marking the entry recently used."""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def put(
+        self,
+        key: Tuple,
+        indices: Tuple[int, ...],
+        context_elements: List[ContextElement],
+    ):
+        """Insert an entry, evicting least recently used ones to fit."""
+        size = sum(estimate_element_bytes(e) for e in context_elements)
+        if size > self.max_bytes:
+            return
+
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            self.current_bytes -= previous[1]
+        while self.entries and self.current_bytes + size > self.max_bytes:
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+            self.evictions += 1
+        self.entries[key] = (indices, size)
+        self.current_bytes += size
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            "entries": len(self.entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
 
 
 class ContextPreservationManager:
-    """Manages context preservation across domain transitions."""
+    """Manages context preservation across domain transitions.
+
+    Results are memoized in a byte-budgeted LRU cache and the transfer
+    history is a bounded ring; per-(from, to, strategy) totals in
+    ``transfer_stats`` cover every transfer, not just the retained ones.
+
+    The transfer budget caps the content handed to the next agent. It can
+    be given in bytes, in tokens (``BYTES_PER_TOKEN`` each) or both, in
+    which case the smaller one applies.
+    """
 
-    def __init__(self, relationship_mapper: CrossDomainRelationshipMapper):
+    # Value multiplier for elements that belong to or mention the target domain
+    TARGET_DOMAIN_BOOST = 1.5
+
+    def __init__(
+        self,
+        relationship_mapper: CrossDomainRelationshipMapper,
+        cache_max_bytes: int = 4 * 1024 * 1024,
+        history_size: int = 1000,
+        transfer_budget_bytes: Optional[int] = None,
+        transfer_budget_tokens: Optional[int] = None,
+    ):
         self.relationship_mapper = relationship_mapper
+        budgets = [
+            budget
+            for budget in (
+                transfer_budget_bytes,
+                (
+                    transfer_budget_tokens * BYTES_PER_TOKEN
+                    if transfer_budget_tokens is not None
+                    else None
+                ),
+            )
+            if budget is not None
+        ]
+        self.transfer_budget_bytes = min(budgets) if budgets else 16 * 1024
         self.preservation_strategies = self._build_preservation_strategies()
-        self.context_cache: Dict[str, List[ContextElement]] = {}
-        self.transfer_history: List[Dict[str, Any]] = []
+        self.context_cache = ContextPreservationCache(cache_max_bytes)
+        self.transfer_history: deque = deque(maxlen=history_size)
+        self.transfer_stats: Dict[Tuple[str, str, str], Dict[str, float]] = {}
 
     def _build_preservation_strategies(self) -> Dict[str, callable]:
         """Build context preservation strategies."""
@@ -475,6 +816,7 @@ class ContextPreservationManager:
             ContextPreservationStrategy.SELECTIVE_TRANSFER.value: self._selective_transfer,
             ContextPreservationStrategy.HIERARCHICAL_TRANSFER.value: self._hierarchical_transfer,
             ContextPreservationStrategy.ADAPTIVE_TRANSFER.value: self._adaptive_transfer,
+            ContextPreservationStrategy.BUDGETED_TRANSFER.value: self._budgeted_transfer,
         }
 
     def preserve_context(
@@ -487,9 +829,28 @@ class ContextPreservationManager:
         """Preserve context across domain transition."""
         start_time = time.time()
 
-        # Select preservation strategy
-        strategy_func = self.preservation_strategies[strategy.value]
-        preserved_elements = strategy_func(context_elements, from_domain, to_domain)
+        # Strategies read the relationship strength, so it is part of the key
+        cache_key = self.context_cache.key(
+            context_elements,
+            from_domain,
+            to_domain,
+            strategy.value,
+            self.relationship_mapper.get_relationship_strength(from_domain, to_domain),
+            self.transfer_budget_bytes,
+        )
+        indices = self.context_cache.get(cache_key)
+        if indices is not None:
+            preserved_elements = [context_elements[i] for i in indices]
+        else:
+            # Select preservation strategy
+            strategy_func = self.preservation_strategies[strategy.value]
+            preserved_elements = strategy_func(context_elements, from_domain, to_domain)
+            positions = {id(e): i for i, e in enumerate(context_elements)}
+            self.context_cache.put(
+                cache_key,
+                tuple(positions[id(e)] for e in preserved_elements),
+                context_elements,
+            )
 
         # Calculate metrics
         metrics = self._calculate_preservation_metrics(
@@ -497,21 +858,55 @@ class ContextPreservationManager:
         )
 
         # Record transfer for learning
+        self._record_transfer(from_domain, to_domain, strategy.value, metrics)
+
+        return preserved_elements, metrics
+
+    def _record_transfer(
+        self,
+        from_domain: str,
+        to_domain: str,
+        strategy: str,
+        metrics: ContextPreservationMetrics,
+    ):
+        """Append to the history ring and fold into the aggregate stats."""
         self.transfer_history.append(
             {
                 "from_domain": from_domain,
                 "to_domain": to_domain,
-                "strategy": strategy.value,
+                "strategy": strategy,
                 "metrics": metrics,
                 "timestamp": datetime.now(),
             }
         )
 
-        # Cache preserved context
-        cache_key = f"{from_domain}_{to_domain}_{int(time.time())}"
-        self.context_cache[cache_key] = preserved_elements
-
-        return preserved_elements, metrics
+        stats = self.transfer_stats.get((from_domain, to_domain, strategy))
+        if stats is None:
+            stats = self.transfer_stats[(from_domain, to_domain, strategy)] = {
+                "transfers": 0,
+                "total_elements": 0,
+                "preserved_elements": 0,
+                "latency_ms_sum": 0.0,
+                "quality_sum": 0.0,
+            }
+        stats["transfers"] += 1
+        stats["total_elements"] += metrics.total_elements
+        stats["preserved_elements"] += metrics.preserved_elements
+        stats["latency_ms_sum"] += metrics.transfer_latency_ms
+        stats["quality_sum"] += self.get_preservation_quality_score(metrics)
+
+    def get_transfer_stats(self) -> Dict[Tuple[str, str, str], Dict[str, float]]:
+        """Get per-(from, to, strategy) transfer aggregates."""
+        return {
+            key: {
+                "transfers": stats["transfers"],
+                "preservation_ratio": stats["preserved_elements"]
+                / max(stats["total_elements"], 1),
+                "avg_latency_ms": stats["latency_ms_sum"] / stats["transfers"],
+                "avg_quality_score": stats["quality_sum"] / stats["transfers"],
+            }
+            for key, stats in self.transfer_stats.items()
+        }
 
     def _full_transfer(
         self, context_elements: List[ContextElement], from_domain: str, to_domain: str
@@ -585,11 +980,100 @@ class ContextPreservationManager:
 
         # Select strategy based on analysis
         if total_elements <= 5 or avg_importance >= 0.8:
-            return self._full_transfer(context_elements, from_domain, to_domain)
+            preserved = self._full_transfer(context_elements, from_domain, to_domain)
         elif relationship_strength >= 0.7 and domain_diversity <= 3:
-            return self._hierarchical_transfer(context_elements, from_domain, to_domain)
+            preserved = self._hierarchical_transfer(
+                context_elements, from_domain, to_domain
+            )
         else:
-            return self._selective_transfer(context_elements, from_domain, to_domain)
+            preserved = self._selective_transfer(
+                context_elements, from_domain, to_domain
+            )
+
+        # Fall back to value-per-byte selection when the pick is too large
+        if (
+            sum(element_transfer_bytes(e) for e in preserved)
+            > self.transfer_budget_bytes
+        ):
+            return self._budgeted_transfer(context_elements, from_domain, to_domain)
+        return preserved
+
+    def _budgeted_transfer(
+        self, context_elements: List[ContextElement], from_domain: str, to_domain: str
+    ) -> List[ContextElement]:
+        """Transfer the most valuable elements that fit the transfer budget.
+
+        A greedy 0/1 knapsack: each element is taken together with the
+        elements its ``dependencies`` name by ``element_id`` (transitively),
+        and the group with the best value per added byte is taken next. The
+        most valuable single group wins if it beats the greedy total, which
+        bounds the result at half the optimum or better.
+        """
+        budget = self.transfer_budget_bytes
+        sizes = [element_transfer_bytes(e) for e in context_elements]
+        values = [
+            e.importance
+            * (
+                self.TARGET_DOMAIN_BOOST
+                if e.domain == to_domain or to_domain in e.dependencies
+                else 1.0
+            )
+            for e in context_elements
+        ]
+        closures = self._dependency_closures(context_elements)
+
+        selected: Set[int] = set()
+        used = 0
+        while True:
+            best, best_ratio, best_cost = None, 0.0, 0
+            for index, closure in enumerate(closures):
+                if index in selected:
+                    continue
+                added = closure - selected
+                cost = sum(sizes[i] for i in added)
+                gain = sum(values[i] for i in added)
+                if gain <= 0.0 or used + cost > budget:
+                    continue
+                ratio = gain / cost if cost else float("inf")
+                if ratio > best_ratio:
+                    best, best_ratio, best_cost = added, ratio, cost
+            if best is None:
+                break
+            selected |= best
+            used += best_cost
+
+        single = max(
+            (c for c in closures if sum(sizes[i] for i in c) <= budget),
+            key=lambda c: sum(values[i] for i in c),
+            default=frozenset(),
+        )
+        if sum(values[i] for i in single) > sum(values[i] for i in selected):
+            selected = set(single)
+
+        return [e for i, e in enumerate(context_elements) if i in selected]
+
+    @staticmethod
+    def _dependency_closures(
+        context_elements: List[ContextElement],
+    ) -> List[frozenset]:
+        """Indices of each element and everything it depends on, transitively.
+
+        Dependencies that name no element in the context (e.g. domains) are
+        ignored.
+        """
+        positions = {e.element_id: i for i, e in enumerate(context_elements)}
+        closures = []
+        for index in range(len(context_elements)):
+            closure = {index}
+            stack = [index]
+            while stack:
+                for dependency in context_elements[stack.pop()].dependencies:
+                    position = positions.get(dependency)
+                    if position is not None and position not in closure:
+                        closure.add(position)
+                        stack.append(position)
+            closures.append(frozenset(closure))
+        return closures
 
     def _calculate_preservation_metrics(
         self,
@@ -615,6 +1099,10 @@ class ContextPreservationManager:
         # Calculate semantic coherence (simplified)
         semantic_coherence = min(1.0, preserved_count / max(total_elements * 0.7, 1))
 
+        # Calculate transfer size against a full transfer
+        original_bytes = sum(element_transfer_bytes(e) for e in original)
+        preserved_bytes = sum(element_transfer_bytes(e) for e in preserved)
+
         # Calculate transfer latency
         transfer_latency_ms = (time.time() - start_time) * 1000
 
@@ -626,6 +1114,8 @@ class ContextPreservationManager:
             domain_coverage=domain_coverage,
             semantic_coherence=semantic_coherence,
             transfer_latency_ms=transfer_latency_ms,
+            bytes_transferred=preserved_bytes,
+            bytes_saved=original_bytes - preserved_bytes,
         )
 
     def get_preservation_quality_score(
@@ -652,12 +1142,69 @@ class ContextPreservationManager:
         return min(score, 1.0)
 
 
+BASELINE_EMA_ALPHA = 0.1  # Learning rate for baseline moving averages
+
+
+def exponential_moving_average(
+    current: float, value: float, alpha: float = BASELINE_EMA_ALPHA
+) -> float:
+    """Blend ``value`` into ``current`` with weight ``alpha``."""
+    return (1 - alpha) * current + alpha * value
+
+
+class StreamingStat:
+    """Fixed-memory summary of a metric stream.
+
+    Keeps lifetime count, sum, min and max, an exponential moving average
+    and a ring of the most recent samples; memory does not grow with the
+    number of samples and ``summary`` is O(1).
+    """
+
+    def __init__(self, recent_size: int = 256):
+        self.recent: deque = deque(maxlen=recent_size)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+        self.ema: Optional[float] = None
+
+    def add(self, value: float):
+        self.recent.append(value)
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.ema = (
+            value if self.ema is None else exponential_moving_average(self.ema, value)
+        )
+
+    def summary(self) -> Dict[str, float]:
+        if not self.count:
+            return {}
+        return {
+            "avg": self.total / self.count,
+            "min": self.min,
+            "max": self.max,
+            "count": self.count,
+            "ema": self.ema,
+        }
+
+
 class DomainSpecificOptimizer:
-    """Optimizes coordination patterns for specific domains."""
+    """Optimizes coordination patterns for specific domains.
+
+    History per domain is a ring of compact records of recent
+    optimizations; ``optimization_stats`` streams their confidence.
+    """
+
+    HISTORY_SIZE = 100
 
     def __init__(self):
         self.domain_optimizations = self._build_domain_optimizations()
-        self.optimization_history: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self.optimization_history: Dict[str, deque] = defaultdict(
+            lambda: deque(maxlen=self.HISTORY_SIZE)
+        )
+        self.optimization_stats: Dict[str, StreamingStat] = defaultdict(StreamingStat)
         self.performance_baselines: Dict[str, Dict[str, float]] = {}
 
     def _build_domain_optimizations(self) -> Dict[str, Dict[str, Any]]:
@@ -755,14 +1302,17 @@ class DomainSpecificOptimizer:
             "analysis": request_analysis,
         }
 
-        # Record optimization for learning
+        # Record optimization for learning, without retaining the request
         self.optimization_history[domain].append(
             {
-                "request": coordination_request,
-                "result": optimization_result,
+                "request_length": len(coordination_request),
+                "optimal_agents": tuple(optimal_agents),
+                "coordination_strategy": coordination_strategy,
+                "confidence": confidence,
                 "timestamp": datetime.now(),
             }
         )
+        self.optimization_stats[domain].add(confidence)
 
         return optimization_result
 
@@ -925,13 +1475,12 @@ class DomainSpecificOptimizer:
             self.performance_baselines[domain] = metrics.copy()
         else:
             # Use exponential moving average for updates
-            alpha = 0.1  # Learning rate
             for metric, value in metrics.items():
                 if metric in self.performance_baselines[domain]:
                     current = self.performance_baselines[domain][metric]
                     self.performance_baselines[domain][metric] = (
-                        1 - alpha
-                    ) * current + alpha * value
+                        exponential_moving_average(current, value)
+                    )
                 else:
                     self.performance_baselines[domain][metric] = value
 
@@ -949,7 +1498,7 @@ class EnhancedMultiDomainContextReasoner:
         self._initialize_default_relationships()
 
         # Performance tracking
-        self.reasoning_metrics: Dict[str, List[float]] = defaultdict(list)
+        self.reasoning_metrics: Dict[str, StreamingStat] = defaultdict(StreamingStat)
 
     def _initialize_default_relationships(self):
         """Initialize default domain relationships."""
@@ -1028,7 +1577,7 @@ class EnhancedMultiDomainContextReasoner:
         )
 
         analysis_time = (time.time() - start_time) * 1000
-        self.reasoning_metrics["analysis_time_ms"].append(analysis_time)
+        self.reasoning_metrics["analysis_time_ms"].add(analysis_time)
 
         return {
             "query": query,
@@ -1060,6 +1609,13 @@ class EnhancedMultiDomainContextReasoner:
                 primary_domain, secondary_domain
             )
 
+            # Find the most reliable route for context transfer
+            strongest_path, path_strength = (
+                self.relationship_mapper.find_strongest_path(
+                    primary_domain, secondary_domain
+                )
+            )
+
             # Get related domains
             related = self.relationship_mapper.get_related_domains(secondary_domain)
 
@@ -1070,6 +1626,8 @@ class EnhancedMultiDomainContextReasoner:
                     "strength": strength,
                     "path": path,
                     "path_length": len(path) - 1 if len(path) > 1 else 0,
+                    "strongest_path": strongest_path,
+                    "path_strength": path_strength,
                     "related_domains": related[:3],  # Top 3 related domains
                 }
             )
@@ -1242,14 +1800,9 @@ class EnhancedMultiDomainContextReasoner:
     def get_reasoning_metrics(self) -> Dict[str, Dict[str, float]]:
         """Get performance metrics for reasoning system."""
         metrics = {}
-        for metric_name, values in self.reasoning_metrics.items():
-            if values:
-                metrics[metric_name] = {
-                    "avg": sum(values) / len(values),
-                    "min": min(values),
-                    "max": max(values),
-                    "count": len(values),
-                }
+        for metric_name, stat in self.reasoning_metrics.items():
+            if stat.count:
+                metrics[metric_name] = stat.summary()
         return metrics
 
 
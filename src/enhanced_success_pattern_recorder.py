@@ -10,6 +10,11 @@ import logging
 from typing import Dict, List, Optional
 from datetime import datetime
 
+try:
+    from .coordination_hub import CoordinationHubLog, get_hub_reader
+except ImportError:
+    from coordination_hub import CoordinationHubLog, get_hub_reader
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,6 +28,8 @@ class EnhancedSuccessPatternRecorder:
         else:
             self.coordination_hub_path = "/Users/ricardocarvalho/DeveloperFolder/DevMem/.claude/memory/coordination-hub.md"
         self.learning_section = "## 9. Agent Learning Pattern System"
+        self.hub_log = CoordinationHubLog(self.coordination_hub_path, "usage-patterns")
+        self.hub_reader = get_hub_reader()
 
     def record_successful_usage(
         self, query: str, selected_agent: str, success_metrics: Dict
@@ -167,43 +174,51 @@ class EnhancedSuccessPatternRecorder:
         return technical_keywords[:5]  # Limit to top 5 keywords
 
     def _update_learning_section(self, pattern_entry: Dict) -> bool:
-        """Update pattern entry in coordination-hub.md learning section."""
+        """Journal pattern entry for the coordination-hub.md learning section."""
         try:
-            # Read current coordination-hub.md content
             if not os.path.exists(self.coordination_hub_path):
                 logger.warning(
                     f"Coordination hub not found: {self.coordination_hub_path}"
                 )
                 return False
 
-            with open(self.coordination_hub_path, "r", encoding="utf-8") as f:
-                content = f.read()
+            if not self.hub_log.append(pattern_entry):
+                return False
 
-            # Create pattern line in existing format
-            pattern_key = f"{pattern_entry['pattern_key']}:{pattern_entry['agent']}"
-            keywords_str = ", ".join(pattern_entry["keywords"])
+            if self.hub_log.should_compact():
+                self.compact_hub()
+            return True
 
-            pattern_line = f"- **{pattern_key}**: {pattern_entry['agent']} (confidence: {pattern_entry['confidence']:.2f}, keywords: {keywords_str}, learned: {pattern_entry['learned_date']})"
+        except Exception as e:
+            logger.error(f"Failed to update learning section: {e}")
+            return False
 
-            # Find and update the appropriate section
-            updated_content = self._insert_pattern_in_section(
-                content, pattern_entry, pattern_line
-            )
+    def compact_hub(self) -> bool:
+        """Insert journaled pattern entries into the learning section."""
+        entries: List[Dict] = []
 
-            if updated_content != content:
-                # Write back to file
-                with open(self.coordination_hub_path, "w", encoding="utf-8") as f:
-                    f.write(updated_content)
-                logger.info(f"Successfully recorded pattern: {pattern_key}")
-                return True
-            else:
-                logger.warning("No changes made to coordination hub")
-                return False
+        def apply(records: List[Dict]):
+            entries[:] = records
 
-        except Exception as e:
-            logger.error(f"Failed to update learning section: {e}")
+        def render(content: str) -> str:
+            for entry in entries:
+                content = self._insert_pattern_in_section(
+                    content, entry, self._format_pattern_line(entry)
+                )
+            return content
+
+        if not self.hub_log.compact(render, apply=apply, include_applied=True):
             return False
 
+        logger.info(f"Recorded {len(entries)} patterns to coordination hub")
+        return True
+
+    def _format_pattern_line(self, pattern_entry: Dict) -> str:
+        """Format pattern entry as a coordination hub line."""
+        pattern_key = f"{pattern_entry['pattern_key']}:{pattern_entry['agent']}"
+        keywords_str = ", ".join(pattern_entry["keywords"])
+        return f"- **{pattern_key}**: {pattern_entry['agent']} (confidence: {pattern_entry['confidence']:.2f}, keywords: {keywords_str}, learned: {pattern_entry['learned_date']})"
+
     def _insert_pattern_in_section(
         self, content: str, pattern_entry: Dict, pattern_line: str
     ) -> str:
@@ -296,31 +311,22 @@ class EnhancedSuccessPatternRecorder:
             if not os.path.exists(self.coordination_hub_path):
                 return 0
 
-            with open(self.coordination_hub_path, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            # Count pattern entries (lines starting with "- **" in learning section)
-            learning_section_start = content.find(
-                "### High-Confidence Learned Patterns"
-            )
-            if learning_section_start == -1:
+            # Count pattern entries from the high-confidence section up to the
+            # next main section; the section index already counted them
+            pattern_count = 0
+            in_learning_section = False
+            for section in self.hub_reader.sections(self.coordination_hub_path):
+                if section["heading"] == "### High-Confidence Learned Patterns":
+                    in_learning_section = True
+                elif in_learning_section and section["level"] <= 2:
+                    break
+                if in_learning_section:
+                    pattern_count += section["pattern_count"]
+            if not in_learning_section:
                 return 0
 
-            # Extract learning section content
-            next_main_section = content.find("\n## ", learning_section_start)
-            learning_content = (
-                content[learning_section_start:next_main_section]
-                if next_main_section != -1
-                else content[learning_section_start:]
-            )
-
-            # Count pattern lines
-            pattern_lines = [
-                line
-                for line in learning_content.split("\n")
-                if line.strip().startswith("- **")
-            ]
-            return len(pattern_lines)
+            # Include entries journaled but not yet compacted into the markdown
+            return pattern_count + len(self.hub_log.pending_records())
 
         except Exception as e:
             logger.error(f"Failed to count recorded patterns: {e}")
@@ -332,8 +338,10 @@ class EnhancedSuccessPatternRecorder:
             if not os.path.exists(self.coordination_hub_path):
                 return False
 
-            with open(self.coordination_hub_path, "r", encoding="utf-8") as f:
-                content = f.read()
+            headings = [
+                section["heading"]
+                for section in self.hub_reader.sections(self.coordination_hub_path)
+            ]
 
             # Check for required sections
             required_sections = [
@@ -342,7 +350,7 @@ class EnhancedSuccessPatternRecorder:
             ]
 
             for section in required_sections:
-                if section not in content:
+                if not any(heading.startswith(section) for heading in headings):
                     logger.warning(f"Required section missing: {section}")
                     return False
 
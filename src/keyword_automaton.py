@@ -0,0 +1,62 @@
+"""Aho-Corasick keyword automaton for one-pass multi-keyword matching.
+
+Used wherever a text is checked against a fixed vocabulary of keywords with
+plain substring semantics, such as the semantic analyzer's vocabulary and the
+agent catalog's trigger keywords.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton reporting which keywords occur in a text.
+
+    Matches are plain substrings, overlaps included, found in one pass over
+    the text whatever the number of keywords. Failure links are folded into
+    the transition tables at build time, so each character costs one dict
+    lookup.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = frozenset(k for k in keywords if k)
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[Tuple[str, ...]] = [()]
+        for keyword in sorted(self.keywords):
+            state = 0
+            for char in keyword:
+                if char not in goto[state]:
+                    goto.append({})
+                    outputs.append(())
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            outputs[state] += (keyword,)
+
+        # Breadth-first, so a state's failure target is complete before it
+        fail = [0] * len(goto)
+        self.transitions: List[Dict[str, int]] = [dict(goto[0])] + [
+            {} for _ in goto[1:]
+        ]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            fallback = fail[state]
+            outputs[state] += outputs[fallback]
+            transitions = dict(self.transitions[fallback])
+            for char, target in goto[state].items():
+                fail[target] = self.transitions[fallback].get(char, 0)
+                transitions[char] = target
+                queue.append(target)
+            self.transitions[state] = transitions
+        self.outputs = outputs
+
+    def find(self, text: str) -> Set[str]:
+        """Keywords occurring anywhere in ``text``."""
+        transitions, outputs = self.transitions, self.outputs
+        found: Set[str] = set()
+        state = 0
+        for char in text:
+            state = transitions[state].get(char, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        return found
@@ -9,6 +9,11 @@ import logging
 from typing import Dict, List, Tuple, Optional, NamedTuple
 from dataclasses import dataclass
 
+try:
+    from .agent_catalog import get_agent_catalog
+except ImportError:
+    from agent_catalog import get_agent_catalog
+
 # Import learning components
 try:
     from .enhanced_pattern_learning_engine import EnhancedPatternLearningEngine
@@ -62,10 +67,17 @@ class AgentSelectionResult:
 class LearningEnhancedAgentSelector:
     """Agent selector with learning capabilities for improved accuracy."""
 
-    def __init__(self, coordination_hub_path: Optional[str] = None):
+    def __init__(
+        self,
+        coordination_hub_path: Optional[str] = None,
+        agents_dir: Optional[str] = None,
+    ):
         """Initialize learning-enhanced agent selector."""
         self.coordination_hub_path = coordination_hub_path
 
+        # One catalog of agent definitions shared by every component below
+        self.catalog = get_agent_catalog(agents_dir)
+
         # Initialize learning components with error handling
         self.learning_engine = None
         self.pattern_recorder = None
@@ -90,7 +102,7 @@ class LearningEnhancedAgentSelector:
         try:
             if EnhancedPatternLearningEngine:
                 self.learning_engine = EnhancedPatternLearningEngine(
-                    self.coordination_hub_path
+                    self.coordination_hub_path, catalog=self.catalog
                 )
                 logger.info(
                     f"Initialized learning engine with {len(self.learning_engine.agent_profiles)} agent profiles"
@@ -103,7 +115,9 @@ class LearningEnhancedAgentSelector:
                 logger.info("Initialized success pattern recorder")
 
             if AnthropicGuidelinesValidator:
-                self.guidelines_validator = AnthropicGuidelinesValidator()
+                self.guidelines_validator = AnthropicGuidelinesValidator(
+                    catalog=self.catalog
+                )
                 logger.info("Initialized Anthropic guidelines validator")
 
         except Exception as e:
@@ -114,7 +128,7 @@ class LearningEnhancedAgentSelector:
         """Initialize fallback agent selector."""
         if AGENT_SELECTOR_AVAILABLE:
             try:
-                self.fallback_selector = EnhancedAgentSelector()
+                self.fallback_selector = EnhancedAgentSelector(catalog=self.catalog)
                 logger.info("Initialized fallback agent selector")
             except Exception as e:
                 logger.warning(f"Failed to initialize fallback selector: {e}")
@@ -0,0 +1,395 @@
+"""SQLite storage backend for coordination and learning patterns.
+
+Keeps patterns in an indexed SQLite database next to coordination-hub.md so
+large pattern sets load lazily and are queried by pattern id, query type,
+agent or recency without scanning everything in Python. Writes are buffered
+and committed in batches; the markdown hub remains a rendered view.
+"""
+
+import json
+import os
+import sqlite3
+import logging
+import threading
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS coordination_patterns (
+    pattern_id TEXT PRIMARY KEY,
+    query_signature TEXT NOT NULL,
+    agent_sequence TEXT NOT NULL,
+    success_rate REAL NOT NULL,
+    last_used TEXT NOT NULL,
+    execution_time_ms REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_patterns_last_used
+    ON coordination_patterns (last_used);
+CREATE TABLE IF NOT EXISTS pattern_terms (
+    term TEXT NOT NULL,
+    pattern_id TEXT NOT NULL,
+    PRIMARY KEY (term, pattern_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_pattern_terms_pattern
+    ON pattern_terms (pattern_id);
+CREATE TABLE IF NOT EXISTS pattern_agents (
+    agent TEXT NOT NULL,
+    pattern_id TEXT NOT NULL,
+    PRIMARY KEY (agent, pattern_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_pattern_agents_pattern
+    ON pattern_agents (pattern_id);
+CREATE TABLE IF NOT EXISTS learning_successes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    query_type TEXT NOT NULL,
+    pattern TEXT NOT NULL,
+    agent TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    query_keywords TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    user_feedback INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_successes_query_type
+    ON learning_successes (query_type);
+CREATE INDEX IF NOT EXISTS idx_successes_agent
+    ON learning_successes (agent);
+CREATE INDEX IF NOT EXISTS idx_successes_timestamp
+    ON learning_successes (timestamp);
+"""
+
+_PATTERN_COLUMNS = (
+    "pattern_id, query_signature, agent_sequence, success_rate, "
+    "last_used, execution_time_ms"
+)
+_UPSERT_PATTERN = (
+    f"INSERT OR REPLACE INTO coordination_patterns ({_PATTERN_COLUMNS}) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+_SELECT_PATTERN = (
+    f"SELECT {_PATTERN_COLUMNS} FROM coordination_patterns WHERE pattern_id = ?"
+)
+_SELECT_ALL_PATTERNS = f"SELECT {_PATTERN_COLUMNS} FROM coordination_patterns"
+_SELECT_PATTERN_IDS = "SELECT pattern_id FROM coordination_patterns"
+_COUNT_PATTERNS = "SELECT COUNT(*) FROM coordination_patterns"
+_DELETE_PATTERN = "DELETE FROM coordination_patterns WHERE pattern_id = ?"
+_DELETE_TERMS = "DELETE FROM pattern_terms WHERE pattern_id = ?"
+_INSERT_TERM = "INSERT OR IGNORE INTO pattern_terms (term, pattern_id) VALUES (?, ?)"
+_DELETE_AGENTS = "DELETE FROM pattern_agents WHERE pattern_id = ?"
+_INSERT_AGENT = "INSERT OR IGNORE INTO pattern_agents (agent, pattern_id) VALUES (?, ?)"
+_SELECT_BY_TERM_PREFIX = (
+    f"SELECT DISTINCT {', '.join('p.' + c for c in _PATTERN_COLUMNS.split(', '))} "
+    "FROM pattern_terms t JOIN coordination_patterns p USING (pattern_id) "
+    "WHERE t.term >= ? AND t.term < ?"
+)
+_SELECT_BY_AGENT = (
+    f"SELECT {', '.join('p.' + c for c in _PATTERN_COLUMNS.split(', '))} "
+    "FROM pattern_agents a JOIN coordination_patterns p USING (pattern_id) "
+    "WHERE a.agent = ?"
+)
+_SELECT_RECENT = (
+    f"SELECT {_PATTERN_COLUMNS} FROM coordination_patterns "
+    "ORDER BY last_used DESC LIMIT ?"
+)
+_INSERT_SUCCESS = (
+    "INSERT INTO learning_successes (query_type, pattern, agent, confidence, "
+    "query_keywords, timestamp, user_feedback) VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+_SELECT_SUCCESSES = (
+    "SELECT query_type, pattern, agent, confidence, query_keywords, timestamp, "
+    "user_feedback FROM learning_successes"
+)
+_COUNT_SUCCESSES = "SELECT COUNT(*) FROM learning_successes"
+
+
+def default_db_path(hub_path: str) -> str:
+    """Database path stored next to the coordination hub markdown."""
+    base, _ = os.path.splitext(str(hub_path))
+    return f"{base}.sqlite3"
+
+
+def _signature_terms(query_signature: str) -> List[str]:
+    """Split a query signature into lower-case index terms."""
+    terms = set()
+    for raw in query_signature.lower().replace("+", " ").split():
+        terms.add(raw)
+        terms.update(part for part in raw.replace("-", "_").split("_") if part)
+    return sorted(terms)
+
+
+def _feedback_to_sql(user_feedback: Optional[bool]) -> Optional[int]:
+    return None if user_feedback is None else int(bool(user_feedback))
+
+
+class SQLitePatternBackend:
+    """Indexed SQLite tables for coordination patterns and learning successes."""
+
+    def __init__(self, db_path: str, timeout_seconds: float = 5.0):
+        """Open (and create if needed) the pattern database at ``db_path``."""
+        self.db_path = str(db_path)
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        self.connection = sqlite3.connect(
+            self.db_path,
+            timeout=timeout_seconds,
+            check_same_thread=False,
+            cached_statements=64,
+        )
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(_SCHEMA)
+        self.connection.commit()
+
+    def upsert_patterns(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Insert or replace pattern records in a single transaction."""
+        rows, terms, agents, pattern_ids = [], [], [], []
+        for record in records:
+            pattern_id = record["pattern_id"]
+            pattern_ids.append((pattern_id,))
+            rows.append(
+                (
+                    pattern_id,
+                    record.get("query_signature", ""),
+                    json.dumps(list(record["agent_sequence"])),
+                    float(record["success_rate"]),
+                    record["last_used"],
+                    float(record["execution_time_ms"]),
+                )
+            )
+            terms.extend(
+                (term, pattern_id)
+                for term in _signature_terms(record.get("query_signature", ""))
+            )
+            agents.extend(
+                (agent, pattern_id) for agent in set(record["agent_sequence"])
+            )
+
+        if not rows:
+            return 0
+
+        with self.connection:
+            self.connection.executemany(_DELETE_TERMS, pattern_ids)
+            self.connection.executemany(_DELETE_AGENTS, pattern_ids)
+            self.connection.executemany(_UPSERT_PATTERN, rows)
+            self.connection.executemany(_INSERT_TERM, terms)
+            self.connection.executemany(_INSERT_AGENT, agents)
+        return len(rows)
+
+    def delete_pattern(self, pattern_id: str):
+        """Remove a pattern and its index entries."""
+        with self.connection:
+            self.connection.execute(_DELETE_TERMS, (pattern_id,))
+            self.connection.execute(_DELETE_AGENTS, (pattern_id,))
+            self.connection.execute(_DELETE_PATTERN, (pattern_id,))
+
+    def get_pattern(self, pattern_id: str) -> Optional[Dict[str, Any]]:
+        """Look up one pattern record by id."""
+        row = self.connection.execute(_SELECT_PATTERN, (pattern_id,)).fetchone()
+        return self._row_to_record(row) if row else None
+
+    def count_patterns(self) -> int:
+        """Count stored patterns."""
+        return self.connection.execute(_COUNT_PATTERNS).fetchone()[0]
+
+    def iter_pattern_ids(self) -> Iterator[str]:
+        """Iterate over stored pattern ids."""
+        for (pattern_id,) in self.connection.execute(_SELECT_PATTERN_IDS):
+            yield pattern_id
+
+    def iter_patterns(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over all stored pattern records."""
+        for row in self.connection.execute(_SELECT_ALL_PATTERNS):
+            yield self._row_to_record(row)
+
+    def find_by_query_type(self, query_type: str) -> List[Dict[str, Any]]:
+        """Find patterns whose signature contains ``query_type``.
+
+        Candidates come from an index range scan over signature terms (and
+        their ``_``/``-`` parts) that start with the first term of
+        ``query_type``, then are checked with ``query_type in query_signature``.
+        Unlike a full scan, matches starting mid-word are not found.
+        """
+        terms = _signature_terms(query_type)
+        if not terms:
+            return []
+        first_term = query_type.lower().replace("+", " ").split()[0]
+        rows = self.connection.execute(
+            _SELECT_BY_TERM_PREFIX, (first_term, first_term + "\U0010ffff")
+        )
+        return [
+            record
+            for record in map(self._row_to_record, rows)
+            if query_type in record["query_signature"]
+        ]
+
+    def find_by_agent(self, agent: str) -> List[Dict[str, Any]]:
+        """Find patterns whose agent sequence includes ``agent``."""
+        rows = self.connection.execute(_SELECT_BY_AGENT, (agent,))
+        return [self._row_to_record(row) for row in rows]
+
+    def recent_patterns(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Get the most recently used patterns."""
+        rows = self.connection.execute(_SELECT_RECENT, (limit,))
+        return [self._row_to_record(row) for row in rows]
+
+    def insert_successes(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Insert learning success records in a single transaction."""
+        rows = [
+            (
+                record["query_type"],
+                record["pattern"],
+                record["agent"],
+                float(record["confidence"]),
+                json.dumps(list(record.get("query_keywords", []))),
+                float(record["timestamp"]),
+                _feedback_to_sql(record.get("user_feedback")),
+            )
+            for record in records
+        ]
+        if rows:
+            with self.connection:
+                self.connection.executemany(_INSERT_SUCCESS, rows)
+        return len(rows)
+
+    def iter_successes(self, query_type: Optional[str] = None) -> Iterator[Dict]:
+        """Iterate over learning success records, optionally for one query type."""
+        if query_type is None:
+            rows = self.connection.execute(_SELECT_SUCCESSES + " ORDER BY id")
+        else:
+            rows = self.connection.execute(
+                _SELECT_SUCCESSES + " WHERE query_type = ? ORDER BY id", (query_type,)
+            )
+        for row in rows:
+            yield {
+                "query_type": row[0],
+                "pattern": row[1],
+                "agent": row[2],
+                "confidence": row[3],
+                "query_keywords": json.loads(row[4]),
+                "timestamp": row[5],
+                "user_feedback": None if row[6] is None else bool(row[6]),
+            }
+
+    def count_successes(self) -> int:
+        """Count stored learning success records."""
+        return self.connection.execute(_COUNT_SUCCESSES).fetchone()[0]
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+    @staticmethod
+    def _row_to_record(row) -> Dict[str, Any]:
+        return {
+            "pattern_id": row[0],
+            "query_signature": row[1],
+            "agent_sequence": json.loads(row[2]),
+            "success_rate": row[3],
+            "last_used": row[4],
+            "execution_time_ms": row[5],
+        }
+
+
+class SQLitePatternMap(MutableMapping):
+    """Dict-like view of the coordination pattern table with batched writes.
+
+    Stands in for ``PatternStore.patterns`` so existing callers keep working
+    while lookups hit the primary-key index and nothing is loaded up front.
+    Access is serialized so a background flusher can share the connection.
+    """
+
+    def __init__(
+        self,
+        backend: SQLitePatternBackend,
+        to_record: Callable[[Any], Dict[str, Any]],
+        from_record: Callable[[Dict[str, Any]], Any],
+        batch_size: int = 256,
+    ):
+        """Wrap ``backend`` using the given pattern (de)serializers."""
+        self.backend = backend
+        self._to_record = to_record
+        self._from_record = from_record
+        self.batch_size = batch_size
+        self._pending: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def flush(self) -> int:
+        """Commit buffered writes in one transaction."""
+        with self._lock:
+            if not self._pending:
+                return 0
+            written = self.backend.upsert_patterns(
+                self._to_record(pattern) for pattern in self._pending.values()
+            )
+            self._pending.clear()
+            return written
+
+    def find_by_query_type(self, query_type: str) -> List[Any]:
+        """Indexed equivalent of filtering on ``query_type in query_signature``."""
+        with self._lock:
+            self.flush()
+            return [
+                self._from_record(r)
+                for r in self.backend.find_by_query_type(query_type)
+            ]
+
+    def find_by_agent(self, agent: str) -> List[Any]:
+        """Patterns whose agent sequence includes ``agent``."""
+        with self._lock:
+            self.flush()
+            return [self._from_record(r) for r in self.backend.find_by_agent(agent)]
+
+    def recent(self, limit: int = 10) -> List[Any]:
+        """Most recently used patterns."""
+        with self._lock:
+            self.flush()
+            return [self._from_record(r) for r in self.backend.recent_patterns(limit)]
+
+    def __getitem__(self, pattern_id: str):
+        with self._lock:
+            if pattern_id in self._pending:
+                return self._pending[pattern_id]
+            record = self.backend.get_pattern(pattern_id)
+            if record is None:
+                raise KeyError(pattern_id)
+            return self._from_record(record)
+
+    def __setitem__(self, pattern_id: str, pattern):
+        with self._lock:
+            self._pending[pattern_id] = pattern
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def __delitem__(self, pattern_id: str):
+        with self._lock:
+            was_pending = self._pending.pop(pattern_id, None) is not None
+            if self.backend.get_pattern(pattern_id) is not None:
+                self.backend.delete_pattern(pattern_id)
+            elif not was_pending:
+                raise KeyError(pattern_id)
+
+    def __contains__(self, pattern_id) -> bool:
+        with self._lock:
+            return (
+                pattern_id in self._pending
+                or self.backend.get_pattern(pattern_id) is not None
+            )
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            self.flush()
+            return iter(list(self.backend.iter_pattern_ids()))
+
+    def __len__(self) -> int:
+        with self._lock:
+            self.flush()
+            return self.backend.count_patterns()
+
+    def values(self):
+        with self._lock:
+            self.flush()
+            return [self._from_record(r) for r in self.backend.iter_patterns()]
+
+    def items(self):
+        with self._lock:
+            return [(pattern.pattern_id, pattern) for pattern in self.values()]
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared agent catalog.
+
+Covers parsing and indexing of agent definitions, immutability of the
+published views, per-directory sharing and the consumers built on it.
+"""
+
+import dataclasses
+import pytest
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from agent_catalog import AgentCatalog, get_agent_catalog  # noqa: E402
+from agent_selector import EnhancedAgentSelector  # noqa: E402
+from anthropic_guidelines_validator import AnthropicGuidelinesValidator  # noqa: E402
+from enhanced_pattern_learning_engine import EnhancedPatternLearningEngine  # noqa: E402
+
+TEST_SPECIALIST = """---
+name: test-specialist
+description: Use PROACTIVELY for "test failures" and "broken mocks" in pytest suites.
+---
+
+## Core Capabilities
+
+**Core Focus**: pytest fixtures, async testing and coverage.
+"""
+
+INFRASTRUCTURE_ENGINEER = """---
+name: infrastructure-engineer
+description: Docker and kubernetes deployment and container orchestration.
+---
+
+## Container Orchestration
+"""
+
+
+@pytest.fixture
+def agents_dir(tmp_path):
+    """Directory with two agent definitions and one non-agent file."""
+    directory = tmp_path / "agents"
+    directory.mkdir()
+    (directory / "test-specialist.md").write_text(TEST_SPECIALIST)
+    (directory / "infrastructure-engineer.md").write_text(INFRASTRUCTURE_ENGINEER)
+    (directory / "notes.txt").write_text("not an agent")
+    return directory
+
+
+class TestAgentCatalog:
+    """Test loading and indexing of agent definitions."""
+
+    def test_parses_profiles(self, agents_dir):
+        """Every .md file becomes a profile with learning and selection fields."""
+        catalog = AgentCatalog(str(agents_dir))
+        assert set(catalog.profiles) == {"test-specialist", "infrastructure-engineer"}
+
+        profile = catalog.get_profile("test-specialist")
+        assert {"pytest", "failures", "mocks"} <= set(profile.keywords)
+        assert "Core Capabilities" in profile.capabilities
+        assert profile.frontmatter_description.startswith("Use PROACTIVELY")
+        assert any(p.startswith("Use PROACTIVELY") for p in profile.trigger_patterns)
+        assert "coverage" in profile.selection_keywords
+        assert "validate" in profile.intent_indicators
+        assert catalog.stats["files_parsed"] == 2
+
+    def test_indexes_are_consistent(self, agents_dir):
+        """Keyword sets and postings describe the same keyword/agent pairs."""
+        catalog = AgentCatalog(str(agents_dir))
+        pairs = {
+            (keyword, name)
+            for name, keywords in catalog.keyword_sets.items()
+            for keyword in keywords
+        }
+        postings = {
+            (keyword, name)
+            for keyword, names in catalog.keyword_index.items()
+            for name in names
+        }
+        assert pairs == postings
+        assert catalog.keyword_index["docker"] == {"infrastructure-engineer"}
+        assert catalog.description_index["and"] == set(catalog.profiles)
+        assert catalog.snapshot.keyword_automaton.find("dockerized pytest") == {
+            "docker",
+            "pytest",
+            "test",
+        }
+
+    def test_views_are_immutable(self, agents_dir):
+        """Profiles are frozen and the published mappings are read-only."""
+        catalog = AgentCatalog(str(agents_dir))
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            catalog.get_profile("test-specialist").description = "changed"
+        with pytest.raises(TypeError):
+            catalog.profiles["other"] = None
+        with pytest.raises(TypeError):
+            catalog.keyword_index["docker"] = frozenset()
+
+    def test_missing_directory_is_empty(self, tmp_path):
+        """A missing directory yields an empty catalog."""
+        catalog = AgentCatalog(str(tmp_path / "missing"))
+        assert len(catalog.profiles) == 0
+        assert len(catalog.keyword_index) == 0
+
+    def test_reload_publishes_new_snapshot(self, agents_dir):
+        """Reloading picks up new files without changing held snapshots."""
+        catalog = AgentCatalog(str(agents_dir))
+        before = catalog.snapshot
+        (agents_dir / "security-enforcer.md").write_text("security audit")
+
+        catalog.reload()
+        assert "security-enforcer" in catalog.profiles
+        assert "security-enforcer" not in before.profiles
+
+    def test_catalog_is_shared_per_directory(self, agents_dir, tmp_path):
+        """The same directory always maps to the same catalog."""
+        catalog = get_agent_catalog(str(agents_dir))
+        assert get_agent_catalog(str(agents_dir) + os.sep) is catalog
+        assert get_agent_catalog(str(tmp_path / "other")) is not catalog
+
+
+class TestCatalogConsumers:
+    """Test that the selection stack reads the shared catalog."""
+
+    def test_consumers_share_one_parse(self, agents_dir, tmp_path):
+        """Engine, selector and validator are built from one load."""
+        catalog = AgentCatalog(str(agents_dir))
+        engine = EnhancedPatternLearningEngine(
+            str(tmp_path / "hub.md"), catalog=catalog
+        )
+        selector = EnhancedAgentSelector(catalog=catalog)
+        validator = AnthropicGuidelinesValidator(catalog=catalog)
+
+        assert catalog.stats["loads"] == 1
+        assert engine.agent_profiles is catalog.profiles
+        assert engine.agents_directory == selector.agents_dir == catalog.agents_dir
+        assert selector.agents["test-specialist"].primary_keywords == list(
+            catalog.get_profile("test-specialist").selection_keywords
+        )
+        assert validator.agent_capabilities["test-specialist"] >= (
+            catalog.keyword_sets["test-specialist"]
+        )
+
+    def test_validator_keeps_defaults_for_unknown_agents(self, agents_dir):
+        """Agents without a definition keep their built-in capability keywords."""
+        validator = AnthropicGuidelinesValidator(catalog=AgentCatalog(str(agents_dir)))
+        assert "root" in validator.agent_capabilities["digdeep"]
+
+    def test_validator_merges_curated_keywords(self, agents_dir):
+        """Defined agents keep their curated keywords alongside parsed ones."""
+        (agents_dir / "digdeep.md").write_text("Deep reasoning and analysis.")
+        catalog = AgentCatalog(str(agents_dir))
+        validator = AnthropicGuidelinesValidator(catalog=catalog)
+
+        capabilities = validator.agent_capabilities["digdeep"]
+        assert {"root", "cause", "investigation"} <= capabilities
+        assert catalog.keyword_sets["digdeep"] <= capabilities
+        assert (
+            "infrastructure" in validator.agent_capabilities["infrastructure-engineer"]
+        )
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
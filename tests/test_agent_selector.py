@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Tests for the enhanced agent selector pattern tracking.
+
+Covers the similar-context index behind PatternSuccessTracker and its use
+as a selection prior.
+"""
+
+import pytest
+import sys
+import os
+import time
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from agent_selector import (  # noqa: E402
+    ContextSimilarityIndex,
+    EnhancedAgentSelector,
+    PatternSuccessMetrics,
+    PatternSuccessTracker,
+)
+
+
+def _metrics(accuracy: float) -> PatternSuccessMetrics:
+    return PatternSuccessMetrics(
+        accuracy=accuracy,
+        response_time=10.0,
+        context_preservation=1.0,
+        coordination_success=1.0,
+        confidence=0.8,
+        timestamp=time.time(),
+    )
+
+
+class TestContextSimilarityIndex:
+    """Test MinHash/LSH similar-context lookups."""
+
+    def test_identical_queries_have_full_similarity(self):
+        """Identical token sets produce identical signatures."""
+        index = ContextSimilarityIndex()
+        tokens = index.tokenize("docker container networking issues")
+        signature = index.signature(tokens)
+        assert index.estimate_similarity(signature, signature) == 1.0
+
+    def test_query_returns_only_similar_entries(self):
+        """Unrelated queries do not surface as similar contexts."""
+        index = ContextSimilarityIndex()
+        index.add("docker container networking issues", "infra", "p1", 1.0, 0.0)
+        index.add("write readme documentation guide", "docs", "p2", 1.0, 0.0)
+
+        results = index.query("docker container networking problems")
+        agents = {entry[1] for entry in results}
+        assert agents == {"infra"}
+
+    def test_capacity_evicts_oldest_entries(self):
+        """Past capacity the oldest entries leave the index and its buckets."""
+        index = ContextSimilarityIndex(capacity=2)
+        index.add("docker container networking issues", "infra", "p1", 1.0, 0.0)
+        index.add("write readme documentation guide", "docs", "p2", 1.0, 0.0)
+        index.add("pytest fixture mocking failures", "tester", "p3", 1.0, 0.0)
+
+        assert len(index.entries) == 2
+        assert index.query("docker container networking issues") == []
+        live = {entry_id for bucket in index.buckets.values() for entry_id in bucket}
+        assert live == set(index.entries)
+
+    def test_empty_query_has_no_signature(self):
+        """Queries without significant tokens are not indexed."""
+        index = ContextSimilarityIndex()
+        assert index.add("a an", "infra", "p1", 1.0, 0.0) == ()
+        assert index.query("of to") == []
+
+
+class TestPatternSuccessTrackerRecommendations:
+    """Test contextual recommendations fed by tracked successes."""
+
+    def test_recommendations_from_similar_contexts(self):
+        """Successful agents on similar queries are recommended."""
+        tracker = PatternSuccessTracker()
+        tracker.track_success(
+            "p-infra", "docker container networking issues", "infra", _metrics(1.0)
+        )
+        tracker.track_success(
+            "p-test", "pytest fixture mocking failures", "tester", _metrics(1.0)
+        )
+
+        recommendations = tracker.get_contextual_recommendations(
+            "docker container networking timeout"
+        )
+        assert recommendations
+        assert recommendations[0][0] == "infra"
+        assert 0.0 < recommendations[0][2] <= 1.0
+
+    def test_failed_contexts_score_zero(self):
+        """Failures on similar queries contribute no prior."""
+        tracker = PatternSuccessTracker()
+        tracker.track_success(
+            "p-infra", "docker container networking issues", "infra", _metrics(0.0)
+        )
+        prior = tracker.get_contextual_agent_prior("docker container networking")
+        assert prior.get("infra", 0.0) == 0.0
+
+    def test_weight_update_can_be_skipped(self):
+        """Callers that own the weight update leave it untouched."""
+        tracker = PatternSuccessTracker()
+        for _ in range(3):
+            tracker.track_success(
+                "p-infra", "docker networking", "infra", _metrics(1.0), False
+            )
+        assert tracker.get_pattern_weight("p-infra") == 1.0
+
+        tracker.track_success("p-infra", "docker networking", "infra", _metrics(1.0))
+        assert tracker.get_pattern_weight("p-infra") == pytest.approx(1.1)
+
+
+class TestContextualSelectionPrior:
+    """Test that past outcomes steer agent selection."""
+
+    QUERY = "quarterly widget reconciliation pipeline stalls overnight"
+
+    def test_past_success_changes_fallback_selection(self):
+        """A success on a similar query overrides the general fallback."""
+        selector = EnhancedAgentSelector()
+        before = selector.select_agent(self.QUERY)
+        assert before.agent_name != "documentation-enhancer"
+        assert "contextual_prior" not in before.matched_patterns
+
+        selector.record_feedback(
+            "widget reconciliation pipeline stalls overnight",
+            "documentation-enhancer",
+            0.8,
+            user_feedback=True,
+        )
+        after = selector.select_agent(self.QUERY)
+        assert after.agent_name == "documentation-enhancer"
+        assert "contextual_prior" in after.matched_patterns
+
+    def test_failed_prior_is_not_tagged(self):
+        """A similar failure adds no score and no contextual_prior tag."""
+        selector = EnhancedAgentSelector()
+        selector.record_feedback(
+            self.QUERY, "documentation-enhancer", 0.8, user_feedback=False
+        )
+        result = selector.select_agent(self.QUERY)
+        assert "contextual_prior" not in result.matched_patterns
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared coordination hub I/O layer.
+
+Covers the append-only hub log and its markdown compaction.
+"""
+
+import pytest
+import sys
+import os
+import time
+import threading
+import multiprocessing
+from datetime import datetime
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import coordination_hub  # noqa: E402
+from coordination_hub import (  # noqa: E402
+    CoordinationHubLog,
+    HubReader,
+    HubSectionIndex,
+    build_section_index,
+    get_hub_io_stats,
+    get_hub_reader,
+    update_hub,
+)
+from enhanced_cross_domain_coordinator import (  # noqa: E402
+    CoordinationPattern,
+    MemoryArchitecture,
+    PatternLearningEngine,
+    PatternStore,
+)
+
+
+@pytest.fixture
+def hub_path(tmp_path):
+    """Path to a coordination hub inside a temporary memory directory."""
+    return str(tmp_path / ".claude" / "memory" / "coordination-hub.md")
+
+
+def _hub_update_worker(hub_path: str, worker_id: int, updates: int) -> dict:
+    """Append marker lines to the hub through optimistic updates."""
+    for i in range(updates):
+        update_hub(hub_path, lambda content: content + f"w{worker_id}-{i}\n")
+    return get_hub_io_stats()
+
+
+def _hub_log_worker(hub_path: str, worker_id: int, updates: int) -> dict:
+    """Journal records and compact them into the hub as they accumulate."""
+    log = CoordinationHubLog(hub_path, "stress", compact_every=7)
+    compacted = []
+
+    def apply(records):
+        compacted[:] = records
+
+    def render(content):
+        return content + "".join(f"{r['marker']}\n" for r in compacted)
+
+    for i in range(updates):
+        log.append({"marker": f"w{worker_id}-{i}"})
+        if log.should_compact():
+            log.compact(render, apply=apply, include_applied=True)
+
+    while log.pending_records():
+        if not log.compact(render, apply=apply, include_applied=True):
+            time.sleep(0.01)
+    return get_hub_io_stats()
+
+
+def _run_workers(target, hub_path: str, workers: int, updates: int) -> list:
+    context = multiprocessing.get_context("fork")
+    with context.Pool(workers) as pool:
+        return pool.starmap(
+            target, [(hub_path, worker_id, updates) for worker_id in range(workers)]
+        )
+
+
+def _pattern(pattern_id: str) -> CoordinationPattern:
+    return CoordinationPattern(
+        pattern_id=pattern_id,
+        query_signature="security auth review",
+        agent_sequence=["security-enforcer", "test-specialist"],
+        success_rate=0.8,
+        last_used=datetime.now(),
+        execution_time_ms=12.0,
+    )
+
+
+class TestCoordinationHubLog:
+    """Test the append-only journal."""
+
+    def test_append_does_not_touch_markdown(self, hub_path):
+        """Appending only writes the JSONL journal."""
+        log = CoordinationHubLog(hub_path, "patterns")
+        assert log.append({"value": 1})
+        assert os.path.exists(log.log_path)
+        assert not os.path.exists(hub_path)
+
+    def test_replay_skips_own_records(self, hub_path):
+        """Records appended by this instance are already applied."""
+        writer = CoordinationHubLog(hub_path, "patterns")
+        writer.append({"value": 1})
+
+        reader = CoordinationHubLog(hub_path, "patterns")
+        assert [r["value"] for r in reader.replay()] == [1]
+        assert writer.replay() == []
+        assert reader.replay() == []
+
+    def test_reading_missing_journal_creates_nothing(
+        self, hub_path, tmp_path, monkeypatch
+    ):
+        """Loading from a hub that was never written leaves the disk untouched."""
+        monkeypatch.chdir(tmp_path)
+        log = CoordinationHubLog(hub_path, "patterns")
+        assert log.replay() == []
+        assert log.pending_records() == []
+        PatternStore(hub_path)
+        PatternLearningEngine(hub_path)
+        assert MemoryArchitecture().load_patterns() == {}
+        assert list(tmp_path.iterdir()) == []
+
+    def test_compaction_renders_and_truncates(self, hub_path):
+        """Compaction folds records into the hub and clears the journal."""
+        writer = CoordinationHubLog(hub_path, "patterns")
+        writer.append({"value": 1})
+        other = CoordinationHubLog(hub_path, "patterns")
+        other.append({"value": 2})
+
+        seen = []
+
+        def render(content):
+            return content + "## Section\n"
+
+        assert writer.compact(render, apply=seen.extend)
+        assert [r["value"] for r in seen] == [2]
+        assert not os.path.exists(writer.log_path)
+        with open(hub_path, encoding="utf-8") as f:
+            assert f.read() == "## Section\n"
+
+    def test_failed_render_restores_journal(self, hub_path):
+        """A failing render leaves the journal intact."""
+        log = CoordinationHubLog(hub_path, "patterns")
+        log.append({"value": 1})
+
+        def render(content):
+            raise RuntimeError("boom")
+
+        assert not log.compact(render)
+        assert len(CoordinationHubLog(hub_path, "patterns").replay()) == 1
+
+    def test_should_compact_on_record_count(self, hub_path):
+        """Compaction is scheduled after enough appends."""
+        log = CoordinationHubLog(hub_path, "patterns", compact_every=2)
+        log.append({"value": 1})
+        assert not log.should_compact()
+        log.append({"value": 2})
+        assert log.should_compact()
+
+
+SAMPLE_HUB = """# Coordination Hub
+
+## Infrastructure Learning Patterns
+- **p1**: a (confidence: 0.80)
+
+### Successful Infrastructure Coordination Patterns
+- **p2**: b (confidence: 0.70)
+  - **p3**: c (confidence: 0.60)
+
+## Other Section
+- **x**: y
+"""
+
+
+class TestHubSectionIndex:
+    """Test the section-offset sidecar index."""
+
+    def test_sections_nest_and_count_pattern_lines(self):
+        """Level-2 sections span their subsections; counts are per heading."""
+        sections = build_section_index(SAMPLE_HUB.encode("utf-8"))
+        headings = [(s["heading"], s["level"], s["pattern_count"]) for s in sections]
+        assert headings == [
+            ("## Infrastructure Learning Patterns", 2, 1),
+            ("### Successful Infrastructure Coordination Patterns", 3, 2),
+            ("## Other Section", 2, 1),
+        ]
+        assert sections[0]["end"] == sections[2]["start"]
+        assert sections[1]["end"] == sections[2]["start"]
+
+    def test_read_section_returns_only_that_section(self, hub_path):
+        """Reading a section decodes just its byte range."""
+        update_hub(hub_path, lambda content: SAMPLE_HUB)
+        index = HubSectionIndex(hub_path)
+
+        section = index.read_section("## Infrastructure Learning Patterns")
+        assert section.startswith("## Infrastructure Learning Patterns")
+        assert "**p3**" in section
+        assert "Other Section" not in section
+        assert index.read_section("## Infra", prefix=True) == section
+        assert index.read_section("## Missing") == ""
+
+    def test_index_written_by_update_is_reused(self, hub_path):
+        """A reader picks up the sidecar written alongside the hub."""
+        update_hub(hub_path, lambda content: SAMPLE_HUB)
+        assert os.path.exists(HubSectionIndex(hub_path).index_path)
+
+        rebuilds = get_hub_io_stats()["section_index_rebuilds"]
+        HubSectionIndex(hub_path).sections()
+        assert get_hub_io_stats()["section_index_rebuilds"] == rebuilds
+
+    def test_stale_index_is_rebuilt(self, hub_path):
+        """Writes that bypass update_hub invalidate the index by stamp."""
+        update_hub(hub_path, lambda content: SAMPLE_HUB)
+        with open(hub_path, "w", encoding="utf-8") as f:
+            f.write("## Fresh Section\n- **z**: w\n")
+
+        index = HubSectionIndex(hub_path)
+        assert index.find("## Fresh Section")["pattern_count"] == 1
+        assert index.find("## Other Section") is None
+
+
+def _section_lines(content):
+    return [line for line in content.splitlines() if line.startswith("- **")]
+
+
+class TestHubReader:
+    """Test the shared stat-validated hub reader."""
+
+    def test_parse_is_shared_until_hub_changes(self, hub_path):
+        """Readers share one parse per hub version."""
+        update_hub(hub_path, lambda content: SAMPLE_HUB)
+        reader = get_hub_reader()
+        heading = "## Infrastructure Learning Patterns"
+
+        parses = get_hub_io_stats()["hub_reader_parses"]
+        first = reader.parse_section(hub_path, heading, _section_lines)
+        assert reader.parse_section(hub_path, heading, _section_lines) is first
+        assert get_hub_io_stats()["hub_reader_parses"] == parses + 1
+
+        update_hub(hub_path, lambda content: content.replace("p1", "p9"))
+        second = reader.parse_section(hub_path, heading, _section_lines)
+        assert second is not first
+        assert "- **p9**: a (confidence: 0.80)" in second
+
+    def test_missing_hub_reads_empty(self, hub_path):
+        """A missing hub parses as empty content and is picked up once created."""
+        reader = get_hub_reader()
+        assert reader.read_section(hub_path, "## Other Section") == ""
+        assert reader.sections(hub_path) == []
+
+        update_hub(hub_path, lambda content: SAMPLE_HUB)
+        assert reader.read_section(hub_path, "## Other Section").startswith(
+            "## Other Section"
+        )
+
+    def test_consumers_share_pattern_parse(self, hub_path, tmp_path, monkeypatch):
+        """PatternStore and MemoryArchitecture parse the hub section once."""
+        store = PatternStore(hub_path)
+        store.store_pattern(_pattern("p1"))
+        assert store.compact_hub()
+
+        monkeypatch.chdir(tmp_path)
+        parses = get_hub_io_stats()["hub_reader_parses"]
+        assert "p1" in PatternStore(hub_path).patterns
+        assert "p1" in MemoryArchitecture().load_patterns()
+        assert get_hub_io_stats()["hub_reader_parses"] == parses + 1
+
+    def test_concurrent_first_use_builds_one_reader(self, monkeypatch):
+        """Threads racing on first use all get the same reader."""
+        monkeypatch.setattr(coordination_hub, "_hub_reader", None)
+        original_init = HubReader.__init__
+
+        def slow_init(reader):
+            time.sleep(0.01)
+            original_init(reader)
+
+        monkeypatch.setattr(HubReader, "__init__", slow_init)
+        barrier = threading.Barrier(4)
+        readers = []
+
+        def first_use():
+            barrier.wait()
+            readers.append(get_hub_reader())
+
+        threads = [threading.Thread(target=first_use) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len({id(reader) for reader in readers}) == 1
+
+    def test_journaled_patterns_from_other_writers_are_loaded(
+        self, tmp_path, monkeypatch
+    ):
+        """Patterns journaled by another instance show up before compaction."""
+        monkeypatch.chdir(tmp_path)
+        reader_side = MemoryArchitecture()
+        assert reader_side.load_patterns() == {}
+
+        assert MemoryArchitecture().store_pattern(_pattern("p1"))
+        assert "p1" in reader_side.load_patterns()
+
+
+class TestPatternStoreHubLog:
+    """Test PatternStore on top of the hub log."""
+
+    def test_stored_patterns_survive_reload_before_compaction(self, hub_path):
+        """A new store sees journaled patterns, including signatures."""
+        store = PatternStore(hub_path)
+        store.store_pattern(_pattern("p1"))
+        assert store.flush()
+
+        reloaded = PatternStore(hub_path)
+        assert reloaded.patterns["p1"].query_signature == "security auth review"
+
+    def test_compaction_writes_patterns_section(self, hub_path):
+        """On-demand compaction renders the markdown section."""
+        store = PatternStore(hub_path)
+        store.store_pattern(_pattern("p1"))
+        assert store.compact_hub()
+
+        with open(hub_path, encoding="utf-8") as f:
+            content = f.read()
+        assert "## Infrastructure Learning Patterns" in content
+        assert "- **p1**: security-enforcer,test-specialist" in content
+        assert "p1" in PatternStore(hub_path).patterns
+
+
+class TestPatternStoreWriteBehind:
+    """Test write-behind batching of stored patterns."""
+
+    def test_store_buffers_until_flush(self, hub_path):
+        """Stores are visible in memory but only journaled on flush."""
+        store = PatternStore(hub_path)
+        store.store_pattern(_pattern("p1"))
+        assert "p1" in store.patterns
+        assert not os.path.exists(store.hub_log.log_path)
+
+        assert store.flush()
+        assert len(store.hub_log.pending_records()) == 1
+        assert store.get_performance_stats()["dirty_patterns"] == 0
+
+    def test_batch_size_triggers_single_flush(self, hub_path):
+        """Reaching the batch size writes all dirty patterns at once."""
+        store = PatternStore(hub_path)
+        store.flush_batch_size = 3
+        for i in range(3):
+            store.store_pattern(_pattern(f"p{i}"))
+
+        assert len(store.hub_log.pending_records()) == 3
+        flushes = [m for m in store.performance_metrics if m["operation"] == "flush"]
+        assert len(flushes) == 1
+
+    def test_background_flusher_writes_dirty_patterns(self, hub_path):
+        """The flusher thread writes patterns after the interval."""
+        store = PatternStore(hub_path)
+        store.flush_interval_seconds = 0.05
+        store.store_pattern(_pattern("p1"))
+
+        deadline = time.time() + 2.0
+        while not os.path.exists(store.hub_log.log_path) and time.time() < deadline:
+            time.sleep(0.01)
+        store.close()
+        assert "p1" in PatternStore(hub_path).patterns
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="Requires fork start method",
+)
+class TestCrossProcessHubWrites:
+    """Stress concurrent hub writers across processes."""
+
+    WORKERS = 4
+    UPDATES = 40
+
+    def _markers(self, hub_path):
+        with open(hub_path, encoding="utf-8") as f:
+            return [line for line in f.read().splitlines() if line]
+
+    def test_optimistic_updates_lose_nothing(self, hub_path):
+        """Concurrent read-modify-write cycles keep every update."""
+        stats = _run_workers(_hub_update_worker, hub_path, self.WORKERS, self.UPDATES)
+
+        markers = self._markers(hub_path)
+        assert len(markers) == self.WORKERS * self.UPDATES
+        assert len(set(markers)) == len(markers)
+
+        # Every update commits under the lock; a conflict costs one more
+        for worker_stats in stats:
+            assert worker_stats["lock_acquisitions"] >= (
+                self.UPDATES + worker_stats["optimistic_conflicts"]
+            )
+
+    def test_journal_compaction_loses_nothing(self, hub_path):
+        """Concurrent appends and compactions render every record exactly once."""
+        stats = _run_workers(_hub_log_worker, hub_path, self.WORKERS, self.UPDATES)
+
+        markers = self._markers(hub_path)
+        assert sorted(markers) == sorted(
+            f"w{w}-{i}" for w in range(self.WORKERS) for i in range(self.UPDATES)
+        )
+        assert not CoordinationHubLog(hub_path, "stress").pending_records()
+        assert all(s["lock_acquisitions"] > 0 for s in stats)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,797 @@
+#!/usr/bin/env python3
+"""
+Tests for the enhanced cross-domain coordinator.
+
+Covers the single-pass domain scanner used by EnhancedBoundaryDetector, the
+bitmask-indexed ConflictDetectionEngine, the bounded analysis history, the
+learned pattern index, island-model pattern evolution with its fitness
+cache and change-driven scheduling, the memoized CrossDomainOptimizer,
+admission control and the budgeted PerformanceGuard.
+"""
+
+import pytest
+import sys
+import os
+import re
+import time
+import random
+from collections import deque
+from datetime import datetime
+from types import SimpleNamespace
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from enhanced_cross_domain_coordinator import (  # noqa: E402
+    Admission,
+    AdmissionController,
+    AnalysisHistory,
+    BudgetExceeded,
+    COORDINATION_EXECUTIONS,
+    ConflictDetectionEngine,
+    CoordinationPattern,
+    CorpusReplayFitness,
+    CrossDomainOptimizer,
+    ConflictType,
+    CrossDomainAnalysis,
+    DomainBoundary,
+    DomainType,
+    EnhancedBoundaryDetector,
+    EnhancedCrossDomainCoordinator,
+    EvolutionEngine,
+    LearnedPatternIndex,
+    LearningCoordinator,
+    PatternEvolver,
+    PatternLearningEngine,
+    PatternStore,
+    PerformanceGuard,
+    SafetyManager,
+    SafetyThresholds,
+    TokenBucket,
+)
+
+QUERIES = [
+    "pytest fixture mocking for async test failures in the test suite",
+    "docker container security scan and kubernetes cluster deployment pipeline",
+    "performance optimization of latency and throughput optimization testing",
+    "testing testing test infrastructure with mock service and mock api",
+    "refactoring code quality and technical debt, documentation as code",
+    "end-to-end test automation across a service mesh architecture",
+    "",
+]
+
+
+@pytest.fixture(scope="module")
+def detector():
+    """A boundary detector with its compiled scanner."""
+    return EnhancedBoundaryDetector()
+
+
+class TestDomainPatternScanner:
+    """Test that the compiled scanner agrees with per-pattern regex scans."""
+
+    @pytest.mark.parametrize("query", QUERIES)
+    def test_pattern_matches_equal_finditer(self, detector, query):
+        """Every pattern's matches are the ones ``re.finditer`` finds."""
+        matches, _ = detector.domain_scanner.scan(query)
+        for domain, categories in detector.domain_patterns.items():
+            for category, patterns in categories.items():
+                for index, pattern in enumerate(patterns):
+                    expected = [m.span() for m in re.finditer(pattern, query)]
+                    found = [
+                        m.span() for m in matches.get((domain, category, index), [])
+                    ]
+                    assert found == expected, (domain, category, pattern)
+
+    @pytest.mark.parametrize("query", QUERIES)
+    def test_keyword_counts_equal_str_count(self, detector, query):
+        """Keyword counts, including keywords that prefix others, match str.count."""
+        _, keyword_counts = detector.domain_scanner.scan(query)
+        for domain in detector.domain_patterns:
+            for keyword in detector._get_domain_keywords(domain):
+                assert keyword_counts.get(keyword, 0) == query.count(keyword)
+
+    def test_detects_primary_domain(self, detector):
+        """Scanner-backed scoring still finds the dominant domain."""
+        boundaries = detector.detect_domain_boundaries(
+            "pytest fixture mock patch for the unit test suite"
+        )
+        assert boundaries[0].primary_domain == DomainType.TESTING
+
+
+def _boundary(*domains: DomainType) -> DomainBoundary:
+    return DomainBoundary(
+        primary_domain=domains[0],
+        secondary_domains=list(domains[1:]),
+        confidence=0.8,
+        boundary_patterns=[],
+        overlap_indicators=[],
+        complexity_score=0.0,
+    )
+
+
+class TestConflictDetectionEngine:
+    """Test conflict detection over domain-pair bitmasks."""
+
+    def test_single_domain_has_no_conflicts(self):
+        """Conflicts need two domains, whatever the query says."""
+        engine = ConflictDetectionEngine()
+        conflicts = engine.detect_conflicts(
+            [_boundary(DomainType.SECURITY)],
+            "security vs performance with memory and cpu before deploy",
+        )
+        assert conflicts == []
+
+    def test_pair_conflict_in_either_order(self):
+        """A configured pair matches regardless of domain order."""
+        engine = ConflictDetectionEngine()
+        query = "Security overhead impacting system performance"
+        for domains in [
+            (DomainType.SECURITY, DomainType.PERFORMANCE),
+            (DomainType.PERFORMANCE, DomainType.SECURITY),
+        ]:
+            conflicts = engine.detect_conflicts([_boundary(*domains)], query)
+            types = [c.conflict_type for c in conflicts]
+            assert ConflictType.SECURITY_PERFORMANCE in types
+
+    def test_unrelated_pair_only_checks_competition(self):
+        """Without a configured pair only resource/timing conflicts remain."""
+        engine = ConflictDetectionEngine()
+        conflicts = engine.detect_conflicts(
+            [_boundary(DomainType.DOCUMENTATION, DomainType.API_INTEGRATION)],
+            "security overhead with memory and cpu pressure",
+        )
+        assert [c.conflict_type for c in conflicts] == [
+            ConflictType.RESOURCE_COMPETITION
+        ]
+
+    def test_severity_vocabulary_scan_matches_substrings(self):
+        """Vocabulary terms are found inside longer words like ``in`` does."""
+        engine = ConflictDetectionEngine()
+        query = "reauthentication under critical latency"
+        boundaries = [_boundary(DomainType.SECURITY, DomainType.PERFORMANCE)]
+        (conflict,) = [
+            c
+            for c in engine.detect_conflicts(boundaries, query)
+            if c.conflict_type == ConflictType.SECURITY_PERFORMANCE
+        ]
+        # base 0.7 + critical 0.2, capped at 1.0
+        assert conflict.severity == 1.0
+
+
+class TestAnalysisHistory:
+    """Test the bounded history and its running statistics."""
+
+    def _analysis(self, detector, engine, query):
+        boundaries = detector.detect_domain_boundaries(query)
+        conflicts = engine.detect_conflicts(boundaries, query)
+        return CrossDomainAnalysis(
+            query=query,
+            detected_boundaries=boundaries,
+            potential_conflicts=conflicts,
+            recommended_coordination="",
+            agent_suggestions=[],
+            integration_complexity=len(conflicts) * 0.5,
+            processing_time_ms=float(len(query)),
+        )
+
+    def test_window_stats_match_recomputation(self, detector):
+        """Running counters equal statistics recomputed from the window."""
+        engine = ConflictDetectionEngine()
+        history = AnalysisHistory(maxlen=4)
+        for query in QUERIES * 2:
+            history.append(self._analysis(detector, engine, query))
+
+        entries = list(history)
+        assert len(entries) == 4
+        stats = history.get_stats()
+        assert stats["total_analyses"] == 4
+        assert stats["average_processing_time_ms"] == pytest.approx(
+            sum(a.processing_time_ms for a in entries) / 4
+        )
+        assert stats["conflict_detection_rate"] == (
+            sum(1 for a in entries if a.potential_conflicts) / 4
+        )
+        expected_domains = {}
+        for analysis in entries:
+            for boundary in analysis.detected_boundaries:
+                for domain in [boundary.primary_domain, *boundary.secondary_domains]:
+                    expected_domains[domain.value] = (
+                        expected_domains.get(domain.value, 0) + 1
+                    )
+        assert stats["domain_frequency"] == expected_domains
+
+    def test_empty_history_has_no_stats(self):
+        """An empty history reports no statistics."""
+        assert AnalysisHistory().get_stats() == {}
+
+
+LEARNING_QUERIES = [
+    ("docker container deployment with helm", "infra-a", 0.9),
+    ("kubernetes pod service scaling", "infra-b", 0.8),
+    ("docker compose service mesh routing", "infra-c", 0.95),
+    ("kubernetes helm deployment", "infra-a", 0.85),
+    ("docker container deployment with helm", "infra-a", 0.9),
+]
+
+
+@pytest.fixture
+def learning_engine(tmp_path):
+    """A learning engine writing to a temporary coordination hub."""
+    hub_path = tmp_path / ".claude" / "memory" / "coordination-hub.md"
+    return PatternLearningEngine(str(hub_path))
+
+
+def _linear_suggestion(engine, query):
+    """Reference scoring over the raw recent successes."""
+    query_type = engine._classify_infrastructure_query(query)
+    query_keywords = set(engine._extract_keywords(query))
+    best = None
+    for pattern in engine.recent_successes:
+        if not pattern["pattern"].startswith(f"{query_type}:"):
+            continue
+        overlap = len(query_keywords & set(pattern["query_keywords"]))
+        if overlap:
+            score = pattern["confidence"] * overlap / max(len(query_keywords), 1)
+            score += engine.pattern_weights.get(pattern["pattern"], 0.0)
+            if best is None or score > best[1]:
+                best = (pattern["agent"], score)
+    return best
+
+
+class TestLearnedPatternIndex:
+    """Test keyword posting lists over aggregated learned patterns."""
+
+    def test_suggestions_match_linear_scan(self, learning_engine):
+        """Fresh successes score as the full history scan does."""
+        for query, agent, confidence in LEARNING_QUERIES:
+            learning_engine.learn_from_success(query, agent, confidence)
+
+        for query in [
+            "docker helm deployment",
+            "kubernetes service routing",
+            "docker container",
+            "terraform pipeline",
+        ]:
+            expected = _linear_suggestion(learning_engine, query)
+            found = learning_engine.get_learned_agent_suggestion(query)
+            if expected is None:
+                assert found is None
+            else:
+                assert found[0] == expected[0]
+                assert found[1] == pytest.approx(expected[1])
+
+    def test_repeated_successes_share_one_entry(self):
+        """Postings grow with distinct signatures, not with traffic."""
+        index = LearnedPatternIndex()
+        for i in range(50):
+            index.add("q", "agent", "q:agent", ["b", "a"], 0.8 + i / 1000, 100.0 + i)
+
+        assert len(index) == 1
+        assert len(index.postings[("q", "a")]) == 1
+        entry = index.postings[("q", "b")][0]
+        assert entry["count"] == 50
+        assert entry["last_seen"] == 149.0
+        assert 0.8 < entry["confidence"] < 0.849
+
+    def test_confidence_sum_decays_with_half_life(self):
+        """Older successes weigh half as much per half-life."""
+        index = LearnedPatternIndex()
+        half_life = LearnedPatternIndex.CONFIDENCE_HALF_LIFE_SECONDS
+        index.add("q", "agent", "q:agent", ["a"], 1.0, 0.0)
+        entry = index.add("q", "agent", "q:agent", ["a"], 0.7, half_life)
+
+        assert entry["confidence_sum"] == pytest.approx(0.5 + 0.7)
+        assert entry["decayed_count"] == pytest.approx(1.5)
+        # Out-of-order successes decay themselves instead
+        late = index.add("q", "agent", "q:agent", ["a"], 0.7, 0.0)
+        assert late["last_seen"] == half_life
+        assert late["decayed_count"] == pytest.approx(2.0)
+
+    def test_engine_keeps_aggregates_and_bounded_sample(self, learning_engine):
+        """Repeated traffic grows counts, not memory or the rendered section."""
+        learning_engine.recent_successes = deque(maxlen=3)
+        for _ in range(20):
+            learning_engine.learn_from_success("docker helm deployment", "infra-a", 0.9)
+
+        stats = learning_engine.get_learning_stats()
+        assert stats["total_successful_patterns"] == 20
+        assert stats["distinct_successful_patterns"] == 1
+        assert len(learning_engine.recent_successes) == 3
+        section = learning_engine._generate_patterns_section()
+        assert section.count("- **container_orchestration:infra-a**") == 1
+
+    def test_decay_is_looked_up_per_day_bucket(self):
+        """Decay is linear over 30 days and floored at 0.5."""
+        index = LearnedPatternIndex()
+        day = LearnedPatternIndex.DECAY_BUCKET_SECONDS
+        now_bucket = int(time.time() // day)
+        now = now_bucket * day
+        assert index.decay_factor(now, now_bucket) == 1.0
+        assert index.decay_factor(now - 3 * day, now_bucket) == pytest.approx(0.9)
+        assert index.decay_factor(now - 40 * day, now_bucket) == 0.5
+
+
+def _coordination_pattern(pattern_id, signature, agents, success_rate=0.7):
+    return CoordinationPattern(
+        pattern_id=pattern_id,
+        query_signature=signature,
+        agent_sequence=agents,
+        success_rate=success_rate,
+        last_used=datetime.now(),
+        execution_time_ms=10.0,
+    )
+
+
+@pytest.fixture
+def evolution_coordinator(tmp_path):
+    """A coordinator stand-in holding a small pattern store."""
+    store = PatternStore(str(tmp_path / ".claude" / "memory" / "coordination-hub.md"))
+    for pattern in [
+        _coordination_pattern("p1", "security test", ["security-enforcer"], 0.6),
+        _coordination_pattern(
+            "p2", "security review", ["security-enforcer", "test-specialist"], 0.8
+        ),
+        _coordination_pattern(
+            "p3", "test performance", ["test-specialist", "performance-optimizer"]
+        ),
+    ]:
+        store.store_pattern(pattern)
+    return SimpleNamespace(pattern_store=store)
+
+
+def _evolved_summary(evolved):
+    return {
+        query_type: [(p.pattern_id, p.agent_sequence) for p in patterns]
+        for query_type, patterns in evolved.items()
+    }
+
+
+class TestEvolutionEngine:
+    """Test island-model evolution and its genetic operators."""
+
+    def test_crossover_of_single_agent_sequences(self):
+        """Parents with one agent produce a child instead of failing."""
+        evolver = PatternEvolver()
+        rng = random.Random(1)
+        p1 = _coordination_pattern("a", "security", ["security-enforcer"])
+        p2 = _coordination_pattern("b", "security test", ["test-specialist", "x"])
+        for _ in range(20):
+            child = evolver.crossover(p1, p2, rng)
+            assert child.agent_sequence in (p1.agent_sequence, p2.agent_sequence)
+
+    def test_seeded_runs_do_not_depend_on_workers(self, evolution_coordinator):
+        """The same seed gives the same patterns inline and in worker processes."""
+        inline = EvolutionEngine(evolution_coordinator, workers=1, seed=11)
+        pooled = EvolutionEngine(evolution_coordinator, workers=2, seed=11)
+        evolved = inline.evolve_all()
+
+        assert set(evolved) == {"security review", "security test", "test performance"}
+        try:
+            assert _evolved_summary(evolved) == _evolved_summary(pooled.evolve_all())
+        finally:
+            pooled.close()
+        assert len(inline.history) <= 3 * inline.max_generations
+        assert inline.history[0]["islands"] == inline.islands
+
+    def test_worker_pool_is_reused_until_closed(self, evolution_coordinator):
+        """Islands run in process by default; a pool is created once and reused."""
+        inline = EvolutionEngine(evolution_coordinator, seed=11)
+        inline.evolve_all()
+        assert inline._pool is None
+
+        pooled = EvolutionEngine(evolution_coordinator, workers=2, seed=11)
+        pool = pooled._executor()
+        try:
+            assert pooled._executor() is pool
+        finally:
+            pooled.close()
+        assert pooled._pool is None
+
+    def test_history_is_bounded(self, evolution_coordinator):
+        """Only the newest generations are kept; statistics cover every run."""
+        engine = EvolutionEngine(evolution_coordinator, seed=11, history_size=2)
+        engine.evolve_all()
+
+        stats = engine.get_evolution_stats()
+        assert len(engine.history) == 2
+        assert stats["total_generations"] > 2
+        assert engine.history[-1]["generation"] == stats["total_generations"]
+
+    def test_evolve_patterns_for_one_query_type(self, evolution_coordinator):
+        """A single query type evolves from the patterns matching it."""
+        engine = EvolutionEngine(evolution_coordinator, workers=1, seed=5)
+        evolved = engine.evolve_patterns("security")
+        assert evolved
+        assert all(p.success_rate >= engine.evolution_threshold for p in evolved)
+        assert len({p.pattern_id for p in evolved}) == len(evolved)
+
+    def test_corpus_replay_fitness(self, evolution_coordinator):
+        """Replay fitness rewards agreement with the selector's choices."""
+        fitness = CorpusReplayFitness(
+            ["security audit", "performance test run"],
+            lambda query: (
+                ["security-enforcer"]
+                if "security" in query
+                else ["test-specialist", "performance-optimizer"]
+            ),
+        )
+        patterns = evolution_coordinator.pattern_store.patterns
+        # p1 shares "security" with one query and "test" with the other
+        assert fitness(patterns["p1"]) == 0.5
+        assert fitness(patterns["p2"]) == 0.5
+        assert fitness(patterns["p3"]) == 1.0
+        unrelated = _coordination_pattern("p4", "docs", ["x"], 0.55)
+        assert fitness(unrelated) == 0.55
+
+        engine = EvolutionEngine(
+            evolution_coordinator, fitness_function=fitness, workers=1, seed=3
+        )
+        evolved = engine.evolve_patterns("security")
+        # Elites survive, so evolution never loses the best seed pattern
+        assert fitness(evolved[0]) >= 0.5
+        assert [fitness(p) for p in evolved] == sorted(
+            (fitness(p) for p in evolved), reverse=True
+        )
+
+
+class CountingFitness:
+    """Success-rate fitness that counts its evaluations."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, pattern):
+        self.calls += 1
+        return pattern.success_rate
+
+
+class TestEvolutionScheduling:
+    """Test fitness memoization, store versions and early convergence."""
+
+    def test_store_version_tracks_changes(self, evolution_coordinator):
+        """Storing a pattern bumps the store version."""
+        store = evolution_coordinator.pattern_store
+        version = store.version
+        store.store_pattern(_coordination_pattern("p9", "security audit", ["a"]))
+        assert store.version == version + 1
+
+    def test_unchanged_store_skips_evolution(self, evolution_coordinator):
+        """Evolution reuses results until the store version changes."""
+        fitness = CountingFitness()
+        engine = EvolutionEngine(
+            evolution_coordinator, fitness_function=fitness, workers=1, seed=2
+        )
+        first = engine.evolve_all()
+        calls, generations = fitness.calls, len(engine.history)
+
+        assert engine.evolve_all() == first
+        assert fitness.calls == calls
+        assert len(engine.history) == generations
+        assert engine.skipped_evolutions == len(first)
+
+        evolution_coordinator.pattern_store.store_pattern(
+            _coordination_pattern("p9", "security audit", ["security-enforcer"])
+        )
+        engine.evolve_all()
+        assert len(engine.history) > generations
+
+    def test_fitness_is_evaluated_once_per_pattern_content(self, evolution_coordinator):
+        """Repeated patterns are scored from the cache."""
+        fitness = CountingFitness()
+        engine = EvolutionEngine(
+            evolution_coordinator, fitness_function=fitness, workers=1, seed=4
+        )
+        engine.evolve_all()
+
+        cache = engine.fitness_cache
+        assert fitness.calls == cache.misses == len(cache.values)
+        assert cache.hits > cache.misses
+
+    def test_converged_population_stops_early(self, tmp_path):
+        """Identical patterns converge after the first unchanged generation."""
+        store = PatternStore(str(tmp_path / "coordination-hub.md"))
+        for i in range(4):
+            store.store_pattern(
+                _coordination_pattern(f"p{i}", "security", ["security-enforcer"])
+            )
+        engine = EvolutionEngine(
+            SimpleNamespace(pattern_store=store), workers=1, seed=1
+        )
+        engine.mutation_rate = 0.0
+        engine.evolve_all()
+
+        assert len(engine.history) == 2
+        assert engine.converged_early == 1
+        assert engine.get_evolution_stats()["converged_early"] == 1
+
+
+class TestCrossDomainOptimizer:
+    """Test the memoized pattern table and aggregated metrics."""
+
+    def _saturated_optimizer(self):
+        optimizer = CrossDomainOptimizer()
+        for expertise in optimizer.domain_expertise.values():
+            expertise["current_accuracy"] = expertise["target_accuracy"]
+        return optimizer
+
+    def test_returns_pre_parsed_best_pattern(self):
+        """The best pattern comes back as an agent sequence."""
+        optimizer = self._saturated_optimizer()
+        result = optimizer.optimize_domain_coordination(
+            "security scan", [_boundary(DomainType.SECURITY)]
+        )
+        assert result.agent_sequence == ["security", "infrastructure", "test"]
+        assert result.query_signature == "security scan"
+
+    def test_best_pattern_is_memoized(self, monkeypatch):
+        """Repeated boundaries are answered without rescoring."""
+        optimizer = self._saturated_optimizer()
+        boundary = _boundary(DomainType.SECURITY, DomainType.PERFORMANCE)
+        optimizer.optimize_domain_coordination("security scan", [boundary])
+
+        def fail(*args):
+            raise AssertionError("pattern was rescored")
+
+        monkeypatch.setattr(optimizer, "_score_pattern", fail)
+        result = optimizer.optimize_domain_coordination("secure api", [boundary])
+        assert result is not None
+
+    def test_expertise_change_invalidates_table(self):
+        """A changed accuracy drops that pattern key's memo entries."""
+        optimizer = CrossDomainOptimizer()
+        boundary = _boundary(DomainType.SECURITY)
+        optimizer.optimize_domain_coordination("security scan", [boundary])
+        # The first run raised the accuracy, so nothing stays memoized
+        assert not optimizer._best_patterns.get("security")
+
+        saturated = self._saturated_optimizer()
+        saturated.optimize_domain_coordination("security scan", [boundary])
+        assert saturated._best_patterns["security"]
+
+    def test_metrics_are_fixed_size_aggregates(self):
+        """Metrics keep counts and sums instead of per-call records."""
+        optimizer = self._saturated_optimizer()
+        for _ in range(50):
+            optimizer.optimize_domain_coordination(
+                "security scan", [_boundary(DomainType.SECURITY)]
+            )
+        assert len(optimizer.performance_metrics["security"]) == 5
+        stats = optimizer.get_optimization_stats()["security"]
+        assert stats["total_optimizations"] == 50
+        assert stats["avg_confidence"] == pytest.approx(stats["max_confidence"])
+
+
+def _exhausted_controller() -> AdmissionController:
+    """A controller whose selection budget is already spent."""
+    return AdmissionController(
+        SafetyThresholds(max_selections_per_second=0.0, selection_burst=0)
+    )
+
+
+class TestAdmissionControl:
+    """Test the token bucket, stage shedding and degraded analyses."""
+
+    def test_token_bucket_refuses_when_empty_and_refills(self):
+        """Tokens run out under a burst and come back over time."""
+        bucket = TokenBucket(rate=10.0, capacity=2)
+        assert bucket.try_acquire() and bucket.try_acquire()
+        assert not bucket.try_acquire()
+        bucket.updated -= 0.2  # pretend 200ms passed
+        assert bucket.try_acquire()
+
+    def test_stages_are_shed_most_expensive_first(self):
+        """Cross-domain analysis goes first and reasoning last."""
+        controller = AdmissionController()
+        with Admission(controller, 0.8) as admission:
+            assert not admission.allows("cross_domain_analysis")
+            assert not admission.allows("learning_enhancement")
+            assert admission.allows("reasoning")
+            assert admission.allows("core_selection")
+
+        stats = controller.get_stats()
+        assert stats["shed"] == {
+            "cross_domain_analysis": 1,
+            "learning_enhancement": 1,
+        }
+        assert stats["degraded"] == 1
+
+    def test_concurrency_limit_raises_load(self):
+        """Holding every slot makes further admissions fully loaded."""
+        controller = AdmissionController(SafetyThresholds(max_concurrent_selections=2))
+        held = [controller.admit(), controller.admit()]
+        admission = controller.admit()
+        assert admission.load == 1.0
+        for item in held + [admission]:
+            item.release()
+        assert controller.get_stats()["in_flight"] == 0
+        assert controller.get_stats()["over_budget"] == 1
+
+    def test_overloaded_analysis_keeps_core_selection(self):
+        """An overloaded analysis still detects boundaries and suggests agents."""
+        coordinator = EnhancedCrossDomainCoordinator()
+        coordinator.admission = _exhausted_controller()
+        analysis = coordinator.analyze_cross_domain_integration(
+            "security overhead impacting performance with memory and cpu pressure"
+        )
+
+        assert analysis.detected_boundaries
+        assert analysis.agent_suggestions
+        assert analysis.potential_conflicts == []
+        assert analysis.recommended_coordination.startswith("Degraded")
+        stats = coordinator.admission.get_stats()
+        assert stats["degraded"] == 1
+        assert set(stats["shed"]) == {"cross_domain_analysis", "reasoning"}
+
+    def test_learning_safety_sheds_under_load(self):
+        """Learning is refused while selection load is high."""
+        coordinator = SimpleNamespace(
+            pattern_store=SimpleNamespace(patterns={}),
+            get_performance_metrics=lambda: {"success_rate": 0.9},
+        )
+        manager = SafetyManager(admission=_exhausted_controller())
+        manager.startup_learning_disabled = False
+        assert not manager.check_learning_safety(coordinator)
+        assert manager.admission.get_stats()["shed"] == {"learning_enhancement": 1}
+
+        idle = SafetyManager(admission=AdmissionController())
+        idle.startup_learning_disabled = False
+        assert idle.check_learning_safety(coordinator)
+
+
+class TestPerformanceGuard:
+    """Test time and memory budgets and cooperative deadlines."""
+
+    def test_fast_block_has_no_violations(self):
+        """Work inside the budget records nothing."""
+        with PerformanceGuard(SafetyThresholds(), budget_ms=1000) as guard:
+            assert guard.remaining_ms() > 0
+        assert guard.violations == []
+        assert 0 <= guard.duration_ms < 1000
+
+    def test_check_aborts_over_budget_work(self):
+        """Polling after the deadline raises and the violation is recorded."""
+        sink = []
+        with pytest.raises(BudgetExceeded) as excinfo:
+            with PerformanceGuard(
+                SafetyThresholds(), budget_ms=1, metrics_sink=lambda *v: sink.append(v)
+            ) as guard:
+                for _ in range(1000):
+                    time.sleep(0.001)
+                    guard.check()
+
+        assert excinfo.value.budget == "time_ms"
+        assert guard.aborted
+        assert sink and sink[0][0] == "time_ms"
+        assert guard.duration_ms < 500  # stopped early, not after 1000 sleeps
+
+    def test_tracemalloc_peak_is_enforced(self):
+        """Peak allocations above the memory budget are a violation."""
+        thresholds = SafetyThresholds(max_memory_usage_mb=1.0)
+        with PerformanceGuard(
+            thresholds, budget_ms=10_000, track_memory="tracemalloc"
+        ) as guard:
+            block = bytearray(4 * 1024 * 1024)
+            del block
+
+        assert guard.peak_memory >= 4.0
+        assert [v[0] for v in guard.violations] == ["memory_mb"]
+
+    def test_exceptions_are_not_swallowed(self):
+        """Errors inside the guarded block propagate."""
+        with pytest.raises(KeyError):
+            with PerformanceGuard(SafetyThresholds(), budget_ms=1000):
+                raise KeyError("boom")
+
+
+COORDINATION_QUERY = "docker container deployment and kubernetes orchestration"
+
+
+@pytest.fixture
+def learning_coordinator(tmp_path):
+    """A learning coordinator with its own store and admission controller."""
+    store = PatternStore(str(tmp_path / ".claude" / "memory" / "coordination-hub.md"))
+    coordinator = LearningCoordinator(store, SafetyThresholds())
+    coordinator.admission = AdmissionController()
+    return coordinator
+
+
+def _learn_better_sequence(coordinator, query):
+    """Store a pattern for ``query`` that beats the base coordination."""
+    base = coordinator.coordinate_agents(query)
+    coordinator.pattern_store.store_pattern(
+        _coordination_pattern(
+            coordinator._get_pattern_id(base),
+            base.query_signature,
+            ["learned-agent"],
+            success_rate=0.99,
+        )
+    )
+    return base
+
+
+class TestLearningCoordinator:
+    """Test coordinate_agents end to end."""
+
+    def test_base_coordination(self, learning_coordinator):
+        """Without learned patterns the base coordination is returned."""
+        result = learning_coordinator.coordinate_agents(COORDINATION_QUERY)
+
+        assert result.query_signature == "infrastructure"
+        assert "infrastructure-engineer" in result.agent_sequence
+        assert result.confidence > 0
+        assert learning_coordinator.total_executions == 1
+        assert learning_coordinator.successful_executions == 0
+
+    def test_learned_pattern_enhances_result(self, learning_coordinator):
+        """A stored pattern with a higher success rate replaces the sequence."""
+        _learn_better_sequence(learning_coordinator, COORDINATION_QUERY)
+        result = learning_coordinator.coordinate_agents(COORDINATION_QUERY)
+
+        assert result.agent_sequence == ["learned-agent"]
+        assert result.confidence == 0.99
+        assert learning_coordinator.successful_executions == 1
+
+    def test_recorded_success_is_reused(self, learning_coordinator):
+        """record_success stores the pattern under the coordination's id."""
+        result = learning_coordinator.coordinate_agents(COORDINATION_QUERY)
+        learning_coordinator.record_success(result)
+        pattern_id = learning_coordinator._get_pattern_id(result)
+        assert pattern_id in learning_coordinator.pattern_store.patterns
+
+    def test_expired_budget_skips_enhancement(self, learning_coordinator):
+        """Once the time budget is spent the base result is returned."""
+        base = _learn_better_sequence(learning_coordinator, COORDINATION_QUERY)
+        learning_coordinator.thresholds = SafetyThresholds(max_selection_time_ms=0.0)
+        learning_coordinator._can_enhance_safely = lambda result: pytest.fail(
+            "enhancement attempted after the budget expired"
+        )
+        result = learning_coordinator.coordinate_agents(COORDINATION_QUERY)
+
+        assert result.agent_sequence == base.agent_sequence
+        assert learning_coordinator.successful_executions == 0
+
+    def test_coordination_is_admitted_once(self, learning_coordinator):
+        """The analysis runs under the coordination's own admission."""
+        executions = COORDINATION_EXECUTIONS.value()
+        learning_coordinator.coordinate_agents(COORDINATION_QUERY)
+
+        assert COORDINATION_EXECUTIONS.value() == executions + 1
+
+        stats = learning_coordinator.admission.get_stats()
+        assert stats["admitted"] == 1
+        assert stats["in_flight"] == 0
+        assert stats["degraded"] == 0
+
+    def test_shed_enhancement_returns_base(self, learning_coordinator):
+        """Shedding learning enhancement skips the learned pattern."""
+        base = _learn_better_sequence(learning_coordinator, COORDINATION_QUERY)
+        learning_coordinator.admission.stage_shed_load["learning_enhancement"] = 0.0
+        result = learning_coordinator.coordinate_agents(COORDINATION_QUERY)
+
+        assert result.agent_sequence == base.agent_sequence
+        stats = learning_coordinator.admission.get_stats()
+        assert stats["shed"]["learning_enhancement"] >= 1
+        assert "cross_domain_analysis" not in stats["shed"]
+        assert stats["degraded"] == 1
+
+    def test_over_budget_request_keeps_core_selection(self, learning_coordinator):
+        """A request past the selection budget sheds every optional stage."""
+        _learn_better_sequence(learning_coordinator, COORDINATION_QUERY)
+        learning_coordinator.admission = _exhausted_controller()
+        result = learning_coordinator.coordinate_agents(COORDINATION_QUERY)
+
+        assert "infrastructure-engineer" in result.agent_sequence
+        assert result.agent_sequence != ["learned-agent"]
+        stats = learning_coordinator.admission.get_stats()
+        assert stats["over_budget"] == 1
+        assert set(stats["shed"]) == {
+            "cross_domain_analysis",
+            "learning_enhancement",
+            "reasoning",
+        }
+        assert stats["in_flight"] == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
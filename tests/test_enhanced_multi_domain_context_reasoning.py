@@ -8,18 +8,57 @@ Basic tests for multi-domain context reasoning module to improve coverage.
 import pytest
 import sys
 import os
+from datetime import datetime
 
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
 try:
     import enhanced_multi_domain_context_reasoning  # noqa: F401
+    from enhanced_multi_domain_context_reasoning import (
+        ContextElement,
+        ContextPreservationManager,
+        ContextPreservationStrategy,
+        CrossDomainRelationshipMapper,
+        DomainRelationship,
+        DomainRelationshipType,
+        DomainSpecificOptimizer,
+        EnhancedMultiDomainContextReasoner,
+        KeywordAutomaton,
+        SemanticAnalyzer,
+        StreamingStat,
+        estimate_element_bytes,
+        required_literals,
+    )
 
     MODULE_AVAILABLE = True
 except ImportError:
     MODULE_AVAILABLE = False
 
 
+def _element(
+    element_id, importance, content="context", domain="testing", dependencies=()
+):
+    return ContextElement(
+        element_id,
+        content,
+        domain,
+        importance,
+        datetime.now(),
+        dependencies=set(dependencies),
+    )
+
+
+def _relationship(from_domain, to_domain, strength, bidirectional=False):
+    return DomainRelationship(
+        from_domain,
+        to_domain,
+        DomainRelationshipType.SEQUENTIAL,
+        strength,
+        bidirectional,
+    )
+
+
 class TestEnhancedMultiDomainContextReasoning:
     """Test multi-domain context reasoning functionality."""
 
@@ -39,5 +78,268 @@ class TestEnhancedMultiDomainContextReasoning:
         assert True  # Pass if import successful
 
 
+@pytest.mark.skipif(not MODULE_AVAILABLE, reason="Module not available")
+class TestCrossDomainRelationshipMapper:
+    """Test the adjacency-indexed relationship graph."""
+
+    def _mapper(self):
+        mapper = CrossDomainRelationshipMapper()
+        mapper.register_relationship(_relationship("a", "b", 0.9))
+        mapper.register_relationship(_relationship("b", "c", 0.9))
+        mapper.register_relationship(_relationship("a", "c", 0.5))
+        mapper.register_relationship(_relationship("c", "d", 0.8))
+        return mapper
+
+    def test_fewest_hop_path_respects_max_hops(self):
+        """Paths take the fewest hops and are cut off past ``max_hops``."""
+        mapper = self._mapper()
+        assert mapper.find_domain_path("a", "d") == ["a", "c", "d"]
+        assert mapper.find_domain_path("a", "d", max_hops=1) == []
+        assert mapper.find_domain_path("d", "a") == []
+        assert mapper.find_domain_path("a", "a") == ["a"]
+
+    def test_strongest_path_maximizes_strength_product(self):
+        """The strongest path can take more hops than the shortest one."""
+        mapper = self._mapper()
+        path, strength = mapper.find_strongest_path("a", "c")
+        assert path == ["a", "b", "c"]
+        assert strength == pytest.approx(0.81)
+        assert mapper.find_strongest_path("d", "a") == ([], 0.0)
+
+    def test_strength_updates_refresh_tables(self):
+        """Strength changes are reflected in strongest paths and related domains."""
+        mapper = self._mapper()
+        assert mapper.find_strongest_path("a", "c")[0] == ["a", "b", "c"]
+        for _ in range(6):
+            mapper.update_relationship_strength("a", "c", success=True)
+        assert mapper.find_strongest_path("a", "c")[0] == ["a", "c"]
+        assert mapper.get_related_domains("a") == [("c", 1.0), ("b", 0.9)]
+
+    def test_new_edges_refresh_paths(self):
+        """Registering an edge, including its reverse, updates hop paths."""
+        mapper = self._mapper()
+        mapper.register_relationship(_relationship("d", "a", 0.4, bidirectional=True))
+        assert mapper.find_domain_path("d", "b") == ["d", "a", "b"]
+        assert mapper.find_domain_path("a", "d") == ["a", "d"]
+        assert mapper.get_related_domains("a", min_strength=0.45) == [
+            ("b", 0.9),
+            ("c", 0.5),
+        ]
+
+
+@pytest.mark.skipif(not MODULE_AVAILABLE, reason="Module not available")
+class TestContextPreservationManager:
+    """Test the bounded preservation cache and transfer history."""
+
+    def _manager(self, **kwargs):
+        mapper = CrossDomainRelationshipMapper()
+        mapper.register_relationship(_relationship("testing", "security", 0.6))
+        return ContextPreservationManager(mapper, **kwargs)
+
+    def test_same_content_hits_cache(self):
+        """Equal context maps cached results onto the caller's elements."""
+        manager = self._manager()
+        strategy = ContextPreservationStrategy.SELECTIVE_TRANSFER
+        first = [_element("a", 0.9), _element("b", 0.1)]
+        preserved, _ = manager.preserve_context(first, "testing", "security", strategy)
+
+        second = [_element("a", 0.9), _element("b", 0.1)]
+        cached, metrics = manager.preserve_context(
+            second, "testing", "security", strategy
+        )
+        assert [e.element_id for e in cached] == [e.element_id for e in preserved]
+        assert cached[0] is second[0]
+        assert metrics.preserved_elements == 1
+        assert manager.context_cache.get_stats()["hits"] == 1
+
+    def test_strength_change_misses_cache(self):
+        """A changed relationship strength is not served a stale result."""
+        manager = self._manager()
+        elements = [_element("a", 0.5)]
+        strategy = ContextPreservationStrategy.SELECTIVE_TRANSFER
+        assert manager.preserve_context(elements, "testing", "security", strategy)[0]
+
+        for _ in range(5):
+            manager.relationship_mapper.update_relationship_strength(
+                "testing", "security", success=False
+            )
+        assert not manager.preserve_context(elements, "testing", "security", strategy)[
+            0
+        ]
+
+    def test_cache_evicts_least_recently_used_within_budget(self):
+        """The cache stays within its byte budget by evicting LRU entries."""
+        size = estimate_element_bytes(_element("e0", 0.9))
+        manager = self._manager(cache_max_bytes=size * 2)
+        contexts = [[_element(f"e{i}", 0.9)] for i in range(3)]
+
+        manager.preserve_context(contexts[0], "testing", "security")
+        manager.preserve_context(contexts[1], "testing", "security")
+        manager.preserve_context(contexts[0], "testing", "security")
+        manager.preserve_context(contexts[2], "testing", "security")
+
+        stats = manager.context_cache.get_stats()
+        assert stats["entries"] == 2
+        assert stats["bytes"] <= size * 2
+        assert stats["evictions"] == 1
+        manager.preserve_context(contexts[0], "testing", "security")
+        assert manager.context_cache.get_stats()["hits"] == 2
+
+    def test_history_is_bounded_and_aggregated(self):
+        """History keeps the latest transfers; aggregates count all of them."""
+        manager = self._manager(history_size=3)
+        for _ in range(5):
+            manager.preserve_context([_element("a", 0.9)], "testing", "security")
+
+        assert len(manager.transfer_history) == 3
+        stats = manager.get_transfer_stats()[
+            ("testing", "security", "adaptive_transfer")
+        ]
+        assert stats["transfers"] == 5
+        assert stats["preservation_ratio"] == 1.0
+
+
+@pytest.mark.skipif(not MODULE_AVAILABLE, reason="Module not available")
+class TestBudgetedTransfer:
+    """Test knapsack selection under a transfer budget."""
+
+    def _manager(self, **kwargs):
+        return ContextPreservationManager(CrossDomainRelationshipMapper(), **kwargs)
+
+    def _transfer(self, manager, elements):
+        return manager.preserve_context(
+            elements,
+            "testing",
+            "security",
+            ContextPreservationStrategy.BUDGETED_TRANSFER,
+        )
+
+    def test_prefers_value_per_byte_within_budget(self):
+        """Small valuable elements beat one large one of similar importance."""
+        manager = self._manager(transfer_budget_bytes=100)
+        elements = [
+            _element("big", 0.9, "x" * 90),
+            _element("a", 0.8, "x" * 40),
+            _element("b", 0.7, "x" * 40),
+        ]
+        preserved, metrics = self._transfer(manager, elements)
+        assert [e.element_id for e in preserved] == ["a", "b"]
+        assert metrics.bytes_transferred == 80
+        assert metrics.bytes_saved == 90
+
+    def test_dependencies_are_transferred_together(self):
+        """An element is only taken with the elements it depends on."""
+        manager = self._manager(transfer_budget_bytes=60)
+        elements = [
+            _element("base", 0.1, "x" * 30),
+            _element("derived", 0.9, "x" * 30, dependencies=["base", "security"]),
+            _element("other", 0.5, "x" * 40),
+        ]
+        preserved, _ = self._transfer(manager, elements)
+        assert [e.element_id for e in preserved] == ["base", "derived"]
+
+    def test_token_budget_converts_to_bytes(self):
+        """Token budgets apply at BYTES_PER_TOKEN, the smaller budget winning."""
+        manager = self._manager(transfer_budget_bytes=1000, transfer_budget_tokens=10)
+        assert manager.transfer_budget_bytes == 40
+
+    def test_adaptive_transfer_respects_budget(self):
+        """Adaptive transfer switches to budgeted selection when over budget."""
+        manager = self._manager(transfer_budget_bytes=50)
+        elements = [_element(f"e{i}", 0.9, "x" * 20) for i in range(4)]
+        preserved, metrics = manager.preserve_context(elements, "testing", "security")
+        assert len(preserved) == 2
+        assert metrics.bytes_saved == 40
+
+        roomy = self._manager()
+        assert len(roomy.preserve_context(elements, "testing", "security")[0]) == 4
+
+
+@pytest.mark.skipif(not MODULE_AVAILABLE, reason="Module not available")
+class TestSemanticAnalyzer:
+    """Test the compiled vocabulary matcher."""
+
+    def test_automaton_reports_overlapping_substrings(self):
+        """Keywords nested in or overlapping each other are all found."""
+        automaton = KeywordAutomaton(["test", "testing", "sting", "ing", "go"])
+        assert automaton.find("latest testing") == {"test", "testing", "sting", "ing"}
+        assert automaton.find("") == set()
+
+    def test_required_literals(self):
+        """Only words every match must contain gate a regex."""
+        assert required_literals(r"(\w+)\s+requires?\s+(\w+)") == ("require",)
+        assert required_literals(r"trade.?off\s+between\s+(\w+)") == (
+            "trade",
+            "off",
+            "between",
+        )
+        assert required_literals(r"(\w+)\s+and\s+(a|b)") == ("and",)
+        assert required_literals(r"foo|bar") == ()
+
+    def test_analysis_matches_table_order(self):
+        """Domain matches, relationships and importance follow the tables."""
+        analyzer = SemanticAnalyzer()
+        analysis = analyzer.analyze_semantic_patterns(
+            "Critical testing requires docker security then deploy"
+        )
+
+        testing = analysis["domain_scores"]["testing"]
+        assert testing["matches"][-1] == "testing"
+        assert "test" in testing["matches"]
+        types = [r["type"] for r in analysis["relationship_indicators"]]
+        assert types == ["sequential", "dependent"]
+        assert analysis["context_importance"] == {"critical": 1}
+
+    def test_recompiled_vocabulary_is_used(self):
+        """Table changes take effect after compile_vocabulary."""
+        analyzer = SemanticAnalyzer()
+        analyzer.domain_semantics["testing"]["core_concepts"].append("zebra")
+        analyzer.compile_vocabulary()
+        scores = analyzer.analyze_semantic_patterns("zebra")["domain_scores"]
+        assert scores["testing"]["matches"] == ["zebra"]
+
+
+@pytest.mark.skipif(not MODULE_AVAILABLE, reason="Module not available")
+class TestBoundedReasonerMetrics:
+    """Test fixed-memory optimization and reasoning metrics."""
+
+    def test_streaming_stat_keeps_lifetime_aggregates(self):
+        """Aggregates cover every sample while only recent ones are kept."""
+        stat = StreamingStat(recent_size=2)
+        for value in (4.0, 1.0, 7.0):
+            stat.add(value)
+
+        assert list(stat.recent) == [1.0, 7.0]
+        summary = stat.summary()
+        assert summary["avg"] == pytest.approx(4.0)
+        assert (summary["min"], summary["max"], summary["count"]) == (1.0, 7.0, 3)
+        assert summary["ema"] == pytest.approx(0.9 * (0.9 * 4.0 + 0.1) + 0.7)
+        assert StreamingStat().summary() == {}
+
+    def test_optimization_history_is_bounded(self):
+        """Optimizer history keeps compact recent records per domain."""
+        optimizer = DomainSpecificOptimizer()
+        optimizer.HISTORY_SIZE = 3
+        for i in range(5):
+            optimizer.optimize_for_domain(
+                "testing", f"run tests {i}", ["test-specialist"]
+            )
+
+        history = optimizer.optimization_history["testing"]
+        assert len(history) == 3
+        assert "request" not in history[-1]
+        assert optimizer.optimization_stats["testing"].count == 5
+
+    def test_reasoning_metrics_summarize_all_queries(self):
+        """Reasoning metrics report lifetime aggregates from a fixed ring."""
+        reasoner = EnhancedMultiDomainContextReasoner()
+        for _ in range(3):
+            reasoner.analyze_multi_domain_query("docker security testing")
+
+        metrics = reasoner.get_reasoning_metrics()["analysis_time_ms"]
+        assert metrics["count"] == 3
+        assert metrics["min"] <= metrics["avg"] <= metrics["max"]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
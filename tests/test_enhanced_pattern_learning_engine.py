@@ -14,11 +14,22 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
 try:
     import enhanced_pattern_learning_engine  # noqa: F401
+    from agent_catalog import AgentCatalog
 
     MODULE_AVAILABLE = True
 except ImportError:
     MODULE_AVAILABLE = False
 
+TEST_SPECIALIST = """---
+description: Use PROACTIVELY for "test failures" and "broken mocks" in pytest suites.
+---
+"""
+
+INFRASTRUCTURE_ENGINEER = """---
+description: Docker and kubernetes deployment and container orchestration.
+---
+"""
+
 
 class TestEnhancedPatternLearningEngine:
     """Test pattern learning engine functionality."""
@@ -37,5 +48,43 @@ class TestEnhancedPatternLearningEngine:
         assert True
 
 
+@pytest.mark.skipif(not MODULE_AVAILABLE, reason="Module not available")
+class TestEnhancedAgentSuggestion:
+    """Test description matching against the catalog's token postings."""
+
+    @pytest.fixture
+    def engine(self, tmp_path):
+        """Engine over a catalog of two agents."""
+        (tmp_path / "test-specialist.md").write_text(TEST_SPECIALIST)
+        (tmp_path / "infrastructure-engineer.md").write_text(INFRASTRUCTURE_ENGINEER)
+        return enhanced_pattern_learning_engine.EnhancedPatternLearningEngine(
+            catalog=AgentCatalog(str(tmp_path))
+        )
+
+    def test_suggests_matching_agent(self, engine):
+        """Keyword and description matches select the agent above threshold."""
+        agent, score = engine.get_enhanced_agent_suggestion(
+            "docker kubernetes deployment container orchestration"
+        )
+        assert agent == "infrastructure-engineer"
+        assert score > 0.4
+
+    def test_keywords_match_as_substrings(self, engine):
+        """Profile keywords still match inside longer query words."""
+        profile = engine.get_agent_profile("test-specialist")
+        query = "pytestfixturecoverage asynctestingfailures brokenmocks"
+        expected = 0.6 * sum(k in query for k in profile.keywords)
+        expected /= len(profile.keywords)
+        expected *= profile.specialization_score
+
+        agent, score = engine.get_enhanced_agent_suggestion(query)
+        assert agent == "test-specialist"
+        assert score == pytest.approx(expected)
+
+    def test_unrelated_query_has_no_suggestion(self, engine):
+        """Queries sharing no token with any agent fall through to None."""
+        assert engine.get_enhanced_agent_suggestion("write a poem") is None
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Tests for the metrics registry and its Prometheus text exposition.
+
+Covers the metric types, the textfile dump, the HTTP endpoint and the
+metrics updated by the selection stack.
+"""
+
+import pytest
+import sys
+import os
+import urllib.request
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from metrics_registry import (  # noqa: E402
+    CONTENT_TYPE,
+    Metric,
+    MetricsRegistry,
+    get_metrics_registry,
+)
+from enhanced_cross_domain_coordinator import (  # noqa: E402
+    AdmissionController,
+    PerformanceGuard,
+    SafetyManager,
+    SafetyThresholds,
+)
+
+
+class TestMetricTypes:
+    """Test counters, gauges and histograms."""
+
+    def test_counter_renders_labels(self):
+        """Counters render one sample per label set with HELP and TYPE."""
+        registry = MetricsRegistry()
+        counter = registry.counter("requests_total", "Requests", ("path",))
+        counter.inc(path="a")
+        counter.inc(2, path='q"x')
+
+        text = registry.render()
+        assert "# HELP requests_total Requests" in text
+        assert "# TYPE requests_total counter" in text
+        assert 'requests_total{path="a"} 1.0' in text
+        assert 'requests_total{path="q\\"x"} 2.0' in text
+
+    def test_metric_requires_samples(self):
+        """Metric types must implement their sample rendering."""
+        with pytest.raises(TypeError):
+            Metric("m", "M")
+
+        class Incomplete(Metric):
+            kind = "gauge"
+
+        with pytest.raises(TypeError):
+            Incomplete("m", "M")
+
+    def test_counter_rejects_decrease_and_bad_labels(self):
+        """Counters only go up and require their declared labels."""
+        counter = MetricsRegistry().counter("c_total", "C", ("path",))
+        with pytest.raises(ValueError):
+            counter.inc(-1, path="a")
+        with pytest.raises(ValueError):
+            counter.inc(other="a")
+
+    def test_gauge_moves_both_ways(self):
+        """Gauges can be set, incremented and decremented."""
+        gauge = MetricsRegistry().gauge("in_flight", "In flight")
+        gauge.set(3)
+        gauge.inc()
+        gauge.dec(2)
+        assert gauge.value() == 2
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Histogram buckets count every observation at or below the bound."""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_ms", "Latency", buckets=(1, 10))
+        for value in (0.5, 5, 50):
+            histogram.observe(value)
+
+        text = registry.render()
+        assert 'latency_ms_bucket{le="1.0"} 1' in text
+        assert 'latency_ms_bucket{le="10.0"} 2' in text
+        assert 'latency_ms_bucket{le="+Inf"} 3' in text
+        assert "latency_ms_sum 55.5" in text
+        assert "latency_ms_count 3" in text
+
+    def test_registration_is_get_or_create(self):
+        """Registering a name twice returns the same metric of the same type."""
+        registry = MetricsRegistry()
+        assert registry.counter("x_total", "X") is registry.counter("x_total", "X")
+        with pytest.raises(ValueError):
+            registry.gauge("x_total", "X")
+
+
+class TestExposition:
+    """Test the textfile dump and HTTP endpoint."""
+
+    def test_write_textfile(self, tmp_path):
+        """The dump holds the rendered exposition and leaves no temp files."""
+        registry = MetricsRegistry()
+        registry.counter("dumped_total", "Dumped").inc()
+        path = tmp_path / "metrics" / "selection.prom"
+
+        registry.write_textfile(str(path))
+        assert path.read_text() == registry.render()
+        assert os.listdir(path.parent) == ["selection.prom"]
+
+    def test_http_endpoint_serves_metrics(self):
+        """The endpoint serves the exposition at /metrics."""
+        registry = MetricsRegistry()
+        registry.gauge("served", "Served").set(1)
+        server = registry.start_http_server(port=0)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                assert response.headers["Content-Type"] == CONTENT_TYPE
+                assert response.read().decode() == registry.render()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class TestSelectionStackMetrics:
+    """Test that selection components update the shared registry."""
+
+    def _counter(self, name, **labels):
+        return get_metrics_registry().get(name).value(**labels)
+
+    def test_admission_updates_counters(self):
+        """Admissions, sheds and degraded selections are counted."""
+        admitted = self._counter("admission_admitted_total")
+        shed = self._counter("admission_shed_total", stage="reasoning")
+        degraded = self._counter("admission_degraded_total")
+
+        controller = AdmissionController(SafetyThresholds())
+        with controller.admit() as admission:
+            admission.load = 1.0
+            assert not admission.allows("reasoning")
+
+        assert self._counter("admission_admitted_total") == admitted + 1
+        assert self._counter("admission_shed_total", stage="reasoning") == shed + 1
+        assert self._counter("admission_degraded_total") == degraded + 1
+
+    def test_safety_manager_records_errors(self):
+        """Recorded errors are counted by type."""
+        before = self._counter("safety_errors_total", error_type="timeout")
+        SafetyManager(AdmissionController()).record_error("timeout")
+        assert self._counter("safety_errors_total", error_type="timeout") == before + 1
+
+    def test_guard_violations_are_counted(self):
+        """Budget violations are counted by budget."""
+        before = self._counter("performance_guard_violations_total", budget="time_ms")
+        with PerformanceGuard(SafetyThresholds(), budget_ms=0.0):
+            sum(range(1000))
+        assert (
+            self._counter("performance_guard_violations_total", budget="time_ms")
+            == before + 1
+        )
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
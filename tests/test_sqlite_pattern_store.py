@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite pattern storage backend.
+
+Covers indexed lookups and the SQLite mode of PatternStore and
+PatternLearningEngine.
+"""
+
+import pytest
+import sys
+import os
+from datetime import datetime
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from sqlite_pattern_store import SQLitePatternBackend  # noqa: E402
+from enhanced_cross_domain_coordinator import (  # noqa: E402
+    CoordinationPattern,
+    PatternLearningEngine,
+    PatternStore,
+)
+
+
+@pytest.fixture
+def hub_path(tmp_path):
+    """Path to a coordination hub inside a temporary memory directory."""
+    return str(tmp_path / ".claude" / "memory" / "coordination-hub.md")
+
+
+def _pattern(pattern_id: str, signature: str, agents=None) -> CoordinationPattern:
+    return CoordinationPattern(
+        pattern_id=pattern_id,
+        query_signature=signature,
+        agent_sequence=agents or ["security-enforcer", "test-specialist"],
+        success_rate=0.8,
+        last_used=datetime.now(),
+        execution_time_ms=12.0,
+    )
+
+
+class TestSQLitePatternBackend:
+    """Test indexed pattern queries."""
+
+    def test_query_type_lookup_matches_substring_semantics(self, tmp_path):
+        """Index lookups agree with ``query_type in query_signature``."""
+        backend = SQLitePatternBackend(str(tmp_path / "patterns.sqlite3"))
+        store_records = [
+            {
+                "pattern_id": pid,
+                "query_signature": signature,
+                "agent_sequence": ["a"],
+                "success_rate": 0.8,
+                "last_used": datetime.now().isoformat(),
+                "execution_time_ms": 1.0,
+            }
+            for pid, signature in [
+                ("p1", "security auth review"),
+                ("p2", "authentication flow"),
+                ("p3", "docker deploy"),
+                ("p4", "evolved_security+test"),
+            ]
+        ]
+        backend.upsert_patterns(store_records)
+
+        for query_type in ("security", "auth", "docker deploy", "test"):
+            expected = {
+                r["pattern_id"]
+                for r in store_records
+                if query_type in r["query_signature"]
+            }
+            found = {r["pattern_id"] for r in backend.find_by_query_type(query_type)}
+            assert found == expected
+
+    def test_upsert_replaces_agent_index(self, tmp_path):
+        """Re-storing a pattern drops stale agent index entries."""
+        backend = SQLitePatternBackend(str(tmp_path / "patterns.sqlite3"))
+        record = {
+            "pattern_id": "p1",
+            "query_signature": "security",
+            "agent_sequence": ["old-agent"],
+            "success_rate": 0.8,
+            "last_used": datetime.now().isoformat(),
+            "execution_time_ms": 1.0,
+        }
+        backend.upsert_patterns([record])
+        backend.upsert_patterns([{**record, "agent_sequence": ["new-agent"]}])
+
+        assert backend.find_by_agent("old-agent") == []
+        assert [r["pattern_id"] for r in backend.find_by_agent("new-agent")] == ["p1"]
+        assert backend.count_patterns() == 1
+
+
+class TestPatternStoreSQLite:
+    """Test PatternStore backed by SQLite."""
+
+    def test_patterns_persist_across_instances(self, hub_path):
+        """Stored patterns are visible to a new store without markdown."""
+        store = PatternStore(hub_path, use_sqlite=True)
+        assert store.store_pattern(_pattern("p1", "security auth review"))
+        assert store.flush()
+
+        reloaded = PatternStore(hub_path, use_sqlite=True)
+        assert "p1" in reloaded.patterns
+        assert reloaded.patterns["p1"].query_signature == "security auth review"
+        assert len(reloaded.patterns) == 1
+
+    def test_query_type_lookup(self, hub_path):
+        """Query type lookups use the database index."""
+        store = PatternStore(hub_path, use_sqlite=True)
+        store.store_pattern(_pattern("p1", "security auth review"))
+        store.store_pattern(_pattern("p2", "docker deploy"))
+
+        found = store.get_patterns_by_query_type("auth")
+        assert [p.pattern_id for p in found] == ["p1"]
+
+    def test_markdown_export_and_import(self, hub_path, tmp_path):
+        """The markdown view seeds an empty database."""
+        store = PatternStore(hub_path)
+        store.store_pattern(_pattern("p1", "security auth review"))
+        store.compact_hub()
+
+        migrated = PatternStore(hub_path, db_path=str(tmp_path / "migrated.sqlite3"))
+        assert migrated.patterns["p1"].agent_sequence == [
+            "security-enforcer",
+            "test-specialist",
+        ]
+        assert migrated.compact_hub()
+        with open(hub_path, encoding="utf-8") as f:
+            assert "- **p1**: security-enforcer,test-specialist" in f.read()
+
+    def test_delete_buffered_and_stored_patterns(self, hub_path):
+        """Deleting works for buffered and committed patterns alike."""
+        patterns = PatternStore(hub_path, use_sqlite=True).patterns
+        patterns["p1"] = _pattern("p1", "security")
+        del patterns["p1"]
+        assert "p1" not in patterns
+
+        patterns["p2"] = _pattern("p2", "docker deploy")
+        patterns.flush()
+        patterns["p2"] = _pattern("p2", "docker deploy")
+        del patterns["p2"]
+        assert "p2" not in patterns
+        assert len(patterns) == 0
+
+        with pytest.raises(KeyError):
+            del patterns["missing"]
+
+
+class TestPatternLearningEngineSQLite:
+    """Test PatternLearningEngine backed by SQLite."""
+
+    def test_successes_persist_across_instances(self, hub_path):
+        """Learned successes reload from the database."""
+        engine = PatternLearningEngine(hub_path, use_sqlite=True)
+        engine.learn_from_success("docker container deployment", "infra", 0.9)
+        assert engine.sqlite_backend.count_successes() == 1
+
+        reloaded = PatternLearningEngine(hub_path, use_sqlite=True)
+        assert reloaded.successful_patterns == engine.successful_patterns
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])